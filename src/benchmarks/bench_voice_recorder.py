@@ -0,0 +1,352 @@
+"""
+Performance benchmarks of the recording pipeline.
+The audio input is simulated (see "fake_audio.py"), faster than real time.
+Every case runs in its own process, so the reported peak RSS belongs to that case only.
+
+Usage (from the "src" directory):
+    python benchmarks/bench_voice_recorder.py --output results.json
+    python benchmarks/bench_voice_recorder.py --cases list_records --sizes 10 1000
+    python benchmarks/bench_voice_recorder.py --output new.json --compare results.json
+"""
+# Annotations
+from collections.abc import Callable
+
+# OS
+import argparse
+import json
+import os
+from os import path
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Libs
+import numpy as np
+
+# ADD BENCHMARKED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+import fake_audio
+from fake_audio import FakePyAudio, synthetic_block
+from manager import SettingsManager
+
+# GLOBAL VARIABLES
+settings_manager = SettingsManager()
+PERCENTILES = (50, 90, 99)
+# Cases which are repeated for every directory size
+SCALING_CASES = ('path_name_generator', 'list_records')
+
+
+def latency_percentiles(durations: list[float]) -> dict | None:
+    """Percentiles of durations in milliseconds"""
+    if not durations:
+        return None
+    values = np.percentile(np.asarray(durations) * 1000, PERCENTILES)
+    return {**{f'p{percentile}_ms': round(float(value), 4) for percentile, value in zip(PERCENTILES, values)},
+            'max_ms': round(max(durations) * 1000, 4)}
+
+
+def synthetic_recording(seconds: float, dtype: str = 'int16') -> np.ndarray:
+    freq = settings_manager.get_setting('recorder.freq')
+    channels = settings_manager.get_setting('recorder.channels')
+    block = synthetic_block(freq, channels)
+    recording = np.resize(block, (int(freq * seconds), channels))
+    if dtype == 'int32':
+        return recording.astype(np.int32) << 16
+    return recording
+
+
+def throughput(samples: int, elapsed: float) -> dict:
+    return {'samples': samples, 'seconds': round(elapsed, 6), 'samples_per_second': round(samples / elapsed)}
+
+
+# CASES
+def bench_continuous_recording(arguments: argparse.Namespace) -> dict:
+    """
+    Full capture path: callback -> ring buffer -> consumer -> record writer.
+    Latency is measured from the callback to the moment the consumer handled the block.
+    """
+    from record_producer import ContinuesRecording
+
+    freq = settings_manager.get_setting('recorder.freq')
+    channels = settings_manager.get_setting('recorder.channels')
+    FakePyAudio.speed = arguments.speed
+    FakePyAudio.blocks = int(arguments.seconds * freq / settings_manager.get_setting('recorder.frames_per_buffer'))
+
+    with tempfile.TemporaryDirectory() as directory:
+        recording = ContinuesRecording()
+        recording.full_name_generator.save_records_path = directory
+        handled_times = []
+        recording.sinks.append(lambda chunk: handled_times.append(time.perf_counter()))
+
+        recording.start()
+        recording.ready.wait()
+        stream = FakePyAudio.streams[-1]
+        stream.finished.wait()
+        recording.stop()
+        recording.join()
+        elapsed = time.perf_counter() - stream.generated_times[0]
+
+        statistics = recording.get_statistics()
+        # Blocks are popped whole, so the n-th handled chunk is the n-th block unless some were dropped
+        latencies = None
+        if not statistics['overflows']:
+            latencies = [handled - generated for generated, handled in zip(stream.generated_times, handled_times)]
+
+        return {
+            **throughput(len(stream.generated_times) * stream.frames_per_buffer * channels, elapsed),
+            'speed': arguments.speed,
+            'block_latency': latency_percentiles(latencies),
+            'callback_latency': latency_percentiles(stream.callback_durations),
+            'ring_buffer': statistics,
+            'record_bytes': sum(path.getsize(record) for record in recording.records),
+            'metrics': recording.get_metrics(),
+        }
+
+
+def bench_write_record(arguments: argparse.Namespace) -> dict:
+    """Fixed-duration "wav" record written with scipy"""
+    from record_producer import RecordWriter
+    # Keep the import of the writer out of the measurement
+    import scipy.io.wavfile
+
+    recording = synthetic_recording(arguments.seconds)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        RecordWriter().write_record_scrip((settings_manager.get_setting('recorder.freq'), recording),
+                                          path.join(directory, 'record.wav'))
+        return throughput(recording.size, time.perf_counter() - start)
+
+
+def bench_write_record_int24(arguments: argparse.Namespace) -> dict:
+    """Fixed-duration 24 bit "wav" record packed block by block"""
+    from record_producer import RecordWriter
+
+    recording = synthetic_recording(arguments.seconds, dtype='int32')
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        RecordWriter().write_record_int24((settings_manager.get_setting('recorder.freq'), recording),
+                                          path.join(directory, 'record.wav'))
+        return throughput(recording.size, time.perf_counter() - start)
+
+
+def bench_write_continues_record_wave(arguments: argparse.Namespace) -> dict:
+    """Legacy path: every block is kept in memory and joined at the end"""
+    from record_producer import RecordWriter
+
+    frames_per_buffer = settings_manager.get_setting('recorder.frames_per_buffer')
+    recording = synthetic_recording(arguments.seconds)
+    blocks = [recording[start:start + frames_per_buffer].tobytes()
+              for start in range(0, len(recording), frames_per_buffer)]
+    del recording
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        RecordWriter().write_continues_record_wave((FakePyAudio(), blocks), path.join(directory, 'record.wav'))
+        return throughput(sum(map(len, blocks)) // 2, time.perf_counter() - start)
+
+
+def bench_open_continues_record(arguments: argparse.Namespace) -> dict:
+    """Streaming encoder of the configured format, block by block"""
+    from record_producer import RecordWriter
+
+    frames_per_buffer = settings_manager.get_setting('recorder.frames_per_buffer')
+    recording = synthetic_recording(arguments.seconds)
+    record_writer = RecordWriter()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_durations = []
+        start = time.perf_counter()
+        writer = record_writer.open_continues_record(path.join(directory, f'record{record_writer.extension}'), 2)
+        for block_start in range(0, len(recording), frames_per_buffer):
+            block = recording[block_start:block_start + frames_per_buffer].tobytes()
+            write_start = time.perf_counter()
+            writer.write(block)
+            write_durations.append(time.perf_counter() - write_start)
+        writer.close()
+
+        return {
+            **throughput(recording.size, time.perf_counter() - start),
+            'format': record_writer.record_format,
+            'write_latency': latency_percentiles(write_durations),
+        }
+
+
+def bench_produce_record(arguments: argparse.Namespace) -> dict:
+    """Fixed-duration record: capture into the preallocated buffer, name allocation and writing"""
+    from record_producer import RecordProducer
+    import scipy.io.wavfile
+
+    record_producer = RecordProducer()
+    record_producer.voice_recorder.duration = arguments.seconds
+    with tempfile.TemporaryDirectory() as directory:
+        record_producer.path_name_generator.save_records_path = directory
+        start = time.perf_counter()
+        record_producer.produce_record()
+        elapsed = time.perf_counter() - start
+
+    return throughput(int(arguments.seconds * record_producer.voice_recorder.freq) * record_producer.voice_recorder.channels,
+                      elapsed)
+
+
+def create_records(directory: str, files: int) -> None:
+    default_filename = settings_manager.get_setting('recorder.default_filename')
+    for number in range(1, files + 1):
+        open(path.join(directory, f'{default_filename}_{number}.wav'), 'wb').close()
+
+
+def bench_path_name_generator(arguments: argparse.Namespace) -> dict:
+    """First name allocation scans the directory, the following ones use the counter"""
+    from record_producer import PathNameGenerator
+
+    with tempfile.TemporaryDirectory() as directory:
+        create_records(directory, arguments.files)
+        generator = PathNameGenerator()
+        generator.save_records_path = directory
+
+        start = time.perf_counter()
+        generator.generate_unique_name()
+        first = time.perf_counter() - start
+
+        durations = []
+        for _ in range(100):
+            start = time.perf_counter()
+            generator.generate_unique_name()
+            durations.append(time.perf_counter() - start)
+
+    return {'files': arguments.files, 'first_ms': round(first * 1000, 4), 'next': latency_percentiles(durations)}
+
+
+def bench_list_records(arguments: argparse.Namespace) -> dict:
+    """What "list_records" of the GUI does: index sync and the first visible page"""
+    from records_index import RecordsIndex
+
+    with tempfile.TemporaryDirectory() as directory:
+        records_directory = path.join(directory, 'records')
+        os.mkdir(records_directory)
+        create_records(records_directory, arguments.files)
+        records_index = RecordsIndex(records_directory, path.join(directory, 'index.sqlite3'))
+
+        timings = {}
+        for name, action in (
+                ('cold_sync', lambda: records_index.sync(read_durations=False)),
+                ('warm_sync', lambda: records_index.sync(read_durations=False)),
+                ('first_page', lambda: records_index.page(0, 50)),
+                ('first_page_by_date', lambda: records_index.page(0, 50, 'date', True)),
+                ('search_page', lambda: records_index.page(0, 50, search='_1')),
+                ('count', lambda: records_index.count())):
+            start = time.perf_counter()
+            action()
+            timings[f'{name}_ms'] = round((time.perf_counter() - start) * 1000, 4)
+        records_index.close()
+
+    return {'files': arguments.files, **timings}
+
+
+CASES: dict[str, Callable[[argparse.Namespace], dict]] = {
+    'continuous_recording': bench_continuous_recording,
+    'write_record': bench_write_record,
+    'write_record_int24': bench_write_record_int24,
+    'write_continues_record_wave': bench_write_continues_record_wave,
+    'open_continues_record': bench_open_continues_record,
+    'produce_record': bench_produce_record,
+    'path_name_generator': bench_path_name_generator,
+    'list_records': bench_list_records,
+}
+
+
+# RUNNER
+def run_case(arguments: argparse.Namespace) -> dict:
+    """Run one case in this process and return its result with the peak RSS"""
+    fake_audio.install()
+    result = CASES[arguments.worker](arguments)
+    # "ru_maxrss" is in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result['peak_rss_kb'] = peak_rss // 1024 if sys.platform == 'darwin' else peak_rss
+    return result
+
+
+def spawn_case(case: str, arguments: argparse.Namespace, files: int | None = None) -> dict:
+    command = [sys.executable, __file__, '--worker', case,
+               '--seconds', str(arguments.seconds), '--speed', str(arguments.speed)]
+    if files is not None:
+        command += ['--files', str(files)]
+
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode:
+        return {'case': case, 'error': completed.stderr.strip().splitlines()[-1]}
+    return {'case': case, **json.loads(completed.stdout)}
+
+
+def compare(results: list[dict], baseline: list[dict]) -> None:
+    """Print the throughput and timing ratios against a previous run"""
+    def key(result: dict) -> tuple:
+        return result['case'], result.get('files')
+
+    previous = {key(result): result for result in baseline}
+    for result in results:
+        old = previous.get(key(result))
+        if old is None or 'error' in result or 'error' in old:
+            continue
+
+        for metric, value in result.items():
+            if (metric == 'samples_per_second' or metric.endswith('_ms')) and old.get(metric):
+                print(f'{result["case"]:<30} {str(result.get("files", "")):>7} {metric:<22} {value / old[metric]:7.2f}x')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Voice recorder benchmarks with a simulated audio input.')
+    parser.add_argument('--cases', nargs='+', choices=tuple(CASES), default=tuple(CASES))
+    parser.add_argument('--seconds', type=float, default=30, help='Seconds of audio per recording case')
+    parser.add_argument('--speed', type=float, default=50, help='Simulated input speed relative to real time')
+    parser.add_argument('--sizes', nargs='+', type=int, default=(10, 1000, 100000),
+                        help='Directory sizes of the scaling cases')
+    parser.add_argument('--output', help='JSON file for the results, printed when omitted')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    parser.add_argument('--worker', choices=tuple(CASES), help=argparse.SUPPRESS)
+    parser.add_argument('--files', type=int, default=0, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = build_parser().parse_args(argv)
+
+    if arguments.worker:
+        print(json.dumps(run_case(arguments)))
+        return 0
+
+    results = []
+    for case in arguments.cases:
+        if case in SCALING_CASES:
+            results += [spawn_case(case, arguments, files) for files in arguments.sizes]
+        else:
+            results.append(spawn_case(case, arguments))
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {setting: settings_manager.get_setting(f'recorder.{setting}')
+                     for setting in ('freq', 'channels', 'frames_per_buffer', 'format', 'sample_format')},
+        'results': results,
+    }
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file)['results'])
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Simulated "pyaudio" and "sounddevice" modules for the benchmarks.
+The input stream calls the stream callback from its own thread with
+synthetic audio, as fast as the "speed" factor allows.
+"""
+# OS
+import sys
+import time
+import types
+from threading import Event, Thread
+
+# Libs
+import numpy as np
+
+# GLOBAL VARIABLES
+PA_INT16 = 8
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 0x2
+
+
+def synthetic_block(frames: int, channels: int, seed: int = 0) -> np.ndarray:
+    """Noisy 440 Hz tone at about -12 dBFS"""
+    rng = np.random.default_rng(seed)
+    time_axis = np.arange(frames) / 44100
+    tone = 8000 * np.sin(2 * np.pi * 440 * time_axis)[:, None]
+    noise = rng.normal(0, 500, (frames, channels))
+    return (tone + noise).astype(np.int16)
+
+
+class FakeStream:
+    def __init__(self, channels: int, rate: int, frames_per_buffer: int, stream_callback, speed: float, blocks: int | None) -> None:
+        self.frames_per_buffer = frames_per_buffer
+        self.period = frames_per_buffer / rate / speed
+        self.blocks = blocks
+        self.stream_callback = stream_callback
+        # A few different blocks so the data is not a single repeated buffer
+        self._data = [synthetic_block(frames_per_buffer, channels, seed).tobytes() for seed in range(8)]
+
+        self.generated_times: list[float] = []
+        self.callback_durations: list[float] = []
+        self.finished = Event()
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        next_time = time.perf_counter()
+        block = 0
+        while not self._stopped.is_set() and (self.blocks is None or block < self.blocks):
+            self.generated_times.append(time.perf_counter())
+            self.stream_callback(self._data[block % len(self._data)], self.frames_per_buffer, {}, 0)
+            self.callback_durations.append(time.perf_counter() - self.generated_times[-1])
+
+            block += 1
+            next_time += self.period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        self.finished.set()
+
+    def is_active(self) -> bool:
+        return not self.finished.is_set()
+
+    def stop_stream(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def close(self) -> None:
+        pass
+
+
+class FakePyAudio:
+    # Configured by the benchmark before a recording starts
+    speed = 50.0
+    blocks: int | None = None
+    streams: list[FakeStream] = []
+
+    def get_sample_size(self, audio_format: int) -> int:
+        return 2
+
+    def open(self, format: int, channels: int, rate: int, input: bool = True, frames_per_buffer: int = 1024,
+             stream_callback=None, **kwargs) -> FakeStream:
+        stream = FakeStream(channels, rate, frames_per_buffer, stream_callback, self.speed, self.blocks)
+        FakePyAudio.streams.append(stream)
+        return stream
+
+    def get_device_count(self) -> int:
+        return 1
+
+    def get_device_info_by_index(self, index: int) -> dict:
+        return {'index': 0, 'name': 'Fake input', 'maxInputChannels': 2}
+
+    def terminate(self) -> None:
+        pass
+
+
+def fake_rec(out: np.ndarray, samplerate: int | None = None, **kwargs) -> np.ndarray:
+    """Fill the output buffer immediately, like a device infinitely faster than real time"""
+    block = synthetic_block(len(out), out.shape[1])
+    if out.dtype.kind == 'f':
+        out[:] = block / 32768
+    else:
+        out[:] = block.astype(out.dtype) << (8 * (out.dtype.itemsize - 2))
+    return out
+
+
+def install() -> None:
+    """Register the fake modules, so lazy imports of the audio backends get them"""
+    pyaudio = types.ModuleType('pyaudio')
+    pyaudio.PyAudio = FakePyAudio
+    pyaudio.paInt16 = PA_INT16
+    pyaudio.paContinue = PA_CONTINUE
+    pyaudio.paInputOverflow = PA_INPUT_OVERFLOW
+    sys.modules['pyaudio'] = pyaudio
+
+    sounddevice = types.ModuleType('sounddevice')
+    sounddevice.rec = fake_rec
+    sounddevice.wait = lambda: None
+    sys.modules['sounddevice'] = sounddevice
@@ -0,0 +1,145 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import time
+import wave
+from threading import Thread
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from async_recorder import AsyncRecorder, AsyncRecordingSession
+
+
+class FakeStream:
+    """Input stream calling the callback with "blocks" blocks from its own thread"""
+
+    def __init__(self, channels: int, frames_per_buffer: int, stream_callback, blocks: int) -> None:
+        self.block = bytes(range(256)) * (frames_per_buffer * channels * 2 // 256)
+        self.frames_per_buffer = frames_per_buffer
+        self.stream_callback = stream_callback
+        self.blocks = blocks
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        for _ in range(self.blocks):
+            self.stream_callback(self.block, self.frames_per_buffer, {}, 0)
+            time.sleep(0.001)
+
+    def stop_stream(self) -> None:
+        self._thread.join()
+
+    def close(self) -> None:
+        pass
+
+
+class FakeAudio:
+    def __init__(self, blocks: int) -> None:
+        self.blocks = blocks
+
+    def get_sample_size(self, audio_format: int) -> int:
+        return 2
+
+    def open(self, channels: int, frames_per_buffer: int, stream_callback, **options) -> FakeStream:
+        return FakeStream(channels, frames_per_buffer, stream_callback, self.blocks)
+
+    def terminate(self) -> None:
+        pass
+
+
+class FailingAudio(FakeAudio):
+    def open(self, **options) -> FakeStream:
+        raise OSError('Invalid input device')
+
+
+class TestAsyncRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.recorder = AsyncRecorder(max_workers=2, audio=FakeAudio(blocks=20))
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    async def start_session(self) -> AsyncRecordingSession:
+        session = AsyncRecordingSession(self.recorder)
+        session.full_name_generator.save_records_path = self.directory.name
+        self.recorder.sessions.add(session)
+        await session.open()
+        return session
+
+    def test_blocks_and_finalization(self) -> None:
+        async def scenario() -> tuple[list[bytes], list[str], AsyncRecordingSession]:
+            session = await self.start_session()
+            blocks = []
+
+            async def read_blocks() -> None:
+                async for block in session:
+                    blocks.append(block)
+
+            reader = asyncio.create_task(read_blocks())
+            await asyncio.sleep(0.1)
+            finalized = await session.stop()
+            records = await finalized
+            await reader
+            await self.recorder.close()
+            return blocks, records, session
+
+        blocks, records, session = asyncio.run(scenario())
+
+        self.assertEqual(len(records), 1)
+        with wave.open(records[0]) as record:
+            self.assertEqual(record.getnframes(), 20 * session.stream.frames_per_buffer)
+        self.assertTrue(blocks)
+        self.assertEqual(blocks[0], session.stream.block)
+        self.assertFalse(self.recorder.sessions)
+
+    def test_concurrent_sessions(self) -> None:
+        async def scenario() -> list[list[str]]:
+            sessions = [await self.start_session() for _ in range(5)]
+            await asyncio.sleep(0.05)
+            finalizing = [await session.stop() for session in sessions]
+            return await asyncio.gather(*finalizing)
+
+        records = asyncio.run(scenario())
+        self.assertEqual(len({record for session_records in records for record in session_records}), 5)
+
+    def test_pump_failure_closes_the_record(self) -> None:
+        def failing_sink(data: memoryview) -> None:
+            raise RuntimeError('Analysis failed')
+
+        async def scenario() -> AsyncRecordingSession:
+            session = await self.start_session()
+            session.sinks.append(failing_sink)
+            await asyncio.sleep(0.05)
+            with self.assertRaises(RuntimeError):
+                await (await session.stop())
+            return session
+
+        session = asyncio.run(scenario())
+        self.assertIsInstance(session.error, RuntimeError)
+        self.assertFalse(self.recorder.sessions)
+        # The record is finalized and its journal is released
+        with wave.open(session.records[0], 'rb') as audio_file:
+            self.assertEqual(audio_file.getnchannels(), session.settings.recorder.channels)
+        self.assertEqual(os.listdir(os.path.join(self.directory.name, '.journal')), [])
+
+    def test_stream_failure_discards_the_record(self) -> None:
+        self.recorder = AsyncRecorder(max_workers=2, audio=FailingAudio(blocks=0))
+        with self.assertRaises(OSError):
+            asyncio.run(self.start_session())
+
+        # No placeholder record and no locked journal are left
+        names = [name for _, _, files in os.walk(self.directory.name) for name in files]
+        self.assertEqual(names, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
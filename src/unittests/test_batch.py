@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import wave
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from batch import BatchJob, MANIFEST_NAME, transform_loudness, transform_trim
+
+
+def write_wave(full_path: str, samples: np.ndarray, framerate: int = 16000) -> None:
+    with wave.open(full_path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(framerate)
+        file.writeframes(np.round(samples * 32767).astype('<i2').tobytes())
+
+
+class TestTransforms(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, 'tone.wav')
+        tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(16000) / 16000)
+        # 1 s of silence, 1 s of tone, 1 s of silence
+        write_wave(self.source, np.concatenate([np.zeros(16000), tone, np.zeros(16000)]))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_loudness(self) -> None:
+        stats = transform_loudness(self.source, self.directory.name, {})
+        self.assertAlmostEqual(stats['duration'], 3.0)
+        self.assertAlmostEqual(stats['peak_db'], 20 * np.log10(0.5), delta=0.1)
+
+    def test_trim_keeps_padded_sound(self) -> None:
+        output_directory = os.path.join(self.directory.name, 'trimmed')
+        os.makedirs(output_directory)
+        result = transform_trim(self.source, output_directory, {'padding_seconds': 0.1})
+
+        with wave.open(result['output']) as file:
+            self.assertAlmostEqual(file.getnframes() / 16000, 1.2, delta=0.03)
+        self.assertAlmostEqual(result['trimmed_seconds'], 1.8, delta=0.03)
+
+
+class TestBatchJob(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, 'records')
+        self.output = os.path.join(self.directory.name, 'output')
+        os.makedirs(self.source)
+        rng = np.random.default_rng(0)
+        for index in range(4):
+            write_wave(os.path.join(self.source, f'record_{index}.wav'), rng.uniform(-0.5, 0.5, 8000))
+        with open(os.path.join(self.source, 'broken.wav'), 'wb') as file:
+            file.write(b'not a wave file')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_run_and_resume(self) -> None:
+        report = BatchJob('convert', self.source, self.output, {'format': 'wav'}, workers=2).run()
+        self.assertEqual((report['processed'], report['failed']), (4, 1))
+        self.assertAlmostEqual(report['audio_seconds'], 2.0)
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'record_0.wav')))
+
+        # Only the failed record is retried
+        report = BatchJob('convert', self.source, self.output, {'format': 'wav'}, workers=2).run()
+        self.assertEqual((report['pending'], report['processed'], report['failed']), (1, 0, 1))
+
+        # Other options are another job
+        report = BatchJob('loudness', self.source, self.output, workers=2).run()
+        self.assertEqual(report['processed'], 4)
+
+        with open(os.path.join(self.output, MANIFEST_NAME)) as manifest:
+            self.assertEqual(len(manifest.readlines()), 11)
+
+    def test_skip_by_hash(self) -> None:
+        BatchJob('loudness', self.source, self.output, workers=2, skip_by='hash').run()
+        # Touching a record changes its mtime but not its content
+        os.utime(os.path.join(self.source, 'record_0.wav'), ns=(0, 0))
+
+        report = BatchJob('loudness', self.source, self.output, workers=2, skip_by='hash').run()
+        self.assertEqual((report['skipped'], report['processed']), (4, 0))
+
+    def test_unknown_transform(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchJob('reverse', self.source, self.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+import json
+from platform import node
+from unittest import mock
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+import manager
+from manager import SettingsSnapshot
+from calibration import choose_block_size, resolve_frames_per_buffer
+
+
+class TestChooseBlockSize(unittest.TestCase):
+    @staticmethod
+    def probe(frames_per_buffer: int, overflows: int = 0, jitter: float = 1.0) -> dict:
+        block_period = frames_per_buffer / 44100
+        return {
+            'frames_per_buffer': frames_per_buffer,
+            'block_period': block_period,
+            'failed': False,
+            'callbacks': 100,
+            'overflows': overflows,
+            'max_interval': block_period * jitter,
+        }
+
+    def test_smallest_glitch_free_size_is_chosen(self) -> None:
+        """Sizes with overflows or late callbacks are skipped"""
+        probes = [
+            self.probe(128, overflows=3),
+            self.probe(256, jitter=5.0),
+            self.probe(512),
+            self.probe(1024),
+        ]
+        self.assertEqual(choose_block_size(probes), 512)
+
+    def test_no_glitch_free_size(self) -> None:
+        self.assertIsNone(choose_block_size([self.probe(64, overflows=1)]))
+
+
+class TestResolveFramesPerBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(manager.SETTINGS) as file:
+            settings_data = json.load(file)
+        # Differs from the live settings, as after a reload
+        settings_data['recorder'].update(
+            auto_tune_block_size=True, freq=16000, channels=1, calibration_probe_seconds=0.5)
+        self.settings = SettingsSnapshot(settings_data)
+
+    def test_session_settings_are_tuned(self) -> None:
+        with mock.patch('calibration.load_calibration', return_value={}), \
+                mock.patch('calibration.save_calibration') as save_calibration, \
+                mock.patch('calibration.BlockSizeTuner') as tuner:
+            tuner.return_value.tune.return_value = 256
+            self.assertEqual(resolve_frames_per_buffer(self.settings), 256)
+
+        tuner.assert_called_once_with(16000, 1, 0.5)
+        save_calibration.assert_called_once_with(
+            {node(): {'freq': 16000, 'channels': 1, 'frames_per_buffer': 256}})
+
+    def test_stored_result_of_the_session_format_is_used(self) -> None:
+        calibration = {node(): {'freq': 16000, 'channels': 1, 'frames_per_buffer': 512}}
+        with mock.patch('calibration.load_calibration', return_value=calibration), \
+                mock.patch('calibration.BlockSizeTuner') as tuner:
+            self.assertEqual(resolve_frames_per_buffer(self.settings), 512)
+        tuner.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+import unittest
+import sys
+import os
+import io
+import json
+import socket
+import tempfile
+import time
+import types
+import wave
+from contextlib import redirect_stderr, redirect_stdout
+from threading import Event, Thread
+from unittest import mock
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+import manager
+from manager import SettingsManager, SettingsSnapshot
+from cli import USE_UNIX_SOCKET, RecorderDaemon, build_parser, main, send_command
+# Imported here, the daemon loads it lazily while "sys.modules" is patched
+import recorder
+
+
+class FakeStream:
+    """Input stream calling the callback with silent blocks until it is stopped"""
+
+    def __init__(self, channels: int, frames_per_buffer: int, stream_callback, **options) -> None:
+        self.block = bytes(frames_per_buffer * channels * 2)
+        self.frames_per_buffer = frames_per_buffer
+        self.stream_callback = stream_callback
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(0.002):
+            self.stream_callback(self.block, self.frames_per_buffer, {}, 0)
+
+    def stop_stream(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def close(self) -> None:
+        pass
+
+
+class FakeAudio:
+    def get_sample_size(self, audio_format: int) -> int:
+        return 2
+
+    def open(self, **options) -> FakeStream:
+        return FakeStream(**options)
+
+    def terminate(self) -> None:
+        pass
+
+
+def fake_pyaudio() -> types.ModuleType:
+    module = types.ModuleType('pyaudio')
+    module.PyAudio = FakeAudio
+    module.paInt16 = 8
+    return module
+
+
+class SettingsTestCase(unittest.TestCase):
+    """Runs with the records and the daemon socket in a temporary directory"""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.socket_path = os.path.join(self.directory.name, 'recorder.sock')
+
+        with open(manager.SETTINGS) as file:
+            settings_data = json.load(file)
+        settings_data['base_dir'] = self.directory.name
+        settings_data['save_records_path'] = self.directory.name
+        settings_data['daemon']['socket_path'] = self.socket_path
+        settings = SettingsManager().settings
+        patcher = mock.patch.object(settings, '_Settings__settings', SettingsSnapshot(settings_data))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestParser(unittest.TestCase):
+    def test_record_duration(self) -> None:
+        arguments = build_parser().parse_args(['record', '-d', '2.5'])
+        self.assertEqual((arguments.command, arguments.duration), ('record', 2.5))
+
+    def test_list_options(self) -> None:
+        arguments = build_parser().parse_args(['list', '--sort', 'size', '-r', '--search', 'meeting'])
+        self.assertEqual((arguments.sort, arguments.reverse, arguments.search), ('size', True, 'meeting'))
+
+        arguments = build_parser().parse_args(['list'])
+        self.assertEqual((arguments.sort, arguments.reverse, arguments.search), ('name', False, ''))
+
+    def test_batch_options(self) -> None:
+        arguments = build_parser().parse_args(
+            ['batch', 'postprocess', '-j', '2', '--sample-rate', '16000', '--normalize', 'peak', '--skip-by', 'hash'])
+        self.assertEqual(arguments.transform, 'postprocess')
+        self.assertEqual((arguments.workers, arguments.sample_rate, arguments.normalize, arguments.skip_by),
+                         (2, 16000, 'peak', 'hash'))
+        self.assertIsNone(arguments.format)
+
+    def test_invalid_arguments_exit(self) -> None:
+        for argv in (['batch', 'reverse'], ['list', '--sort', 'color'], ['record', '-d', 'long']):
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                build_parser().parse_args(argv)
+
+
+@unittest.skipUnless(USE_UNIX_SOCKET, 'The daemon listens on TCP without Unix sockets')
+class TestDaemonClient(SettingsTestCase):
+    def test_command_without_daemon_fails(self) -> None:
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            self.assertEqual(main(['status']), 1)
+        self.assertIn('not running', stderr.getvalue())
+
+        with self.assertRaises(ConnectionError):
+            send_command('status')
+
+
+@unittest.skipUnless(USE_UNIX_SOCKET, 'The daemon listens on TCP without Unix sockets')
+class TestRecorderDaemon(SettingsTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        modules = mock.patch.dict(sys.modules, {'pyaudio': fake_pyaudio()})
+        modules.start()
+        self.addCleanup(modules.stop)
+        watching = mock.patch.object(SettingsManager, 'start_watching')
+        watching.start()
+        self.addCleanup(watching.stop)
+
+    def serve(self) -> Thread:
+        daemon = RecorderDaemon()
+        thread = Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        # The server is assigned once its socket is bound
+        for _ in range(500):
+            if daemon.server is not None:
+                break
+            time.sleep(0.01)
+        self.addCleanup(self.shutdown, thread)
+        return thread
+
+    def shutdown(self, thread: Thread) -> None:
+        if thread.is_alive():
+            send_command('shutdown')
+            thread.join(timeout=5)
+
+    def test_start_status_stop(self) -> None:
+        self.serve()
+
+        self.assertEqual(send_command('status'), {'ok': True, 'recording': False})
+        self.assertEqual(send_command('start'), {'ok': True})
+        self.assertEqual(send_command('status'), {'ok': True, 'recording': True})
+        time.sleep(0.05)
+
+        reply = send_command('stop')
+        self.assertTrue(reply['ok'])
+        self.assertEqual(len(reply['records']), 1)
+        with wave.open(reply['records'][0], 'rb') as audio_file:
+            self.assertGreater(audio_file.getnframes(), 0)
+        self.assertEqual(send_command('stop'), {'ok': False, 'error': 'Not recording'})
+
+    def test_second_client_sees_the_recording(self) -> None:
+        self.serve()
+        self.assertEqual(send_command('start'), {'ok': True})
+
+        # Another client, e.g. a second terminal
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.socket_path)
+            connection.sendall(b'{"command": "start"}\n')
+            with connection.makefile('rb') as reply:
+                self.assertEqual(json.loads(reply.readline()), {'ok': False, 'error': 'Already recording'})
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            self.assertEqual(main(['status']), 0)
+        self.assertEqual(stdout.getvalue(), 'recording\n')
+        self.assertTrue(send_command('stop')['ok'])
+
+    def test_unknown_command_and_malformed_request(self) -> None:
+        self.serve()
+
+        self.assertEqual(send_command('pause'), {'ok': False, 'error': 'Unknown command "pause"'})
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.socket_path)
+            connection.sendall(b'not json\n')
+            with connection.makefile('rb') as reply:
+                self.assertFalse(json.loads(reply.readline())['ok'])
+
+    def test_shutdown_reports_a_failed_record(self) -> None:
+        thread = self.serve()
+        self.assertEqual(send_command('start'), {'ok': True})
+
+        with mock.patch('recorder.Recorder.stop_recording', side_effect=OSError(28, 'No space left on device')):
+            reply = send_command('shutdown')
+        thread.join(timeout=5)
+        recorder.Recorder().record_producer.stop_recording()
+
+        self.assertFalse(reply['ok'])
+        self.assertIn('No space left on device', reply['error'])
+        self.assertFalse(thread.is_alive())
+
+    def test_stale_socket_is_replaced(self) -> None:
+        # Left by a daemon which was killed
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        thread = self.serve()
+        self.assertEqual(send_command('status'), {'ok': True, 'recording': False})
+
+        self.assertEqual(send_command('shutdown'), {'ok': True})
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from encoders import Encoder, EncodingWorker, create_encoder, get_extension
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+
+class FullDiskEncoder(Encoder):
+    extension = '.raw'
+
+    def __init__(self) -> None:
+        super().__init__('record.raw', 2, 2, 44100)
+        self.closed = False
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        raise OSError(28, 'No space left on device')
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestEncodingWorker(unittest.TestCase):
+    def test_encoder_error_is_raised_without_blocking(self) -> None:
+        encoder = FullDiskEncoder()
+        worker = EncodingWorker(encoder, max_queue_blocks=2)
+
+        with self.assertRaises(OSError):
+            # Without the error the writer would block on the full queue
+            for _ in range(1000):
+                worker.write(bytes(64))
+        with self.assertRaises(OSError):
+            worker.close()
+        self.assertTrue(encoder.closed)
+        self.assertFalse(worker.is_alive())
+
+
+class TestEncoders(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.samples = (np.arange(4096 * 2, dtype=np.int16) % 1000).reshape(-1, 2)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def test_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            get_extension('mp4')
+
+    @unittest.skipIf(soundfile is None, '"soundfile" is not installed')
+    def test_flac_is_lossless(self) -> None:
+        """Chunks encoded on the worker thread are decoded back unchanged"""
+        full_path = os.path.join(self.temp_dir.name, 'Record_1' + get_extension('flac'))
+        encoder = create_encoder('flac', full_path, channels=2, sample_width=2, framerate=44100)
+        for chunk in np.array_split(self.samples, 8):
+            encoder.write(chunk.tobytes())
+        encoder.close()
+
+        decoded, freq = soundfile.read(full_path, dtype='int16')
+        self.assertEqual(freq, 44100)
+        np.testing.assert_array_equal(decoded, self.samples)
+
+
+if __name__ == '__main__':
+    unittest.main()
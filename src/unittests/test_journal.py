@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import tempfile
+import wave
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from journal import JournalWriter, journal_path, recover_journals
+
+
+class ListWriter:
+    def __init__(self) -> None:
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        self.chunks.append(bytes(data))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.directory.name, 'record_1.wav')
+        # The name generator reserves the record with an empty file
+        open(self.full_path, 'wb').close()
+        self.frames = bytes(range(256)) * 40
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_clean_close_replaces_the_record(self) -> None:
+        writer = JournalWriter(self.full_path, 2, 2, 8000)
+        writer.write(self.frames)
+        self.assertEqual(os.path.getsize(self.full_path), 0)
+        writer.close()
+
+        self.assertFalse(os.path.exists(journal_path(self.full_path)))
+        with wave.open(self.full_path) as record:
+            self.assertEqual(record.readframes(-1), self.frames)
+
+    def test_journal_of_a_compressed_record_is_removed(self) -> None:
+        output = ListWriter()
+        writer = JournalWriter(self.full_path, 2, 2, 8000, output=output)
+        writer.write(self.frames)
+        writer.close()
+
+        self.assertTrue(output.closed)
+        self.assertEqual(b''.join(output.chunks), self.frames)
+        self.assertFalse(os.path.exists(journal_path(self.full_path)))
+
+    def test_recover_orphaned_journal(self) -> None:
+        writer = JournalWriter(self.full_path, 2, 2, 8000, header_update_interval=3600)
+        # A partial last frame, as written by a process which died mid-write
+        writer.write(self.frames + b'\x01')
+
+        # A running recording is not an orphan
+        self.assertEqual(recover_journals(self.directory.name), [])
+
+        # The process dies: the header was never updated
+        writer.journal._file.close()
+        self.assertEqual(recover_journals(self.directory.name), [self.full_path])
+        with wave.open(self.full_path) as record:
+            self.assertEqual(record.getnframes(), len(self.frames) // 4)
+            self.assertEqual(record.readframes(-1), self.frames)
+
+    def test_recovered_compressed_record_gets_a_wav_name(self) -> None:
+        full_path = os.path.join(self.directory.name, 'record_2.flac')
+        writer = JournalWriter(full_path, 2, 2, 8000, output=ListWriter())
+        writer.write(self.frames)
+        writer.journal._file.close()
+
+        recovered = recover_journals(self.directory.name)
+        self.assertEqual(recovered, [os.path.join(self.directory.name, 'record_2.wav')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from level_monitor import LevelMonitor
+
+
+class TestLevelMonitor(unittest.TestCase):
+    def test_most_negative_sample_is_full_scale(self) -> None:
+        for sample_width, dtype in ((2, np.int16), (4, np.int32)):
+            monitor = LevelMonitor(channels=2, sample_width=sample_width)
+            samples = np.zeros((64, 2), dtype=dtype)
+            samples[10, 1] = np.iinfo(dtype).min
+            monitor.write(samples.tobytes())
+
+            points = monitor.drain()
+            self.assertEqual(len(points), 4)
+            self.assertEqual({peak for peak, _, _, _ in points}, {1.0})
+
+    def test_points_are_dropped_when_not_drained(self) -> None:
+        monitor = LevelMonitor(channels=1, points_per_block=4, max_pending=10)
+        samples = (np.sin(np.arange(1024) / 10) * 16384).astype(np.int16)
+        for _ in range(5):
+            monitor.write(samples.tobytes())
+
+        points = monitor.drain()
+        self.assertEqual(len(points), 10)
+        peak, rms, low, high = points[-1]
+        self.assertAlmostEqual(peak, 0.5, delta=0.001)
+        self.assertAlmostEqual(rms, 0.5 / np.sqrt(2), delta=0.01)
+        self.assertLessEqual(low, high)
+        self.assertEqual(monitor.drain(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from metadata import analyze_record, read_wav_header
+from wave_stream import StreamingWaveWriter
+
+
+class TestAnalyzeRecord(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.temp_dir.name, 'Record_1.wav')
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def test_int16_record(self) -> None:
+        """Half scale square wave: peak and RMS are both -6 dBFS"""
+        samples = np.tile(np.array([[16384, -16384], [-16384, 16384]], dtype=np.int16), (5000, 1))
+        with StreamingWaveWriter(self.full_path, channels=2, sample_width=2, framerate=1000) as writer:
+            writer.write(samples.tobytes())
+
+        metadata = analyze_record(self.full_path, thumbnail_points=10, block_frames=777)
+        self.assertEqual(metadata['duration'], 10.0)
+        self.assertAlmostEqual(metadata['peak_db'], -6.02, places=2)
+        self.assertAlmostEqual(metadata['rms_db'], -6.02, places=2)
+        self.assertEqual(len(metadata['thumbnail']), 10)
+        self.assertTrue(all(abs(value - 0.5) < 1e-6 for value in metadata['thumbnail']))
+
+    def test_int24_thumbnail_follows_the_signal(self) -> None:
+        samples = np.zeros(1000, dtype=np.int32)
+        samples[500:] = 1 << 30
+        with StreamingWaveWriter(self.full_path, channels=1, sample_width=3, framerate=1000) as writer:
+            writer.write(samples.view(np.uint8).reshape(-1, 4)[:, 1:].tobytes())
+
+        metadata = analyze_record(self.full_path, thumbnail_points=4)
+        self.assertEqual(metadata['thumbnail'], [0.0, 0.0, 0.5, 0.5])
+
+    def test_header_of_a_truncated_record(self) -> None:
+        """A record which is still being written reports the frames present on disk"""
+        writer = StreamingWaveWriter(self.full_path, channels=1, sample_width=2, framerate=1000,
+                                     header_update_interval=3600)
+        writer.write(b'\x00\x00' * 500)
+        writer._file.flush()
+
+        self.assertEqual(read_wav_header(self.full_path)['frames'], 0)
+        writer.close()
+        self.assertEqual(read_wav_header(self.full_path)['frames'], 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
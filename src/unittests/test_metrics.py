@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from metrics import LatencyHistogram, MeteredWriter, MetricsDumper, RecordingMetrics
+from wave_stream import StreamingWaveWriter
+
+
+class TestRecordingMetrics(unittest.TestCase):
+    def test_histogram_buckets(self) -> None:
+        histogram = LatencyHistogram(bounds_ms=(1, 10))
+        for seconds in (0.0005, 0.001, 0.005, 0.5):
+            histogram.add(seconds)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 4)
+        self.assertEqual(snapshot['buckets'], {'le_1ms': 2, 'le_10ms': 1, 'gt_10ms': 1})
+        self.assertEqual(snapshot['max_ms'], 500)
+
+    def test_blocks_overflows_and_read_latency(self) -> None:
+        metrics = RecordingMetrics()
+        metrics.add_block(1024, {'input_buffer_adc_time': 1.0, 'current_time': 1.003}, overflow=False)
+        metrics.add_block(1024, {}, overflow=True)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['blocks_captured'], 2)
+        self.assertEqual(snapshot['frames_captured'], 2048)
+        self.assertEqual(snapshot['input_overflows'], 1)
+        self.assertEqual(snapshot['read_latency']['count'], 1)
+
+    def test_metered_wave_writer(self) -> None:
+        metrics = RecordingMetrics()
+        with tempfile.TemporaryDirectory() as directory:
+            wave_writer = StreamingWaveWriter(os.path.join(directory, 'record.wav'), 2, 2, 44100)
+            wave_writer.on_sync = metrics.add_sync
+            writer = MeteredWriter(wave_writer, metrics)
+            writer.write(bytes(4096))
+            writer.write(bytes(4096))
+            writer.close()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['bytes_written'], 8192)
+        self.assertEqual(snapshot['write_latency']['count'], 2)
+        self.assertEqual(snapshot['sync_latency']['count'], 1)
+        self.assertEqual(writer.queue_depth, 0)
+
+    def test_dump_json_lines_and_csv(self) -> None:
+        metrics = RecordingMetrics()
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('metrics.jsonl', 'metrics.csv'):
+                dumper = MetricsDumper(metrics.snapshot, os.path.join(directory, name), interval=60)
+                dumper.dump()
+                dumper.start()
+                dumper.stop()
+
+            with open(os.path.join(directory, 'metrics.jsonl')) as file:
+                lines = [json.loads(line) for line in file]
+            with open(os.path.join(directory, 'metrics.csv'), newline='') as file:
+                rows = list(csv.DictReader(file))
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['blocks_captured'], '0')
+        self.assertIn('read_latency.buckets.le_1ms', rows[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
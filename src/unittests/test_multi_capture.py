@@ -0,0 +1,172 @@
+import unittest
+import sys
+import os
+import tempfile
+import types
+from unittest import mock
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from multi_capture import MAX_PENDING_BLOCKS, DeviceCapture, MultiDeviceRecording, StreamingResampler, resolve_devices
+from record_producer import PathNameGenerator, RecordWriter
+
+
+class TestStreamingResampler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.signal = (np.arange(10000) % 2000 - 1000).astype(np.int16).reshape(-1, 2)
+        return super().setUp()
+
+    def resample(self, ratio: float) -> np.ndarray:
+        resampler = StreamingResampler(ratio)
+        return np.concatenate([resampler.process(block) for block in np.array_split(self.signal, 37)])
+
+    def test_unit_ratio_is_lossless(self) -> None:
+        """Without drift the blocks are passed through unchanged (the last frame is held back)"""
+        np.testing.assert_array_equal(self.resample(1.0), self.signal[:-1])
+
+    def test_drift_changes_the_length_continuously(self) -> None:
+        output = self.resample(1.002)
+        self.assertEqual(len(output), round(len(self.signal) * 1.002) - 1)
+        # No discontinuity at block borders: the ramp keeps steps of about one
+        steps = np.diff(output[:900, 0].astype(np.int32))
+        self.assertTrue(np.all(np.abs(steps) <= 2))
+
+
+class FakeAudio:
+    DEVICES = [
+        {'index': 0, 'name': 'Speakers', 'maxInputChannels': 0},
+        {'index': 1, 'name': 'USB Audio CODEC', 'maxInputChannels': 2},
+        {'index': 2, 'name': 'Built-in Microphone', 'maxInputChannels': 1},
+    ]
+
+    def get_device_count(self) -> int:
+        return len(self.DEVICES)
+
+    def get_device_info_by_index(self, index: int) -> dict:
+        return self.DEVICES[index]
+
+
+class TestResolveDevices(unittest.TestCase):
+    def test_select_by_index_and_name(self) -> None:
+        devices = resolve_devices(FakeAudio(), [2, 'usb audio'])
+        self.assertEqual([device['index'] for device in devices], [2, 1])
+
+    def test_output_only_device_is_not_found(self) -> None:
+        with self.assertRaises(LookupError):
+            resolve_devices(FakeAudio(), ['Speakers'])
+
+
+class IdleStream:
+    def stop_stream(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class BrokenDeviceAudio(FakeAudio):
+    """The built-in microphone cannot be opened"""
+    terminated = 0
+
+    def open(self, input_device_index: int, **options) -> IdleStream:
+        if input_device_index == 2:
+            raise OSError('Device unavailable')
+        return IdleStream()
+
+    def terminate(self) -> None:
+        BrokenDeviceAudio.terminated += 1
+
+
+class CollectingWriter:
+    def __init__(self) -> None:
+        self.frames = 0
+
+    def write(self, data: bytes) -> None:
+        self.frames += len(data) // 2
+
+
+class TestMultiDeviceRecording(unittest.TestCase):
+    def test_faster_device_without_drift_compensation_is_bounded(self) -> None:
+        recording = MultiDeviceRecording(None, None, [], interleaved=False, drift_compensation=False)
+        recording.devices = [DeviceCapture(info, 1, 16000, 16, 1.0) for info in FakeAudio.DEVICES[1:]]
+        writers = [CollectingWriter(), CollectingWriter()]
+        for device in recording.devices:
+            device.frames_to_skip = 0
+
+        for _ in range(1000):
+            # The first device delivers one more frame per block
+            for device, frames in zip(recording.devices, (17, 16)):
+                device.pending = np.concatenate([device.pending, np.zeros((frames, 1), dtype=np.int16)])
+            recording._write_aligned(writers)
+
+        faster, slower = recording.devices
+        self.assertLessEqual(len(faster.pending), MAX_PENDING_BLOCKS * 16)
+        self.assertEqual(faster.frames_dropped, 1000 - MAX_PENDING_BLOCKS * 16)
+        self.assertEqual(slower.frames_dropped, 0)
+        self.assertEqual([writer.frames for writer in writers], [16000, 16000])
+
+    def test_sinks_get_interleaved_blocks_with_per_device_records(self) -> None:
+        recording = MultiDeviceRecording(None, None, [], interleaved=False)
+        recording.devices = [DeviceCapture(info, 2, 16000, 16, 1.0) for info in FakeAudio.DEVICES[1:]]
+        chunks = []
+        recording.sinks.append(lambda data: chunks.append(bytes(data)))
+        for device, value in zip(recording.devices, (1, 2)):
+            device.frames_to_skip = 0
+            device.pending = np.full((16, device.channels), value, dtype=np.int16)
+
+        recording._write_aligned([CollectingWriter(), CollectingWriter()])
+
+        # 2 channels of the USB device, 1 of the built-in microphone
+        expected = np.hstack([np.full((16, 2), 1), np.full((16, 1), 2)]).astype(np.int16)
+        self.assertEqual(chunks, [expected.tobytes()])
+
+
+class TestMultiDeviceRecordingStart(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        module = types.ModuleType('pyaudio')
+        module.PyAudio = BrokenDeviceAudio
+        module.paInt16 = 8
+        patcher = mock.patch.dict(sys.modules, {'pyaudio': module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        BrokenDeviceAudio.terminated = 0
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def run_recording(self, devices: list[int | str], interleaved: bool) -> MultiDeviceRecording:
+        generator = PathNameGenerator()
+        generator.save_records_path = self.directory.name
+        recording = MultiDeviceRecording(generator, RecordWriter(), devices, interleaved=interleaved)
+        with mock.patch('threading.excepthook'):
+            recording.start()
+            recording.join(timeout=5)
+        self.assertFalse(recording.is_alive())
+        self.assertTrue(recording.ready.is_set())
+        return recording
+
+    def test_failed_device_leaves_no_records(self) -> None:
+        for interleaved in (True, False):
+            recording = self.run_recording([1, 2], interleaved)
+
+            self.assertIsInstance(recording.error, OSError)
+            self.assertEqual(recording.records, [])
+            self.assertEqual(os.listdir(self.directory.name), [])
+        self.assertEqual(BrokenDeviceAudio.terminated, 2)
+
+    def test_unknown_device_terminates_the_audio(self) -> None:
+        recording = self.run_recording(['Speakers'], interleaved=True)
+
+        self.assertIsInstance(recording.error, LookupError)
+        self.assertEqual(BrokenDeviceAudio.terminated, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
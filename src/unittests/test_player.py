@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import tempfile
+import wave
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from player import RecordPlayer
+
+
+class FakeOutputStream:
+    """Output stream whose callback is driven by the test"""
+
+    def __init__(self, samplerate: int, channels: int, callback, **options) -> None:
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.active = False
+        self.stopped = True
+
+    def start(self) -> None:
+        self.active, self.stopped = True, False
+
+    def stop(self) -> None:
+        self.active, self.stopped = False, True
+
+    def abort(self) -> None:
+        self.stop()
+
+    def close(self) -> None:
+        pass
+
+    def pull(self, frames: int) -> np.ndarray:
+        outdata = np.full((frames, self.channels), np.nan, dtype=np.float32)
+        try:
+            self.callback(outdata, frames, None, None)
+        except FakeSoundDevice.CallbackStop:
+            self.active = False
+        return outdata
+
+
+class FakeSoundDevice:
+    OutputStream = FakeOutputStream
+
+    class CallbackStop(Exception):
+        pass
+
+
+class TestRecordPlayer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.directory.name, 'record.wav')
+        # Every frame holds its index
+        self.samples = np.arange(8000, dtype=np.int16).repeat(2).reshape(-1, 2)
+        with wave.open(self.full_path, 'wb') as file:
+            file.setnchannels(2)
+            file.setsampwidth(2)
+            file.setframerate(8000)
+            file.writeframes(self.samples.tobytes())
+        self.player = RecordPlayer(backend=FakeSoundDevice)
+
+    def tearDown(self) -> None:
+        self.player.stop()
+        self.directory.cleanup()
+
+    def test_plays_blocks_in_order(self) -> None:
+        self.player.play(self.full_path)
+        self.assertTrue(self.player.playing)
+        self.assertEqual(self.player.duration, 1.0)
+
+        first = self.player._stream.pull(100)
+        second = self.player._stream.pull(100)
+        np.testing.assert_array_equal(np.concatenate([first, second]), self.samples[:200] / 32768)
+        self.assertAlmostEqual(self.player.position, 200 / 8000)
+
+    def test_seek_and_end(self) -> None:
+        self.player.play(self.full_path, start=0.5)
+        np.testing.assert_array_equal(self.player._stream.pull(10), self.samples[4000:4010] / 32768)
+
+        self.player.seek(0.999)
+        block = self.player._stream.pull(100)
+        np.testing.assert_array_equal(block[:8], self.samples[7992:] / 32768)
+        self.assertTrue(np.all(block[8:] == 0))
+        self.assertFalse(self.player.playing)
+
+        # Playback restarts from a position before the end
+        self.player.seek(0.0)
+        self.player.resume()
+        self.assertTrue(self.player.playing)
+        np.testing.assert_array_equal(self.player._stream.pull(4), self.samples[:4] / 32768)
+
+
+if __name__ == '__main__':
+    unittest.main()
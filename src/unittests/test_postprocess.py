@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+from scipy import signal
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from postprocess import PolyphaseResampler, PostProcessor
+from encoders import WaveEncoder
+from metadata import read_wav_header
+
+
+class TestPolyphaseResampler(unittest.TestCase):
+    def test_streaming_matches_resample_poly(self) -> None:
+        rng = np.random.default_rng(0)
+        samples = rng.normal(size=(20000, 2)).astype(np.float32)
+
+        for from_rate, to_rate in ((44100, 16000), (16000, 48000)):
+            resampler = PolyphaseResampler(from_rate, to_rate, channels=2)
+            blocks, start = [], 0
+            while start < len(samples):
+                size = int(rng.integers(1, 3000))
+                blocks.append(resampler.process(samples[start:start + size]))
+                start += size
+            blocks.append(resampler.flush())
+
+            expected = signal.resample_poly(samples, to_rate, from_rate, axis=0)
+            np.testing.assert_allclose(np.concatenate(blocks), expected, atol=1e-5)
+
+
+class TestPostProcessor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.directory.name, 'record.wav')
+        # 2 s of a 440 Hz tone with a DC offset on both channels
+        time_axis = np.arange(2 * 44100) / 44100
+        tone = 0.2 * np.sin(2 * np.pi * 440 * time_axis) + 0.1
+        self.data = (np.repeat(tone[:, None], 2, axis=1) * 32767).astype(np.int16)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def process(self, **options) -> np.ndarray:
+        output = WaveEncoder(self.full_path, channels=1, sample_width=2, framerate=16000)
+        processor = PostProcessor(output, channels=2, framerate=44100, output_channels=1,
+                                  output_framerate=16000, **options)
+        for start in range(0, len(self.data), 1024):
+            processor.write(self.data[start:start + 1024].tobytes())
+        processor.close()
+
+        header = read_wav_header(self.full_path)
+        self.assertEqual((header['channels'], header['framerate']), (1, 16000))
+        self.assertEqual(header['frames'], 2 * 16000)
+        with open(self.full_path, 'rb') as file:
+            file.seek(header['data_offset'])
+            return np.frombuffer(file.read(header['data_size']), dtype='<i2') / 32768
+
+    def test_downmix_dc_removal_and_resampling(self) -> None:
+        samples = self.process(dc_removal=True, highpass_hz=80)
+        # Skip the settling of the filters
+        self.assertLess(abs(samples[8000:].mean()), 0.005)
+        self.assertAlmostEqual(samples[8000:].max(), 0.2, delta=0.02)
+
+    def test_peak_normalization(self) -> None:
+        samples = self.process(dc_removal=False, normalize='peak', target_db=-6)
+        self.assertAlmostEqual(np.abs(samples).max(), 10 ** (-6 / 20), delta=0.002)
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_record_producer_does_not_import_scipy(self) -> None:
+        code = 'import sys, record_producer; print("scipy" in sys.modules)'
+        result = subprocess.run([sys.executable, '-c', code], cwd=parent_dir,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
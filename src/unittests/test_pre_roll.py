@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from pre_roll import PreRollBuffer
+
+
+class TestPreRollBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pre_roll = PreRollBuffer(capacity=100, channels=2)
+        self.samples = np.arange(2 * 1000, dtype=np.int16).reshape(-1, 2)
+        return super().setUp()
+
+    def test_keeps_only_the_last_frames(self) -> None:
+        for block in np.array_split(self.samples, 33):
+            self.pre_roll.write(block.tobytes())
+
+        np.testing.assert_array_equal(self.pre_roll.last(), self.samples[-100:])
+        np.testing.assert_array_equal(self.pre_roll.last(30), self.samples[-30:])
+
+    def test_not_yet_full(self) -> None:
+        self.pre_roll.write(self.samples[:40].tobytes())
+
+        self.assertEqual(len(self.pre_roll), 40)
+        np.testing.assert_array_equal(self.pre_roll.last(1000), self.samples[:40])
+
+    def test_block_larger_than_the_buffer(self) -> None:
+        self.pre_roll.write(self.samples[:7].tobytes())
+        self.pre_roll.write(self.samples[7:500].tobytes())
+
+        np.testing.assert_array_equal(self.pre_roll.last(), self.samples[400:500])
+
+
+if __name__ == '__main__':
+    unittest.main()
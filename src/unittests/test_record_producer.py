@@ -0,0 +1,348 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+import types
+import wave
+from threading import Event, Thread
+from unittest import mock
+
+import numpy as np
+from scipy.io import wavfile
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from encoders import Encoder, EncodingWorker
+from record_producer import ContinuesRecording, PathNameGenerator, RecordProducer, RecordWriter, VoiceRecorder
+
+
+class FailingAudio:
+    """PyAudio whose input stream cannot be opened (no device)"""
+
+    def get_sample_size(self, audio_format: int) -> int:
+        return 2
+
+    def open(self, **options):
+        raise OSError('Invalid input device')
+
+    def terminate(self) -> None:
+        pass
+
+
+class StreamingAudio(FailingAudio):
+    """PyAudio whose input stream calls the callback with silent blocks until it is stopped"""
+
+    def open(self, channels: int, frames_per_buffer: int, stream_callback, **options):
+        return FakeStream(bytes(frames_per_buffer * channels * 2), frames_per_buffer, stream_callback)
+
+
+class FakeStream:
+    def __init__(self, block: bytes, frames_per_buffer: int, stream_callback) -> None:
+        self.block = block
+        self.frames_per_buffer = frames_per_buffer
+        self.stream_callback = stream_callback
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(0.002):
+            self.stream_callback(self.block, self.frames_per_buffer, {}, 0)
+
+    def stop_stream(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def close(self) -> None:
+        pass
+
+
+class FullDiskEncoder(Encoder):
+    extension = '.raw'
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        raise OSError(28, 'No space left on device')
+
+    def close(self) -> None:
+        pass
+
+
+def fake_pyaudio(audio_class: type) -> types.ModuleType:
+    module = types.ModuleType('pyaudio')
+    module.PyAudio = audio_class
+    module.paInt16 = 8
+    return module
+
+
+class TestContinuesRecording(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_stream_failure_releases_the_record(self) -> None:
+        with mock.patch.dict(sys.modules, {'pyaudio': fake_pyaudio(FailingAudio)}):
+            recording = ContinuesRecording()
+            recording.full_name_generator.save_records_path = self.directory.name
+            with mock.patch('threading.excepthook'):
+                recording.start()
+                recording.join(timeout=5)
+
+        self.assertFalse(recording.is_alive())
+        self.assertTrue(recording.ready.is_set())
+        self.assertIsInstance(recording.error, OSError)
+        self.assertEqual(recording.records, [])
+        # No placeholder record and no journal are left
+        names = [name for _, _, files in os.walk(self.directory.name) for name in files]
+        self.assertEqual(names, [])
+
+    def test_sink_error_stops_the_recording(self) -> None:
+        written = []
+
+        def failing_sink(data: memoryview) -> None:
+            written.append(len(data))
+            if len(written) == 3:
+                raise RuntimeError('Analysis failed')
+
+        with mock.patch.dict(sys.modules, {'pyaudio': fake_pyaudio(StreamingAudio)}):
+            recording = ContinuesRecording()
+            recording.full_name_generator.save_records_path = self.directory.name
+            recording.sinks.append(failing_sink)
+            recording.start()
+            # Not stopped by the test: the failure ends the recording
+            recording.join(timeout=5)
+
+        self.assertFalse(recording.is_alive())
+        self.assertIsInstance(recording.error, RuntimeError)
+        self.assertEqual(len(written), 3)
+        # The record captured before the failure is closed
+        self.assertEqual(len(recording.records), 1)
+        self.assertEqual(os.listdir(os.path.join(self.directory.name, '.journal')), [])
+
+    def test_concurrent_begin_record_opens_one_record(self) -> None:
+        recording = ContinuesRecording(armed=True)
+        recording.full_name_generator.save_records_path = self.directory.name
+        recording.sample_width = 2
+        open_record_sink = recording._open_record_sink
+
+        def slow_open_record_sink(sample_width: int):
+            time.sleep(0.05)
+            return open_record_sink(sample_width)
+
+        recording._open_record_sink = slow_open_record_sink
+        opened = []
+        threads = [Thread(target=lambda: opened.append(recording.begin_record(0))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(opened), [False, True])
+        records = recording.end_record()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), sorted(['.journal', os.path.basename(records[0])]))
+        self.assertEqual(os.listdir(os.path.join(self.directory.name, '.journal')), [])
+
+    def test_user_takes_over_a_scheduled_record(self) -> None:
+        recording = ContinuesRecording(armed=True)
+        recording.full_name_generator.save_records_path = self.directory.name
+        recording.sample_width = 2
+
+        self.assertTrue(recording.begin_record(0, owner='scheduler'))
+        self.assertFalse(recording.begin_record())
+        self.assertEqual(recording.record_owner, 'user')
+        # The scheduler does not end the record of the user
+        self.assertEqual(recording.end_record(owner='scheduler'), [])
+        self.assertTrue(recording.is_recording)
+        self.assertEqual(len(recording.end_record()), 1)
+
+
+class TestPathNameGenerator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.generator = self.create_generator()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def create_generator(self) -> PathNameGenerator:
+        generator = PathNameGenerator()
+        generator.save_records_path = self.directory.name
+        generator.default_filename = 'Record'
+        return generator
+
+    def create_file(self, name: str) -> None:
+        open(os.path.join(self.directory.name, name), 'w').close()
+
+    def test_numbering_continues_after_existing_records(self) -> None:
+        for name in ('Record_3.wav', 'Record_7-2.flac', 'Record_x.wav', 'Other_12.wav', 'notes.txt'):
+            self.create_file(name)
+
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            names = [os.path.basename(self.generator.generate_unique_name()) for _ in range(2)]
+
+        self.assertEqual(names, ['Record_8.wav', 'Record_9.wav'])
+        # The directory is scanned once, later names come from the counter
+        self.assertEqual(scandir.call_count, 1)
+        # The name is claimed by an empty file
+        self.assertEqual(os.path.getsize(os.path.join(self.directory.name, 'Record_8.wav')), 0)
+
+    def test_name_taken_by_another_process_is_skipped(self) -> None:
+        self.assertEqual(os.path.basename(self.generator.generate_unique_name()), 'Record_1.wav')
+        # Created after the scan, e.g. by another recorder process
+        self.create_file('Record_2.wav')
+
+        self.assertEqual(os.path.basename(self.generator.generate_unique_name()), 'Record_3.wav')
+
+    def test_concurrent_generators_get_unique_names(self) -> None:
+        names = []
+
+        def claim() -> None:
+            generator = self.create_generator()
+            names.extend(generator.generate_unique_name() for _ in range(20))
+
+        threads = [Thread(target=claim) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(names)), 160)
+        self.assertEqual(len(os.listdir(self.directory.name)), 160)
+
+
+class TestRecordProducer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def start_recording(self, producer: RecordProducer) -> ContinuesRecording:
+        producer.continues_recording = ContinuesRecording()
+        producer.continues_recording.full_name_generator.save_records_path = self.directory.name
+        with mock.patch('threading.excepthook'):
+            producer.continues_recording.start()
+            producer.continues_recording.ready.wait(timeout=5)
+        return producer.continues_recording
+
+    def test_stop_in_background_resolves_to_the_records(self) -> None:
+        producer = RecordProducer()
+        with mock.patch.dict(sys.modules, {'pyaudio': fake_pyaudio(StreamingAudio)}):
+            self.start_recording(producer)
+            time.sleep(0.05)
+            records = producer.stop_recording_in_background().result(timeout=5)
+
+        self.assertEqual(len(records), 1)
+        with wave.open(records[0], 'rb') as audio_file:
+            self.assertGreater(audio_file.getnframes(), 0)
+
+    def test_stop_in_background_carries_the_start_error(self) -> None:
+        producer = RecordProducer()
+        with mock.patch.dict(sys.modules, {'pyaudio': fake_pyaudio(FailingAudio)}):
+            recording = self.start_recording(producer)
+            future = producer.stop_recording_in_background()
+
+        self.assertIsInstance(future.exception(timeout=5), OSError)
+        self.assertIs(future.exception(), recording.error)
+
+    def test_join_recording(self) -> None:
+        recording = mock.Mock(error=None, records=['Record_1.wav'])
+        self.assertEqual(RecordProducer._join_recording(recording), ['Record_1.wav'])
+        recording.join.assert_called_once_with()
+
+        recording.error = OSError(28, 'No space left on device')
+        with self.assertRaises(OSError):
+            RecordProducer._join_recording(recording)
+
+    def test_failed_record_removes_the_claimed_name(self) -> None:
+        producer = RecordProducer()
+        producer.path_name_generator.save_records_path = self.directory.name
+        with mock.patch.object(producer.voice_recorder, 'record', side_effect=OSError('Invalid input device')):
+            with self.assertRaises(OSError):
+                producer.produce_record()
+
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_stop_recording_raises_the_encoder_error(self) -> None:
+        def open_record_sink(recording: ContinuesRecording, sample_width: int) -> EncodingWorker:
+            return EncodingWorker(FullDiskEncoder('Record_1.raw', 2, sample_width, 44100))
+
+        producer = RecordProducer()
+        with mock.patch.dict(sys.modules, {'pyaudio': fake_pyaudio(StreamingAudio)}), \
+                mock.patch.object(ContinuesRecording, '_open_record_sink', open_record_sink):
+            producer.start_recording()
+            producer.continues_recording.join(timeout=5)
+            with self.assertRaises(OSError) as context:
+                producer.stop_recording()
+
+        self.assertEqual(context.exception.errno, 28)
+        self.assertIs(producer.continues_recording.error, context.exception)
+
+
+class TestRecordWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.directory.name, 'Record_1.wav')
+        self.writer = RecordWriter()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_int24_keeps_the_high_bytes(self) -> None:
+        recording = np.array([[0x12345600, -0x100], [0x7fffff00, -0x80000000]], dtype=np.int32)
+        # The setting is "int16", the layout follows the captured array
+        self.writer.write_record((16000, recording), self.full_path)
+
+        with wave.open(self.full_path, 'rb') as audio_file:
+            self.assertEqual(audio_file.getsampwidth(), 3)
+            self.assertEqual(audio_file.getnchannels(), 2)
+            frames = audio_file.readframes(audio_file.getnframes())
+        self.assertEqual(frames, bytes.fromhex('563412' 'ffffff' 'ffff7f' '000080'))
+
+    def test_int24_is_packed_block_by_block(self) -> None:
+        recording = np.arange(-5000, 5000, dtype=np.int32).reshape(-1, 2) << 8
+        self.writer.write_record_int24((16000, recording), self.full_path, block_frames=333)
+
+        with wave.open(self.full_path, 'rb') as audio_file:
+            frames = audio_file.readframes(audio_file.getnframes())
+        self.assertEqual(frames, recording.astype('<i4').view(np.uint8).reshape(-1, 4)[:, 1:].tobytes())
+
+    def test_int16_and_float32(self) -> None:
+        for recording in (np.array([[0, -32768], [32767, 1]], dtype=np.int16),
+                          np.array([[0.0, -1.0], [0.5, 0.25]], dtype=np.float32)):
+            self.writer.write_record((16000, recording), self.full_path)
+
+            framerate, written = wavfile.read(self.full_path)
+            self.assertEqual(framerate, 16000)
+            self.assertEqual(written.dtype, recording.dtype)
+            np.testing.assert_array_equal(written, recording)
+
+
+class TestVoiceRecorder(unittest.TestCase):
+    def test_buffer_is_reused(self) -> None:
+        recorder = VoiceRecorder()
+        recorder.freq, recorder.duration, recorder.channels = 8000, 1, 2
+
+        buffer = recorder._get_buffer()
+        self.assertEqual(buffer.shape, (8000, 2))
+        self.assertIs(recorder._get_buffer(), buffer)
+
+        recorder.sample_format = 'int24'
+        int24_buffer = recorder._get_buffer()
+        self.assertIsNot(int24_buffer, buffer)
+        self.assertEqual(int24_buffer.dtype, np.int32)
+        self.assertIs(recorder._get_buffer(), int24_buffer)
+
+        recorder.duration = 2
+        self.assertEqual(recorder._get_buffer().shape, (16000, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import tempfile
+import wave
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from records_index import RecordsIndex
+
+
+class TestRecordsIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'records')
+        os.makedirs(self.directory)
+        self.records_index = RecordsIndex(self.directory)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.records_index.close()
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def create_record(self, name: str, seconds: int) -> str:
+        full_path = os.path.join(self.directory, name)
+        with wave.open(full_path, 'wb') as audio_file:
+            audio_file.setnchannels(1)
+            audio_file.setsampwidth(2)
+            audio_file.setframerate(1000)
+            audio_file.writeframes(b'\x00\x00' * 1000 * seconds)
+        return full_path
+
+    def test_sync_returns_only_the_difference(self) -> None:
+        self.create_record('Record_1.wav', 1)
+        self.create_record('Record_2.wav', 1)
+        self.assertEqual(sorted(self.records_index.sync()[0]), ['Record_1.wav', 'Record_2.wav'])
+
+        os.remove(os.path.join(self.directory, 'Record_1.wav'))
+        self.create_record('Record_3.wav', 1)
+        self.assertEqual(self.records_index.sync(), (['Record_3.wav'], ['Record_1.wav']))
+        self.assertEqual(self.records_index.sync(), ([], []))
+
+    def test_sorting_and_incremental_updates(self) -> None:
+        """Sorting is served from the index, renames and deletions update it in place"""
+        self.records_index.add(self.create_record('Record_1.wav', 3))
+        self.records_index.add(self.create_record('Record_2.wav', 1))
+        self.records_index.add(self.create_record('Record_3.wav', 2))
+
+        self.assertEqual(self.records_index.names('duration'), ['Record_2.wav', 'Record_3.wav', 'Record_1.wav'])
+        self.assertEqual(self.records_index.get('Record_1.wav')['duration'], 3.0)
+
+        self.records_index.rename('Record_1.wav', 'Meeting.wav')
+        self.records_index.remove('Record_2.wav')
+        self.assertEqual(self.records_index.names('name', descending=True), ['Record_3.wav', 'Meeting.wav'])
+
+    def test_paging_and_search(self) -> None:
+        for number in range(1, 26):
+            self.records_index.add(self.create_record(f'Record_{number:02}.wav', 0))
+        self.records_index.add(self.create_record('Meeting_100%.wav', 0))
+
+        self.assertEqual(self.records_index.count(), 26)
+        self.assertEqual(self.records_index.page(10, 3), ['Record_10.wav', 'Record_11.wav', 'Record_12.wav'])
+        self.assertEqual(self.records_index.count('record_1'), 10)
+        self.assertEqual(self.records_index.page(0, 10, search='0%'), ['Meeting_100%.wav'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+from threading import Thread
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from ring_buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ring_buffer = RingBuffer(10)
+        self.out = bytearray(10)
+        return super().setUp()
+
+    def test_wrap_around(self) -> None:
+        """Data which crosses the end of the buffer is returned in order"""
+        self.ring_buffer.push(b'abcdef')
+        self.assertEqual(self.ring_buffer.pop_into(memoryview(self.out)[:4]), 4)
+        self.ring_buffer.push(b'ghijkl')
+
+        size = self.ring_buffer.pop_into(self.out)
+        self.assertEqual(bytes(self.out[:size]), b'efghijkl')
+        self.assertEqual(self.ring_buffer.high_water_mark, 8)
+
+    def test_overflow_and_underrun_counters(self) -> None:
+        """A chunk which does not fit is dropped, an empty read is an underrun"""
+        self.assertTrue(self.ring_buffer.push(b'x' * 8))
+        self.assertFalse(self.ring_buffer.push(b'y' * 4))
+        self.ring_buffer.pop_into(self.out)
+
+        self.assertEqual(self.ring_buffer.pop_into(self.out, timeout=0), 0)
+        self.assertEqual(self.ring_buffer.get_statistics()['overflows'], 1)
+        self.assertEqual(self.ring_buffer.get_statistics()['dropped_bytes'], 4)
+        self.assertEqual(self.ring_buffer.get_statistics()['underruns'], 1)
+
+    def test_consumer_drains_after_close(self) -> None:
+        """The consumer receives everything pushed before close and then None"""
+        received = bytearray()
+
+        def consume() -> None:
+            out = bytearray(3)
+            while (size := self.ring_buffer.pop_into(out, timeout=0.1)) is not None:
+                received.extend(out[:size])
+
+        consumer = Thread(target=consume)
+        consumer.start()
+        for i in range(100):
+            while not self.ring_buffer.push(bytes([i])):
+                pass
+        self.ring_buffer.close()
+        consumer.join()
+
+        self.assertEqual(bytes(received), bytes(range(100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from rotation import RotatingWriter
+
+
+class MemoryWriter:
+    def __init__(self, full_path: str) -> None:
+        self.full_path = full_path
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data) -> None:
+        self.data.extend(data)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestRotatingWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.writers = []
+        self.completed = []
+        self.loud = (np.ones(100, dtype=np.int16) * 10000).tobytes()
+        self.silence = np.zeros(100, dtype=np.int16).tobytes()
+        return super().setUp()
+
+    def open_writer(self) -> MemoryWriter:
+        self.writers.append(MemoryWriter(f'Record_{len(self.writers) + 1}.wav'))
+        return self.writers[-1]
+
+    def rotating_writer(self, **policy) -> RotatingWriter:
+        # 1000 Hz mono 16 bit: a block of 100 frames is 0.1 second
+        return RotatingWriter(self.open_writer, channels=1, sample_width=2, framerate=1000,
+                              hooks=[self.completed.append], **policy)
+
+    def test_rotation_by_time_keeps_every_sample(self) -> None:
+        writer = self.rotating_writer(max_seconds=0.3)
+        blocks = [bytes([number]) * 200 for number in range(10)]
+        for block in blocks:
+            writer.write(block)
+        writer.close()
+
+        self.assertEqual([len(record.data) for record in self.writers], [600, 600, 600, 200])
+        self.assertEqual(b''.join(record.data for record in self.writers), b''.join(blocks))
+        self.assertEqual(self.completed, ['Record_1.wav', 'Record_2.wav', 'Record_3.wav', 'Record_4.wav'])
+        self.assertTrue(all(record.closed for record in self.writers))
+
+    def test_rotation_waits_for_silence(self) -> None:
+        writer = self.rotating_writer(max_bytes=400, on_silence=True)
+        for block in [self.loud] * 4 + [self.silence] + [self.loud] * 2:
+            writer.write(block)
+        writer.close()
+
+        self.assertEqual([len(record.data) for record in self.writers], [800, 600])
+
+
+if __name__ == '__main__':
+    unittest.main()
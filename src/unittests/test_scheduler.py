@@ -0,0 +1,164 @@
+import unittest
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from scheduler import CronExpression, LevelTrigger, RecordingScheduler, ScheduleEntry
+
+
+class FakeRecording:
+    """Ownership rules of "RecordingSession.begin_record" and "end_record" """
+
+    def __init__(self) -> None:
+        self.record_owner = None
+        self.pre_roll_seconds = None
+        self.count = 0
+
+    @property
+    def is_recording(self) -> bool:
+        return self.record_owner is not None
+
+    def begin_record(self, pre_roll_seconds: float | None = None, owner: str = 'user') -> bool:
+        if self.record_owner is not None:
+            if owner == 'user':
+                self.record_owner = owner
+            return False
+        self.record_owner = owner
+        self.pre_roll_seconds = pre_roll_seconds
+        return True
+
+    def end_record(self, owner: str | None = None) -> list[str]:
+        if self.record_owner is None or (owner is not None and self.record_owner != owner):
+            return []
+        self.record_owner = None
+        self.count += 1
+        return [f'record_{self.count}.wav']
+
+
+class FakeProducer:
+    def __init__(self) -> None:
+        self.armed_recording = FakeRecording()
+
+
+class TestCronExpression(unittest.TestCase):
+    def test_next_match(self) -> None:
+        # 2024-01-01 is a Monday
+        start = datetime(2024, 1, 1, 10, 7, 30)
+        self.assertEqual(CronExpression('*/15 * * * *').next_match(start), datetime(2024, 1, 1, 10, 15))
+        self.assertEqual(CronExpression('0 9 * * 1-5').next_match(start), datetime(2024, 1, 2, 9, 0))
+        self.assertEqual(CronExpression('30 6 * * 0').next_match(start), datetime(2024, 1, 7, 6, 30))
+        self.assertEqual(CronExpression('0 0 29 2 *').next_match(start), datetime(2024, 2, 29, 0, 0))
+        # A matching minute matches itself
+        self.assertEqual(CronExpression('0 9 * * *').next_match(datetime(2024, 1, 1, 9)), datetime(2024, 1, 1, 9))
+
+    def test_invalid(self) -> None:
+        for expression in ('* * * *', '60 * * * *', '5-1 * * * *', 'a * * * *'):
+            with self.assertRaises(ValueError):
+                CronExpression(expression)
+        with self.assertRaises(ValueError):
+            CronExpression('0 0 30 2 *').next_match(datetime(2024, 1, 1))
+
+
+class TestScheduleEntry(unittest.TestCase):
+    def test_window_starts_inside(self) -> None:
+        now = datetime(2024, 1, 1, 9, 10)
+        window = ScheduleEntry('0 9 * * *', 30 * 60, window=True)
+        window.reset(now)
+        self.assertEqual(window.due(now), datetime(2024, 1, 1, 9, 30))
+        self.assertEqual(window.next_start, datetime(2024, 1, 2, 9, 0))
+
+        job = ScheduleEntry('0 9 * * *', 10)
+        job.reset(now)
+        self.assertIsNone(job.due(now))
+
+    def test_missed_runs_are_skipped(self) -> None:
+        job = ScheduleEntry('* * * * *', 10)
+        job.reset(datetime(2024, 1, 1, 9, 0))
+        self.assertIsNone(job.due(datetime(2024, 1, 1, 12, 0, 30)))
+        self.assertEqual(job.next_start, datetime(2024, 1, 1, 12, 1))
+
+
+class TestLevelTrigger(unittest.TestCase):
+    def test_threshold(self) -> None:
+        trigger = LevelTrigger(threshold_db=-30)
+        trigger.write(np.full(1024, 100, dtype=np.int16).tobytes())
+        self.assertFalse(trigger.triggered.is_set())
+        trigger.write(np.full(1024, 10000, dtype=np.int16).tobytes())
+        self.assertTrue(trigger.triggered.is_set())
+
+
+class TestRecordingScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.producer = FakeProducer()
+        self.recording = self.producer.armed_recording
+        self.records = []
+
+    def test_job_runs_for_its_duration(self) -> None:
+        now = datetime.now()
+        job = ScheduleEntry('* * * * *', 0.2)
+        scheduler = RecordingScheduler(self.producer, jobs=[job])
+        scheduler.on_records.append(self.records.extend)
+        job.next_start = now
+
+        scheduler.check(now)
+        self.assertEqual((scheduler.active, self.recording.pre_roll_seconds), ('job', 0))
+        scheduler.check(now)
+        self.assertTrue(self.recording.is_recording)
+
+        time.sleep(0.25)
+        scheduler.check(now)
+        self.assertFalse(self.recording.is_recording)
+        self.assertEqual(self.records, ['record_1.wav'])
+
+    def test_level_trigger_with_hangover(self) -> None:
+        trigger = LevelTrigger(threshold_db=-30)
+        scheduler = RecordingScheduler(self.producer, trigger=trigger, hangover_seconds=0.1, pre_roll_seconds=0.5)
+        now = datetime.now()
+
+        trigger.write(np.full(512, 10000, dtype=np.int16).tobytes())
+        scheduler.check(now)
+        self.assertEqual((scheduler.active, self.recording.pre_roll_seconds), ('trigger', 0.5))
+
+        time.sleep(0.15)
+        scheduler.check(now)
+        self.assertIsNone(scheduler.active)
+        self.assertFalse(self.recording.is_recording)
+
+    def test_outside_record_is_left_alone(self) -> None:
+        self.recording.begin_record()
+        job = ScheduleEntry('* * * * *', 60)
+        scheduler = RecordingScheduler(self.producer, jobs=[job])
+        job.next_start = datetime.now()
+
+        scheduler.check(datetime.now())
+        self.assertIsNone(scheduler.active)
+        self.assertEqual(self.recording.count, 0)
+
+    def test_user_takes_over_a_scheduled_record(self) -> None:
+        job = ScheduleEntry('* * * * *', 0.1)
+        scheduler = RecordingScheduler(self.producer, jobs=[job])
+        job.next_start = datetime.now()
+        scheduler.check(datetime.now())
+        self.assertEqual(scheduler.active, 'job')
+
+        # The Start button
+        self.assertFalse(self.recording.begin_record())
+        time.sleep(0.15)
+        scheduler.check(datetime.now())
+        self.assertIsNone(scheduler.active)
+        self.assertTrue(self.recording.is_recording)
+        # The Stop button gets the record
+        self.assertEqual(self.recording.end_record(), ['record_1.wav'])
+
+
+if __name__ == '__main__':
+    unittest.main()
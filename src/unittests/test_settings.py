@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+import manager
+from manager import Settings, SettingsSnapshot, validate_settings
+
+
+class TestSettingsSnapshot(unittest.TestCase):
+    def test_attribute_access_and_dotted_lookup(self) -> None:
+        snapshot = SettingsSnapshot({'recorder': {'freq': 44100, 'devices': [1, 'usb']}})
+
+        self.assertEqual(snapshot.recorder.freq, 44100)
+        self.assertEqual(snapshot.get('recorder.freq'), 44100)
+        self.assertEqual(snapshot.recorder.devices, (1, 'usb'))
+        self.assertIs(snapshot.get('recorder'), snapshot.recorder)
+        with self.assertRaises(ValueError):
+            snapshot.get('recorder.channels')
+
+    def test_immutable(self) -> None:
+        snapshot = SettingsSnapshot({'recorder': {'freq': 44100}})
+        with self.assertRaises(AttributeError):
+            snapshot.recorder.freq = 48000
+
+    def test_validation_lists_every_problem(self) -> None:
+        with open(manager.SETTINGS) as file:
+            settings_data = json.load(file)
+        validate_settings(settings_data)
+
+        settings_data['recorder']['freq'] = True
+        settings_data['recorder']['format'] = 'mp3'
+        del settings_data['vad']['enabled']
+        with self.assertRaises(ValueError) as context:
+            validate_settings(settings_data)
+
+        message = str(context.exception)
+        for setting in ('recorder.freq', 'recorder.format', 'vad.enabled'):
+            self.assertIn(setting, message)
+
+    def test_durations_and_limits_must_be_positive(self) -> None:
+        with open(manager.SETTINGS) as file:
+            settings_data = json.load(file)
+
+        for section, key, value in (('recorder', 'calibration_probe_seconds', 0),
+                                    ('recorder', 'header_update_seconds', -1),
+                                    ('rotation', 'max_minutes', -5),
+                                    ('rotation', 'max_megabytes', -0.5)):
+            changed = json.loads(json.dumps(settings_data))
+            changed[section][key] = value
+            with self.assertRaises(ValueError) as context:
+                validate_settings(changed)
+            self.assertIn(f'"{section}.{key}" must', str(context.exception))
+
+        # 0 disables a rotation limit
+        settings_data['rotation'].update(max_minutes=0, max_megabytes=0)
+        validate_settings(settings_data)
+
+    def test_multi_device_rejects_unsupported_features(self) -> None:
+        with open(manager.SETTINGS) as file:
+            settings_data = json.load(file)
+        settings_data['multi_device']['enabled'] = True
+        validate_settings(settings_data)
+
+        settings_data['vad']['enabled'] = True
+        settings_data['rotation']['enabled'] = True
+        with self.assertRaises(ValueError) as context:
+            validate_settings(settings_data)
+
+        message = str(context.exception)
+        self.assertIn('"vad.enabled" is not supported with "multi_device.enabled"', message)
+        self.assertIn('"rotation.enabled" is not supported', message)
+        self.assertNotIn('postprocess.enabled', message)
+
+
+class TestSettingsReload(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.settings_path = os.path.join(self.directory, 'settings.json')
+        shutil.copy(manager.SETTINGS, self.settings_path)
+        patcher = mock.patch.object(manager, 'SETTINGS', self.settings_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.settings = Settings()
+        return super().setUp()
+
+    def edit(self, change) -> None:
+        with open(self.settings_path) as file:
+            settings_data = json.load(file)
+        change(settings_data)
+        with open(self.settings_path, 'w') as file:
+            json.dump(settings_data, file)
+        # Make the change visible even on coarse mtime clocks
+        stat = os.stat(self.settings_path)
+        os.utime(self.settings_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_reload_applies_changes_and_calls_listeners(self) -> None:
+        received = []
+        self.settings.add_listener(received.append)
+        old_snapshot = self.settings.snapshot
+        self.assertFalse(self.settings.reload())
+
+        self.edit(lambda settings_data: settings_data['recorder'].update(frames_per_buffer=512))
+
+        self.assertTrue(self.settings.reload())
+        self.assertEqual(self.settings.get_setting('recorder.frames_per_buffer'), 512)
+        self.assertEqual(old_snapshot.recorder.frames_per_buffer, 1024)
+        self.assertEqual([snapshot.recorder.frames_per_buffer for snapshot in received], [512])
+
+    def test_invalid_file_keeps_the_settings(self) -> None:
+        self.edit(lambda settings_data: settings_data['recorder'].update(channels='two'))
+
+        self.assertFalse(self.settings.reload())
+        self.assertIn('recorder.channels', self.settings.last_error)
+        self.assertEqual(self.settings.get_setting('recorder.channels'), 2)
+
+    def test_invalid_schedule_entries_are_reported(self) -> None:
+        def change(settings_data: dict) -> None:
+            settings_data['scheduler']['windows'] = [{'cron': '0 9 * * 1-5', 'minutes': 30}, {'cron': '0 18 * * *'}]
+            settings_data['scheduler']['jobs'] = [
+                {'cron': 5, 'seconds': 10}, '*/5 * * * *', {'cron': '* * * * *', 'seconds': 0}]
+
+        self.edit(change)
+
+        self.assertFalse(self.settings.reload())
+        for problem in ('scheduler.windows[1].minutes', 'scheduler.jobs[0].cron',
+                        'scheduler.jobs[1]', 'scheduler.jobs[2].seconds'):
+            self.assertIn(problem, self.settings.last_error)
+        self.assertNotIn('scheduler.windows[0]', self.settings.last_error)
+        self.assertEqual(self.settings.get_setting('scheduler.windows'), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from vad import VoiceActivityDetector
+
+
+class MemoryWriter:
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data) -> None:
+        self.data.extend(data)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    BLOCK = 100
+
+    def setUp(self) -> None:
+        self.writers = []
+        time = np.arange(self.BLOCK)
+        self.voiced = (np.sin(2 * np.pi * 5 * time / self.BLOCK) * 10000).astype(np.int16).tobytes()
+        self.silence = np.zeros(self.BLOCK, dtype=np.int16).tobytes()
+        return super().setUp()
+
+    def open_writer(self) -> MemoryWriter:
+        self.writers.append(MemoryWriter())
+        return self.writers[-1]
+
+    def detector(self, split_segments: bool = False) -> VoiceActivityDetector:
+        # 1 block of pre-roll and 2 blocks of hangover at 1000 Hz mono.
+        return VoiceActivityDetector(
+            self.open_writer, channels=1, sample_width=2, framerate=1000,
+            hangover_ms=200, pre_roll_ms=100, split_segments=split_segments)
+
+    def test_silence_is_skipped(self) -> None:
+        """Only the pre-roll, the voiced block and the hangover are written"""
+        detector = self.detector()
+        for chunk in [self.silence] * 5 + [self.voiced] + [self.silence] * 5:
+            detector.write(chunk)
+        detector.close()
+
+        self.assertEqual(len(self.writers), 1)
+        self.assertEqual(bytes(self.writers[0].data), self.silence + self.voiced + self.silence * 2)
+        self.assertTrue(self.writers[0].closed)
+
+    def test_split_segments(self) -> None:
+        """Every voiced segment is written to its own file"""
+        detector = self.detector(split_segments=True)
+        for chunk in [self.voiced] + [self.silence] * 5 + [self.voiced]:
+            detector.write(chunk)
+        detector.close()
+
+        self.assertEqual(len(self.writers), 2)
+        self.assertTrue(all(writer.closed for writer in self.writers))
+
+    def test_no_file_without_speech(self) -> None:
+        detector = self.detector()
+        for chunk in [self.silence] * 10:
+            detector.write(chunk)
+        detector.close()
+
+        self.assertEqual(self.writers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
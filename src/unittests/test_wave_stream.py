@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import tempfile
+import wave
+
+# ADD TESTED MODULES TO THE PATH DYNAMICALLY.
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'voice_recorder'))
+sys.path.append(parent_dir)
+
+# IMPORT TESTED MODULES BELLOW:
+from wave_stream import StreamingWaveWriter
+
+
+class TestStreamingWaveWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.temp_dir.name, 'Record_1.wav')
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def test_chunks_are_written_incrementally(self) -> None:
+        """The written file has to be equal to the joined chunks"""
+        chunks = [bytes([i]) * 4096 for i in range(10)]
+
+        with StreamingWaveWriter(self.full_path, channels=2, sample_width=2, framerate=44100) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+        with wave.open(self.full_path, 'rb') as audio_file:
+            self.assertEqual(audio_file.getnchannels(), 2)
+            self.assertEqual(audio_file.getsampwidth(), 2)
+            self.assertEqual(audio_file.getframerate(), 44100)
+            self.assertEqual(audio_file.getnframes(), 10 * 4096 // 4)
+            self.assertEqual(audio_file.readframes(audio_file.getnframes()), b''.join(chunks))
+
+    def test_partial_file_is_readable(self) -> None:
+        """A file which was never closed is valid up to the last header update"""
+        writer = StreamingWaveWriter(
+            self.full_path, channels=1, sample_width=2, framerate=16000, header_update_interval=0)
+        writer.write(b'\x01\x00' * 100)
+
+        with wave.open(self.full_path, 'rb') as audio_file:
+            self.assertEqual(audio_file.getnframes(), 100)
+
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
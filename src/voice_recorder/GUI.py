@@ -1,21 +1,307 @@
 # OS
 import os
 import subprocess
+from collections import deque
 from threading import Thread
 from platform import system
 
 # TK
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
+from tkinter import filedialog, messagebox, simpledialog, ttk
 
 # Application
 from recorder import Recorder
+from level_monitor import LevelMonitor
+from records_index import RecordsIndex, RECORD_EXTENSIONS, SORT_COLUMNS
+from metadata import MetadataExtractor
+from player import RecordPlayer
 from manager import SettingsManager
 
 # GLOBAL VARIABLES
 settings_manager = SettingsManager()
 
 
+class LevelMeter(tk.Frame):
+    """
+    Live RMS/peak meter and scrolling waveform of the running recording.
+    Points are drained from the "LevelMonitor" side channel and the canvas
+    is redrawn at most "fps" times a second via "after()".
+    """
+
+    def __init__(self, master, level_monitor: LevelMonitor, width: int = 230, height: int = 60, fps: int = 30) -> None:
+        super().__init__(master)
+        self.level_monitor = level_monitor
+        self.width = width
+        self.height = height
+        self.interval = max(1000 // fps, 1)
+        self.history = deque([(0.0, 0.0)] * width, maxlen=width)
+        self._after_id = None
+
+        self.meter_canvas = tk.Canvas(
+            self, width=width, height=10, bg="black", highlightthickness=0)
+        self.meter_canvas.pack(pady=2)
+        self.rms_bar = self.meter_canvas.create_rectangle(0, 0, 0, 10, fill="green", width=0)
+        self.peak_mark = self.meter_canvas.create_line(0, 0, 0, 10, fill="red")
+
+        self.waveform_canvas = tk.Canvas(
+            self, width=width, height=height, bg="black", highlightthickness=0)
+        self.waveform_canvas.pack(pady=2)
+        self.waveform = self.waveform_canvas.create_line(
+            *self._waveform_coords(), fill="lime")
+
+    def _waveform_coords(self) -> list[float]:
+        middle = self.height / 2
+        coords = []
+        for x, (low, high) in enumerate(self.history):
+            coords.extend((x, middle - high * middle, x, middle - low * middle))
+        return coords
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._redraw()
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self.level_monitor.drain()
+        self.history.extend([(0.0, 0.0)] * self.width)
+        self.meter_canvas.coords(self.rms_bar, 0, 0, 0, 10)
+        self.meter_canvas.coords(self.peak_mark, 0, 0, 0, 10)
+        self.waveform_canvas.coords(self.waveform, *self._waveform_coords())
+
+    def _redraw(self) -> None:
+        points = self.level_monitor.drain()
+        if points:
+            peak = max(point[0] for point in points)
+            rms = points[-1][1]
+            self.history.extend((low, high) for _, _, low, high in points)
+
+            self.meter_canvas.coords(self.rms_bar, 0, 0, rms * self.width, 10)
+            self.meter_canvas.coords(
+                self.peak_mark, peak * self.width, 0, peak * self.width, 10)
+            self.waveform_canvas.coords(self.waveform, *self._waveform_coords())
+
+        self._after_id = self.after(self.interval, self._redraw)
+
+
+class VirtualRecordList(tk.Frame):
+    """
+    Records list which materializes only the visible rows.
+    Rows are fetched from the records index page by page while scrolling
+    and filtered by an incremental name search, so the cost of the widget
+    does not depend on the size of the library.
+    """
+    PLACEHOLDER = "No audio records found in the selected directory."
+
+    def __init__(self, master, records_index: RecordsIndex, rows: int = 10, page_size: int = 100,
+                 width: int = 50, max_cached_pages: int = 16) -> None:
+        super().__init__(master)
+        self.records_index = records_index
+        self.rows = rows
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.sort_by = 'name'
+        self.search = ''
+        self.offset = 0
+        self.total = 0
+        self._pages: dict[int, list[str]] = {}
+        self._search_after_id = None
+        # Called with the visible records after every redraw
+        self.on_scroll = None
+
+        # Incremental filename search
+        self.search_variable = tk.StringVar()
+        self.search_variable.trace_add('write', self._on_search_changed)
+        self.search_entry = tk.Entry(self, textvariable=self.search_variable)
+        self.search_entry.pack(side=tk.TOP, fill=tk.X, padx=5, pady=2)
+
+        # Visible window
+        self.listbox = tk.Listbox(
+            self, selectmode=tk.SINGLE, width=width, height=rows)
+        self.listbox.pack(side=tk.LEFT, padx=5, fill=tk.BOTH, expand=True)
+
+        self.scrollbar = tk.Scrollbar(
+            self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 1))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 1))
+
+    def refresh(self) -> None:
+        """Forget cached pages and redraw the current window"""
+        self._pages.clear()
+        self.total = self.records_index.count(self.search)
+        self.scroll_to(self.offset)
+
+    def set_order(self, sort_by: str) -> None:
+        self.sort_by = sort_by
+        self.offset = 0
+        self.refresh()
+
+    def set_search(self, search: str) -> None:
+        self.search = search
+        self.offset = 0
+        self.refresh()
+
+    def _get_row(self, position: int) -> str:
+        page_number, row = divmod(position, self.page_size)
+        if page_number not in self._pages:
+            if len(self._pages) >= self.max_cached_pages:
+                self._pages.clear()
+            self._pages[page_number] = self.records_index.page(
+                page_number * self.page_size, self.page_size, self.sort_by, search=self.search)
+
+        page = self._pages[page_number]
+        return page[row] if row < len(page) else ''
+
+    def visible_records(self) -> list[str]:
+        last = min(self.offset + self.rows, self.total)
+        return [self._get_row(position) for position in range(self.offset, last)]
+
+    def scroll_to(self, offset: int) -> None:
+        self.offset = max(0, min(offset, self.total - self.rows))
+
+        self.listbox.delete(0, tk.END)
+        records = self.visible_records()
+        if records:
+            self.listbox.insert(tk.END, *records)
+        elif not self.search:
+            self.listbox.insert(tk.END, self.PLACEHOLDER)
+
+        if self.on_scroll is not None:
+            self.on_scroll(records)
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(self.offset + self.rows, self.total) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, action: str, value: str, unit: str | None = None) -> None:
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * self.total))
+        elif action == 'scroll':
+            step = self.rows if unit == 'pages' else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def _on_mouse_wheel(self, event) -> None:
+        self.scroll_to(self.offset - (1 if event.delta > 0 else -1) * 3)
+
+    def _on_search_changed(self, *args) -> None:
+        # Wait for a pause in typing before querying the index
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(
+            150, lambda: self.set_search(self.search_variable.get()))
+
+
+class RecordDetails(tk.Frame):
+    """Duration, size, loudness and a waveform thumbnail of the selected record"""
+
+    def __init__(self, master, width: int = 230, height: int = 30) -> None:
+        super().__init__(master)
+        self.width = width
+        self.height = height
+        self.label = tk.Label(self, text="", anchor=tk.W, justify=tk.LEFT)
+        self.label.pack(fill=tk.X)
+        self.thumbnail_canvas = tk.Canvas(
+            self, width=width, height=height, bg="black", highlightthickness=0)
+        self.thumbnail_canvas.pack(pady=2)
+
+    def show(self, metadata: dict | None) -> None:
+        self.thumbnail_canvas.delete("all")
+        if metadata is None:
+            self.label.config(text="")
+            return
+
+        lines = [f"{metadata['size'] / 1024 ** 2:.1f} MB"]
+        if metadata.get('duration') is not None:
+            minutes, seconds = divmod(int(metadata['duration']), 60)
+            lines[0] = f"{minutes}:{seconds:02}  ·  " + lines[0]
+        if metadata.get('peak_db') is not None:
+            lines.append(f"peak {metadata['peak_db']:.1f} dBFS  ·  RMS {metadata['rms_db']:.1f} dBFS")
+        self.label.config(text="\n".join(lines))
+
+        thumbnail = metadata.get('thumbnail') or []
+        if thumbnail:
+            step = self.width / len(thumbnail)
+            middle = self.height / 2
+            for number, value in enumerate(thumbnail):
+                x = number * step + step / 2
+                self.thumbnail_canvas.create_line(
+                    x, middle - value * middle, x, middle + value * middle + 1, fill="lime", width=max(step - 1, 1))
+
+
+class PlaybackBar(tk.Frame):
+    """
+    Play/pause button, seek slider and position of the record played by "RecordPlayer".
+    The slider follows the playback via "after()" and seeks when it is released.
+    """
+
+    def __init__(self, master, player: RecordPlayer, length: int = 150, interval_ms: int = 100) -> None:
+        super().__init__(master)
+        self.player = player
+        self.interval_ms = interval_ms
+        self._dragging = False
+        self._polling = False
+
+        self.play_button = tk.Button(self, text="▶", width=2, command=self.toggle, state=tk.DISABLED)
+        self.play_button.pack(side=tk.LEFT)
+        self.position = tk.DoubleVar(value=0.0)
+        self.slider = ttk.Scale(self, from_=0.0, to=1.0, variable=self.position, length=length)
+        self.slider.pack(side=tk.LEFT, padx=5)
+        self.slider.bind("<ButtonPress-1>", self._on_press)
+        self.slider.bind("<ButtonRelease-1>", self._on_release)
+        self.time_label = tk.Label(self, text="0:00")
+        self.time_label.pack(side=tk.LEFT)
+
+    def play(self, full_path: str) -> None:
+        self.player.play(full_path)
+        self.slider.config(to=max(self.player.duration, 0.001))
+        self.play_button.config(state=tk.NORMAL)
+        if not self._polling:
+            self._polling = True
+            self._poll()
+
+    def toggle(self) -> None:
+        if self.player.playing:
+            self.player.pause()
+        else:
+            self.player.resume()
+        if not self._polling:
+            self._polling = True
+            self._poll()
+
+    def stop(self) -> None:
+        self.player.stop()
+        self.play_button.config(state=tk.DISABLED, text="▶")
+
+    def _on_press(self, event=None) -> None:
+        self._dragging = True
+
+    def _on_release(self, event=None) -> None:
+        self._dragging = False
+        self.player.seek(self.position.get())
+        self._show_time(self.position.get())
+
+    def _show_time(self, seconds: float) -> None:
+        minutes, seconds = divmod(int(seconds), 60)
+        self.time_label.config(text=f"{minutes}:{seconds:02}")
+
+    def _poll(self) -> None:
+        playing = self.player.playing
+        self.play_button.config(text="❚❚" if playing else "▶")
+        if not self._dragging:
+            self.position.set(self.player.position)
+            self._show_time(self.player.position)
+
+        if playing:
+            self.master.after(self.interval_ms, self._poll)
+        else:
+            self._polling = False
+
+
 class VoiceRecorderApp:
     """
     This class is responsible only for GUI interface of the application.
@@ -25,7 +311,7 @@ class VoiceRecorderApp:
         self.selected_item = None
         self.master = master
         self.master.title("Voice Recorder App")
-        self.master.geometry('250x500')
+        self.master.geometry('250x760')
         self.icon_image = tk.PhotoImage(
             file=settings_manager.get_setting('GUI.icon_path'))
         self.master.wm_iconphoto(True, self.icon_image)
@@ -33,6 +319,17 @@ class VoiceRecorderApp:
         # Essentials
         self.recorder = Recorder()
         self.is_recording = False
+        self.records_index = RecordsIndex(
+            settings_manager.get_setting('save_records_path'))
+        self.metadata_extractor = MetadataExtractor(
+            max_workers=settings_manager.get_setting('GUI.metadata_workers'))
+        # Metadata of the records analyzed so far by name
+        self.records_metadata = {}
+        # Stopped recordings whose records are still being closed
+        self.pending_finalizations = []
+        self.finalized_records = []
+        # Records of the scheduler, appended from its thread
+        self.scheduled_records = deque()
 
         # GUI Elements
 
@@ -45,6 +342,12 @@ class VoiceRecorderApp:
             self.master, text="Stop Recording", command=self.stop_recording, state=tk.DISABLED)
         self.stop_button.pack(pady=10)
 
+        # Retroactive capture, available while the recorder is armed
+        self.pre_roll_seconds = settings_manager.get_setting('recorder.pre_roll_seconds')
+        self.save_last_button = tk.Button(
+            self.master, text=f"Save Last {self.pre_roll_seconds} s", command=self.save_last_seconds, state=tk.DISABLED)
+        self.save_last_button.pack(pady=5)
+
         # Canvas for recording indicator
         self.recording_indicator_canvas = tk.Canvas(
             self.master, width=20, height=20, bg="red", highlightthickness=0)
@@ -55,6 +358,19 @@ class VoiceRecorderApp:
         circle = self.recording_indicator_canvas.create_oval(
             50, 50, 150, 150, fill="red")
 
+        # Live level meter and waveform
+        self.level_meter = LevelMeter(
+            self.master, self.recorder.level_monitor, fps=settings_manager.get_setting('GUI.meter_fps'))
+        self.level_meter.pack(pady=5)
+
+        # Shown while stopped records are finalized in the background
+        self.finalizing_frame = tk.Frame(self.master)
+        self.finalizing_frame.pack()
+        self.finalizing_label = tk.Label(self.finalizing_frame, text="")
+        self.finalizing_progress = ttk.Progressbar(
+            self.finalizing_frame, mode='indeterminate', length=200)
+        self.master.bind("<<RecordsFinalized>>", self.on_records_finalized)
+
         # Menubar
         menubar = tk.Menu(self.master)
         self.master.config(menu=menubar)
@@ -69,14 +385,27 @@ class VoiceRecorderApp:
         self.records_frame = tk.Frame(self.master)
         self.records_frame.pack(pady=10)
 
-        # Listbox to display records with Scrollbar
-        self.records_listbox = tk.Listbox(
-            self.records_frame, selectmode=tk.SINGLE, width=50)
-        self.records_listbox.pack(
-            side=tk.LEFT, padx=5, fill=tk.BOTH, expand=True)
+        # Virtualized list to display records with search and Scrollbar
+        self.records_list = VirtualRecordList(
+            self.records_frame, self.records_index)
+        self.records_list.pack(fill=tk.BOTH, expand=True)
+        self.records_listbox = self.records_list.listbox
+        self.records_list.on_scroll = self.prefetch_metadata
+        self.records_listbox.bind("<<ListboxSelect>>", self.show_record_details)
+
+        # Details of the selected record
+        self.record_details = RecordDetails(self.master)
+        self.record_details.pack(pady=5)
+
+        # In-app playback of the records
+        self.player = RecordPlayer()
+        self.playback_bar = PlaybackBar(self.master, self.player)
+        self.playback_bar.pack(pady=5)
 
         # Listbox right mouse click menu config
         self.right_click_menu = tk.Menu(self.records_frame, tearoff=0)
+        self.right_click_menu.add_command(
+            label="Play", command=self.play_record)
         self.right_click_menu.add_command(
             label="Rename", command=self.rename_record)
         self.right_click_menu.add_command(
@@ -90,14 +419,6 @@ class VoiceRecorderApp:
         # Bind menu to the FocusOut event to close when it loses focus
         self.right_click_menu.bind("<FocusOut>", self.close_context_menu)
 
-        # Scrollbar for the Listbox
-        scrollbar = tk.Scrollbar(
-            self.records_frame, orient=tk.VERTICAL, command=self.records_listbox.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Configure Listbox to use the scrollbar
-        self.records_listbox.config(yscrollcommand=scrollbar.set)
-
         # Frames for lower buttons
         self.records_controller = tk.Frame(master)
         self.records_controller.pack(pady=10)
@@ -114,8 +435,32 @@ class VoiceRecorderApp:
         # self.list_records_button.pack(pady=5)
         self.sort_records_button.grid(row=0, column=1, padx=5, pady=5)
 
+        # Sort key selector
+        self.sort_by = tk.StringVar(value='name')
+        self.sort_by_menu = tk.OptionMenu(
+            self.records_controller, self.sort_by, *SORT_COLUMNS, command=lambda _: self.sort_records())
+        self.sort_by_menu.grid(row=0, column=2, padx=5, pady=5)
+
         # Init methods:
+        # Records of a recording interrupted by a crash are rebuilt from their journals
+        recovered = self.recorder.recover_records()
         self.list_records()
+        if recovered:
+            messagebox.showinfo(
+                "Records Recovered",
+                "Recovered after an unexpected exit:\n" + "\n".join(os.path.basename(record) for record in recovered))
+        if settings_manager.get_setting('recorder.always_armed'):
+            self.recorder.arm()
+            self.save_last_button.config(state=tk.NORMAL)
+            self.level_meter.start()
+        if settings_manager.get_setting('scheduler.enabled'):
+            # The scheduler arms the recorder
+            self.recorder.start_scheduler(self.scheduled_records.extend)
+            self.save_last_button.config(state=tk.NORMAL)
+            self.level_meter.start()
+            self.poll_scheduled_records()
+        self.poll_metadata()
+        self.poll_settings()
 
     def start_recording(self):
         if not self.is_recording:
@@ -131,6 +476,7 @@ class VoiceRecorderApp:
             # self.recording_thread.start()
 
             self.recorder.start_recording()
+            self.level_meter.start()
 
     def stop_recording(self):
         if self.is_recording:
@@ -140,9 +486,59 @@ class VoiceRecorderApp:
             self.recording_indicator_canvas.config(
                 bg="red")  # Change color back to red when recording stops
 
-            # Stop recording (you need to implement this method in your Recorder class)
-            self.recorder.stop_recording()
-            self.list_records()
+            # The records are finalized in the background, the list is updated when they are ready
+            self.pending_finalizations.append(self.recorder.stop_recording_in_background())
+            if not self.recorder.is_armed:
+                self.level_meter.stop()
+            if len(self.pending_finalizations) == 1:
+                self.finalizing_label.pack()
+                self.finalizing_progress.pack(pady=5)
+                self.finalizing_progress.start(20)
+                self.poll_finalizations()
+            self.finalizing_label.config(
+                text=f"Finalizing {len(self.pending_finalizations)} recording(s)...")
+
+    def poll_finalizations(self) -> None:
+        """Collect finished finalizations and announce them with a "<<RecordsFinalized>>" event"""
+        for future in [future for future in self.pending_finalizations if future.done()]:
+            self.pending_finalizations.remove(future)
+            try:
+                self.finalized_records.extend(future.result())
+            except Exception as error:
+                messagebox.showerror("Record Error", f"The record could not be finalized: {error}")
+        if self.finalized_records:
+            self.master.event_generate("<<RecordsFinalized>>")
+
+        if self.pending_finalizations:
+            self.finalizing_label.config(
+                text=f"Finalizing {len(self.pending_finalizations)} recording(s)...")
+            self.master.after(100, self.poll_finalizations)
+        else:
+            self.finalizing_progress.stop()
+            self.finalizing_progress.pack_forget()
+            self.finalizing_label.pack_forget()
+
+    def poll_scheduled_records(self) -> None:
+        """Announce the records finished by the scheduler"""
+        while self.scheduled_records:
+            self.finalized_records.append(self.scheduled_records.popleft())
+        if self.finalized_records:
+            self.master.event_generate("<<RecordsFinalized>>")
+
+        self.master.after(500, self.poll_scheduled_records)
+
+    def on_records_finalized(self, event=None) -> None:
+        """Add the finalized records to the list"""
+        records, self.finalized_records = self.finalized_records, []
+        for full_path in records:
+            self.records_index.add(full_path)
+        self.records_list.refresh()
+
+    def save_last_seconds(self):
+        """Dump the pre-roll buffer of the armed recorder into a new record"""
+        full_path = self.recorder.save_last_seconds(self.pre_roll_seconds)
+        self.records_index.add(full_path)
+        self.records_list.refresh()
 
     @staticmethod
     def show_settings():
@@ -162,35 +558,72 @@ class VoiceRecorderApp:
                     f"Operating system '{operating_system}' is not supported")
 
     def list_records(self):
-        # TODO: sorting.
-        # Can replace this with your own directory
-        # directory = filedialog.askdirectory(title="Select Directory")
-        directory = settings_manager.get_setting('save_records_path')
-        if directory:
-            self.records_listbox.delete(0, tk.END)
-            records = [file for file in os.listdir(
-                directory) if file.endswith(('.wav', '.mp3', '.ogg'))]
-            if records:
-                self.records_listbox.delete(
-                    0, tk.END)  # Clear the current list
-                for record in records:
-                    # Insert the frame into the listbox
-                    self.records_listbox.insert(tk.END, record)
-            else:
-                self.records_listbox.delete(0, tk.END)
-                self.records_listbox.insert(
-                    tk.END, "No audio records found in the selected directory.")
+        """
+        Reconcile the records index with the records directory
+        and redraw the visible rows.
+        """
+        added, _ = self.records_index.sync(read_durations=False)
+        # Durations are read from the headers in the background
+        self.metadata_extractor.index_durations(self.records_index, added)
+        self.records_list.refresh()
 
     def sort_records(self) -> int:
-        data = list(self.records_listbox.get(0, "end"))
-        data.sort()
-        self.records_listbox.delete(0, "end")
-
-        for record in data:
-            self.records_listbox.insert(tk.END, record)
+        """Show the records ordered by the selected sort key, served from the index"""
+        self.records_list.set_order(self.sort_by.get())
 
         return 0
 
+    def prefetch_metadata(self, records: list[str]) -> None:
+        """Analyze the visible records in the background"""
+        directory = settings_manager.get_setting('save_records_path')
+        for record in records:
+            self.metadata_extractor.submit(os.path.join(directory, record))
+
+    def poll_metadata(self) -> None:
+        """Collect finished metadata jobs without blocking the Tk thread"""
+        selected = self._get_selected_record()
+        for metadata in self.metadata_extractor.drain():
+            self.records_metadata[metadata['name']] = metadata
+            if metadata['name'] == selected:
+                self.record_details.show(metadata)
+
+        self.master.after(100, self.poll_metadata)
+
+    def poll_settings(self) -> None:
+        """
+        Apply edits of settings.json. The reload runs on the Tk thread,
+        so the settings listeners may touch the widgets.
+        """
+        if settings_manager.reload():
+            directory = settings_manager.get_setting('save_records_path')
+            if directory != self.records_index.directory:
+                self.records_index.close()
+                self.records_index = RecordsIndex(directory)
+                self.records_list.records_index = self.records_index
+                self.list_records()
+
+        self.master.after(1000, self.poll_settings)
+
+    def _get_selected_record(self) -> str | None:
+        selection = self.records_listbox.curselection()
+        if not selection:
+            return None
+        return self.records_listbox.get(selection[0])
+
+    def show_record_details(self, event=None) -> None:
+        self.record_details.show(
+            self.records_metadata.get(self._get_selected_record()))
+
+    def play_record(self, file=None):
+        if self.selected_item:
+            file = self.selected_item
+
+        try:
+            self.playback_bar.play(os.path.join(settings_manager.get_setting(
+                'save_records_path'), file, ))
+        except Exception as error:
+            messagebox.showerror("Playback Error", f"{file} could not be played: {error}")
+
     def confirm_delete(self, file=None):
         if self.selected_item:
             file = self.selected_item
@@ -198,10 +631,13 @@ class VoiceRecorderApp:
         confirm_dialog = messagebox.askquestion(
             "Confirm Delete", f"Are you sure you want to delete {file}?", icon='warning')
         if confirm_dialog == 'yes':
+            if self.player.full_path and os.path.basename(self.player.full_path) == file:
+                self.playback_bar.stop()
             os.remove(os.path.join(settings_manager.get_setting(
                 'save_records_path'), file, ))
             # Update the listbox after deletion
-            self.list_records()
+            self.records_index.remove(file)
+            self.records_list.refresh()
 
     def rename_record(self, file=None):
         if self.selected_item:
@@ -217,7 +653,11 @@ class VoiceRecorderApp:
                     'save_records_path'), new_name, )
             )
             # Update the listbox after renaming
-            self.list_records()
+            if new_name.endswith(RECORD_EXTENSIONS):
+                self.records_index.rename(file, new_name)
+            else:
+                self.records_index.remove(file)
+            self.records_list.refresh()
 
     # Right mouse click menu
     # Create a context menu
@@ -1,5 +1,10 @@
 import sys
-from GUI import main
+from os import path
+
+# The application modules import each other by their plain names.
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+from cli import main
 
 
 if __name__ == '__main__':
@@ -0,0 +1,222 @@
+# Annotations
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+# OS
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+
+# Libs
+from manager import SettingsManager
+from ring_buffer import RingBuffer
+from calibration import resolve_frames_per_buffer
+from record_producer import RecordingSession
+
+# GLOBAL VARIABLES
+settings_manager = SettingsManager()
+# "pyaudio.paInt16"
+PA_INT16 = 8
+# Blocks buffered for every block iterator, a slower reader loses the oldest ones
+BLOCK_QUEUE_SIZE = 64
+
+
+class AsyncRecordingSession(RecordingSession):
+    """
+    Continuous recording driven by an event loop. The audio callback only
+    buffers the block and wakes the loop; draining and writing run on the
+    worker pool shared by all sessions, so a session owns no thread.
+    """
+
+    def __init__(self, recorder: 'AsyncRecorder') -> None:
+        super().__init__()
+        self.recorder = recorder
+        self.stream = None
+        # Resolves to the created records once they are closed
+        self.finalized: asyncio.Future[list[str]] | None = None
+        self._loop = None
+        self._data_ready = None
+        self._pump = None
+        self._chunk = None
+        self._subscribers: list[asyncio.Queue[bytes | None]] = []
+
+    def _stream_callback(self, in_data: bytes, frame_count: int, time_info: dict, status: int) -> tuple[None, int]:
+        result = super()._stream_callback(in_data, frame_count, time_info, status)
+        self._loop.call_soon_threadsafe(self._data_ready.set)
+        return result
+
+    async def open(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._data_ready = asyncio.Event()
+
+        channels = self.settings.recorder.channels
+        freq = self.settings.recorder.freq
+        # Calibration may probe the device, keep it off the loop
+        frames_per_buffer = await self.recorder.run(resolve_frames_per_buffer, self.settings)
+        self.sample_width = self.recorder.audio.get_sample_size(PA_INT16)
+        frame_size = channels * self.sample_width
+        self.ring_buffer = RingBuffer(int(freq * self.settings.recorder.ring_buffer_seconds) * frame_size)
+        self._chunk = memoryview(bytearray(frames_per_buffer * frame_size))
+
+        self._record_sink = await self.recorder.run(self._open_record_sink, self.sample_width)
+        try:
+            self.stream = await self.recorder.run(partial(
+                self.recorder.open_stream,
+                format=PA_INT16,
+                channels=channels,
+                rate=freq,
+                input=True,
+                frames_per_buffer=frames_per_buffer,
+                stream_callback=self._stream_callback
+            ))
+        except BaseException:
+            # Nothing was captured, do not leave an empty record and a locked journal
+            await self.recorder.run(self._discard_record_sink)
+            raise
+        self._pump = asyncio.create_task(self._pump_blocks())
+        self.ready.set()
+
+    def _drain(self, copy: bool) -> list[bytes]:
+        """Hand the buffered blocks to the record and the sinks, return copies for the iterators"""
+        blocks = []
+        while len(self.ring_buffer):
+            chunk = self._chunk[:self.ring_buffer.pop_into(self._chunk, timeout=0)]
+            self._write_record(chunk)
+            for sink in self.sinks:
+                sink(chunk)
+            if copy:
+                blocks.append(bytes(chunk))
+        return blocks
+
+    def _publish(self, block: bytes | None) -> None:
+        for subscriber in self._subscribers:
+            if subscriber.full():
+                subscriber.get_nowait()
+            subscriber.put_nowait(block)
+
+    async def _pump_blocks(self) -> None:
+        try:
+            while not (self.ring_buffer.closed and not len(self.ring_buffer)):
+                await self._data_ready.wait()
+                self._data_ready.clear()
+                for block in await self.recorder.run(self._drain, bool(self._subscribers)):
+                    self._publish(block)
+        finally:
+            # End of the block iterators
+            self._publish(None)
+
+    async def blocks(self) -> AsyncIterator[bytes]:
+        """Yield the captured blocks from now on until the session is stopped"""
+        if self._pump is None or self._pump.done():
+            return
+
+        subscriber: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=BLOCK_QUEUE_SIZE)
+        self._subscribers.append(subscriber)
+        try:
+            while (block := await subscriber.get()) is not None:
+                yield block
+        finally:
+            self._subscribers.remove(subscriber)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.blocks()
+
+    async def stop(self) -> asyncio.Future[list[str]]:
+        """
+        Stop capturing without waiting for the records.
+        The returned future resolves to their full paths once they are finalized,
+        or raises the error which broke the session.
+        """
+        if self.finalized is None:
+            self.finalized = asyncio.ensure_future(self._finalize())
+        return self.finalized
+
+    async def _finalize(self) -> list[str]:
+        """Close the stream and the record, then raise the first error which broke the session"""
+        try:
+            try:
+                await self.recorder.run(self.recorder.close_stream, self.stream)
+            finally:
+                # Let the pump drain the buffer and end
+                self.ring_buffer.close()
+                self._data_ready.set()
+            await self._pump
+        except BaseException as error:
+            self.error = error
+        finally:
+            # A failed pump must not leave the record open and its journal locked
+            if self._record_sink is not None:
+                sink, self._record_sink = self._record_sink, None
+                try:
+                    await self.recorder.run(sink.close)
+                except Exception as error:
+                    if self.error is None:
+                        self.error = error
+            self.recorder.sessions.discard(self)
+
+        if self.error is not None:
+            raise self.error
+        return self.records
+
+
+class AsyncRecorder:
+    """
+    asyncio interface of the recorder. Any number of sessions share one
+    PyAudio instance and a small worker pool for the blocking work
+    (opening streams, writing records), instead of a thread each.
+    """
+
+    def __init__(self, max_workers: int = 4, audio: Any = None) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-recorder')
+        self.sessions: set[AsyncRecordingSession] = set()
+        self._audio = audio
+        # PortAudio streams must not be opened or closed concurrently
+        self._audio_lock = Lock()
+
+    @property
+    def audio(self) -> Any:
+        if self._audio is None:
+            import pyaudio
+
+            self._audio = pyaudio.PyAudio()
+        return self._audio
+
+    def open_stream(self, **options: Any) -> Any:
+        with self._audio_lock:
+            return self.audio.open(**options)
+
+    def close_stream(self, stream: Any) -> None:
+        with self._audio_lock:
+            stream.stop_stream()
+            stream.close()
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on the shared worker pool"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def start(self) -> AsyncRecordingSession:
+        """Start a continuous recording session, return once the input stream is open"""
+        session = AsyncRecordingSession(self)
+        self.sessions.add(session)
+        try:
+            await session.open()
+        except BaseException:
+            self.sessions.discard(session)
+            raise
+        return session
+
+    async def record(self, duration: float | None = None) -> list[str]:
+        """Record for "duration" seconds ("recorder.duration" by default) and return the records"""
+        session = await self.start()
+        await asyncio.sleep(session.settings.recorder.duration if duration is None else duration)
+        return await (await session.stop())
+
+    async def close(self) -> None:
+        """Finalize every session and release the audio backend"""
+        finalizing = [await session.stop() for session in list(self.sessions)]
+        await asyncio.gather(*finalizing)
+        self.executor.shutdown(wait=False)
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
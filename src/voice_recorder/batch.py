@@ -0,0 +1,304 @@
+# Annotations
+from collections.abc import Callable
+
+# OS
+import hashlib
+import json
+import os
+from os import path
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+# Libs
+import numpy as np
+from encoders import create_encoder, get_extension
+from metadata import read_record_blocks
+from postprocess import PostProcessor
+from records_index import RECORD_EXTENSIONS
+
+# GLOBAL VARIABLES
+MANIFEST_NAME = 'manifest.jsonl'
+SKIP_BY = ('mtime', 'hash')
+# Window of the silence detection of the "trim" transform
+SILENCE_WINDOW_SECONDS = 0.02
+EPSILON = 1e-10
+
+
+def to_int16(samples: np.ndarray) -> bytes:
+    return np.clip(np.round(samples * 32768), -32768, 32767).astype('<i2').tobytes()
+
+
+def file_hash(full_path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(full_path, 'rb') as file:
+        while block := file.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_path(source: str, output_directory: str, record_format: str) -> str:
+    return path.join(output_directory, path.splitext(path.basename(source))[0] + get_extension(record_format))
+
+
+# TRANSFORMS
+# Every transform takes (source, output_directory, options) and returns a dictionary
+# for the manifest with at least the processed audio "duration" in seconds.
+def transform_convert(source: str, output_directory: str, options: dict) -> dict:
+    """Convert to options["format"] ("flac" by default), 16 bit"""
+    record_format = options.get('format', 'flac')
+    channels, framerate, blocks = read_record_blocks(source)
+    destination = output_path(source, output_directory, record_format)
+
+    encoder = create_encoder(record_format, destination, channels, 2, framerate)
+    frames = 0
+    for block in blocks:
+        encoder.write(to_int16(block))
+        frames += len(block)
+    encoder.close()
+
+    return {'output': destination, 'duration': frames / framerate}
+
+
+def transform_postprocess(source: str, output_directory: str, options: dict) -> dict:
+    """Downmix, filter, resample and normalize with the post-processing stage (see "postprocess.py")"""
+    record_format = options.get('format', 'wav')
+    normalize = options.get('normalize', 'none')
+    if normalize != 'none' and record_format != 'wav':
+        raise ValueError('Normalization rescales the record in place and needs the "wav" format')
+
+    channels, framerate, blocks = read_record_blocks(source)
+    output_channels = options.get('channels') or channels
+    output_framerate = options.get('sample_rate') or framerate
+    destination = output_path(source, output_directory, record_format)
+
+    processor = PostProcessor(
+        create_encoder(record_format, destination, output_channels, 2, output_framerate),
+        channels, framerate, output_channels, output_framerate,
+        dc_removal=options.get('dc_removal', True), highpass_hz=options.get('highpass_hz', 0),
+        normalize=normalize, target_db=options.get('target_db', -1.0))
+    frames = 0
+    for block in blocks:
+        processor.write_samples(block)
+        frames += len(block)
+    processor.close()
+
+    return {'output': destination, 'duration': frames / framerate}
+
+
+def transform_trim(source: str, output_directory: str, options: dict) -> dict:
+    """
+    Cut the leading and trailing silence (below options["threshold_db"]),
+    keeping options["padding_seconds"] around the sound. Reads the record twice.
+    """
+    threshold_db = options.get('threshold_db', -45)
+    record_format = options.get('format', 'wav')
+
+    # First pass: find the first and the last loud window
+    channels, framerate, blocks = read_record_blocks(source)
+    window = max(int(framerate * SILENCE_WINDOW_SECONDS), 1)
+    first = last = None
+    frames = 0
+    for block in blocks:
+        mono = block.mean(axis=1)
+        windows = -(-len(mono) // window)
+        padded = np.zeros(windows * window, dtype=np.float32)
+        padded[:len(mono)] = mono
+        level_db = 10 * np.log10(np.mean(np.square(padded.reshape(windows, window)), axis=1) + EPSILON)
+
+        loud = np.flatnonzero(level_db >= threshold_db)
+        if len(loud):
+            if first is None:
+                first = frames + loud[0] * window
+            last = frames + min((loud[-1] + 1) * window, len(mono))
+        frames += len(block)
+
+    padding = int(options.get('padding_seconds', 0.1) * framerate)
+    start, stop = (0, 0) if first is None else (max(first - padding, 0), min(last + padding, frames))
+
+    # Second pass: copy the kept frames
+    _, _, blocks = read_record_blocks(source)
+    destination = output_path(source, output_directory, record_format)
+    encoder = create_encoder(record_format, destination, channels, 2, framerate)
+    position = 0
+    for block in blocks:
+        kept = block[max(start - position, 0):max(stop - position, 0)]
+        if len(kept):
+            encoder.write(to_int16(kept))
+        position += len(block)
+    encoder.close()
+
+    return {'output': destination, 'duration': frames / framerate,
+            'trimmed_seconds': (frames - (stop - start)) / framerate}
+
+
+def transform_loudness(source: str, output_directory: str, options: dict) -> dict:
+    """Peak and RMS level (dBFS) of the record, written to the manifest only"""
+    channels, framerate, blocks = read_record_blocks(source)
+    peak = 0.0
+    square_sum = 0.0
+    frames = 0
+    for block in blocks:
+        peak = max(peak, float(np.max(np.abs(block), initial=0.0)))
+        square_sum += float(np.einsum('ij,ij->', block, block, dtype=np.float64))
+        frames += len(block)
+
+    return {
+        'duration': frames / framerate,
+        'peak_db': float(20 * np.log10(peak + EPSILON)),
+        'rms_db': float(10 * np.log10(square_sum / max(frames * channels, 1) + EPSILON)),
+    }
+
+
+TRANSFORMS: dict[str, Callable[[str, str, dict], dict]] = {
+    'convert': transform_convert,
+    'postprocess': transform_postprocess,
+    'trim': transform_trim,
+    'loudness': transform_loudness,
+}
+
+
+def process_record(transform: str, source: str, output_directory: str, options: dict,
+                   skip_hash: str | None = None, hash_records: bool = False) -> dict:
+    """
+    Worker process entry point. With "hash_records" the content hash is computed
+    first and the record is skipped when it equals "skip_hash".
+    """
+    start = time.perf_counter()
+    stat = os.stat(source)
+    row = {'name': path.basename(source), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': None}
+
+    try:
+        if hash_records:
+            row['hash'] = file_hash(source)
+            if row['hash'] == skip_hash:
+                return {**row, 'skipped': True}
+        row.update(TRANSFORMS[transform](source, output_directory, options))
+    except Exception as error:
+        row['error'] = f'{type(error).__name__}: {error}'
+
+    row['seconds'] = round(time.perf_counter() - start, 6)
+    return row
+
+
+class BatchJob:
+    """
+    Applies a transform to every record of a directory on a process pool.
+    Every finished record is appended to a manifest in the output directory,
+    so an interrupted job resumes where it stopped, and records unchanged
+    since they were processed (by mtime and size, or by content hash) are skipped.
+    """
+
+    def __init__(self, transform: str, source_directory: str, output_directory: str, options: dict | None = None,
+                 workers: int | None = None, skip_by: str = 'mtime',
+                 progress: Callable[[dict], None] | None = None, progress_interval: float = 5.0) -> None:
+        if transform not in TRANSFORMS:
+            raise ValueError(f'Transform "{transform}" is not supported, use one of {tuple(TRANSFORMS)}')
+        if skip_by not in SKIP_BY:
+            raise ValueError(f'Records can be skipped by {SKIP_BY}, got "{skip_by}"')
+
+        self.transform = transform
+        self.source_directory = source_directory
+        self.output_directory = output_directory
+        self.options = options or {}
+        self.workers = workers or os.cpu_count()
+        self.skip_by = skip_by
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.manifest_path = path.join(output_directory, MANIFEST_NAME)
+        # Records processed with other options are not skipped
+        self.job = hashlib.sha1(
+            json.dumps([transform, self.options], sort_keys=True).encode()).hexdigest()[:12]
+
+    def load_manifest(self) -> dict[str, dict]:
+        """Return the last successful row of this job for every record name"""
+        done = {}
+        if not path.exists(self.manifest_path):
+            return done
+
+        with open(self.manifest_path) as manifest:
+            for line in manifest:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut by an interruption
+                    continue
+                if row.get('job') == self.job and 'error' not in row:
+                    done[row['name']] = row
+        return done
+
+    def pending(self) -> list[tuple[str, str | None]]:
+        """Return the records to process with the known content hash of each"""
+        done = self.load_manifest()
+        records = []
+        with os.scandir(self.source_directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(RECORD_EXTENSIONS):
+                    continue
+
+                row = done.get(entry.name)
+                if row is not None and self.skip_by == 'mtime':
+                    stat = entry.stat()
+                    if (row['size'], row['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                        continue
+                records.append((entry.path, row['hash'] if row is not None else None))
+
+        return sorted(records)
+
+    def run(self) -> dict:
+        """Process the pending records and return the throughput report"""
+        os.makedirs(self.output_directory, exist_ok=True)
+        records = self.pending()
+        report = {'job': self.job, 'transform': self.transform, 'pending': len(records),
+                  'processed': 0, 'skipped': 0, 'failed': 0, 'audio_seconds': 0.0, 'bytes': 0}
+        start = time.perf_counter()
+        last_progress = start
+
+        with open(self.manifest_path, 'a') as manifest, ProcessPoolExecutor(max_workers=self.workers) as executor:
+            queued = iter(records)
+            running: set[Future] = set()
+
+            def submit(count: int) -> None:
+                for source, known_hash in queued:
+                    running.add(executor.submit(
+                        process_record, self.transform, source, self.output_directory, self.options,
+                        known_hash, self.skip_by == 'hash'))
+                    count -= 1
+                    if not count:
+                        return
+
+            # A few records per worker in flight keep every core busy without queueing the whole archive
+            submit(self.workers * 4)
+            while running:
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    row = future.result()
+                    if row.get('skipped'):
+                        report['skipped'] += 1
+                        continue
+
+                    manifest.write(json.dumps({'job': self.job, **row}) + '\n')
+                    manifest.flush()
+                    if 'error' in row:
+                        report['failed'] += 1
+                    else:
+                        report['processed'] += 1
+                        report['audio_seconds'] += row['duration']
+                        report['bytes'] += row['size']
+                submit(len(finished))
+
+                if self.progress is not None and time.perf_counter() - last_progress >= self.progress_interval:
+                    last_progress = time.perf_counter()
+                    self.progress(self._throughput(report, last_progress - start))
+
+        return self._throughput(report, time.perf_counter() - start)
+
+    @staticmethod
+    def _throughput(report: dict, elapsed: float) -> dict:
+        elapsed = max(elapsed, EPSILON)
+        return {
+            **report,
+            'seconds': round(elapsed, 3),
+            'files_per_second': round(report['processed'] / elapsed, 3),
+            'realtime_factor': round(report['audio_seconds'] / elapsed, 3),
+            'megabytes_per_second': round(report['bytes'] / elapsed / 1024 ** 2, 3),
+        }
@@ -0,0 +1,157 @@
+# Annotations
+from typing import Any
+
+# OS
+from os import path
+from platform import node
+import json
+import time
+
+# Libs
+from manager import SettingsManager, SettingsSnapshot
+
+# GLOBAL VARIABLES
+settings_manager = SettingsManager()
+CALIBRATION_FILE = 'calibration.json'
+CANDIDATE_BLOCK_SIZES = (64, 128, 256, 512, 1024, 2048, 4096)
+PA_INPUT_OVERFLOW = 0x2
+
+
+def is_glitch_free(probe: dict, max_jitter_ratio: float = 3.0) -> bool:
+    """
+    A probe is glitch-free if the stream reported no input overflow and
+    no callback came later than "max_jitter_ratio" block periods.
+    """
+    if probe['failed'] or probe['overflows']:
+        return False
+    if probe['callbacks'] < 2:
+        return False
+    return probe['max_interval'] <= probe['block_period'] * max_jitter_ratio
+
+
+def choose_block_size(probes: list[dict], max_jitter_ratio: float = 3.0) -> int | None:
+    """Return the smallest glitch-free block size, None if all probes glitched"""
+    sizes = [probe['frames_per_buffer'] for probe in probes
+             if is_glitch_free(probe, max_jitter_ratio)]
+    return min(sizes) if sizes else None
+
+
+class BlockSizeTuner:
+    """
+    Measures callback timing and overflows for several block sizes
+    over a short probe window and picks the lowest latency that the
+    current host can sustain.
+    """
+
+    def __init__(self, freq: int, channels: int, probe_seconds: float = 1.0,
+                 candidates: tuple[int, ...] = CANDIDATE_BLOCK_SIZES) -> None:
+        self.freq = freq
+        self.channels = channels
+        self.probe_seconds = probe_seconds
+        self.candidates = candidates
+
+    def probe(self, frames_per_buffer: int) -> dict:
+        """Open an input stream with the given block size and measure it"""
+        import pyaudio
+
+        timestamps = []
+        overflows = 0
+
+        def callback(in_data, frame_count, time_info, status):
+            nonlocal overflows
+            timestamps.append(time.perf_counter())
+            if status & PA_INPUT_OVERFLOW:
+                overflows += 1
+            return None, pyaudio.paContinue
+
+        result = {
+            'frames_per_buffer': frames_per_buffer,
+            'block_period': frames_per_buffer / self.freq,
+            'failed': False,
+        }
+        audio = pyaudio.PyAudio()
+        try:
+            stream = audio.open(
+                format=pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.freq,
+                input=True,
+                frames_per_buffer=frames_per_buffer,
+                stream_callback=callback
+            )
+            time.sleep(self.probe_seconds)
+            stream.stop_stream()
+            stream.close()
+        except OSError:
+            result['failed'] = True
+        finally:
+            audio.terminate()
+
+        intervals = [b - a for a, b in zip(timestamps, timestamps[1:])]
+        result['callbacks'] = len(timestamps)
+        result['overflows'] = overflows
+        result['max_interval'] = max(intervals, default=0.0)
+
+        return result
+
+    def tune(self) -> int | None:
+        """Probe the candidates from the smallest one and stop at the first glitch-free"""
+        probes = []
+        for frames_per_buffer in sorted(self.candidates):
+            probes.append(self.probe(frames_per_buffer))
+            if is_glitch_free(probes[-1]):
+                break
+
+        return choose_block_size(probes)
+
+
+def _calibration_path() -> str:
+    return path.join(settings_manager.get_setting('base_dir'), CALIBRATION_FILE)
+
+
+def load_calibration() -> dict:
+    try:
+        with open(_calibration_path(), 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_calibration(calibration: dict) -> None:
+    with open(_calibration_path(), 'w') as file:
+        json.dump(calibration, file, indent=4)
+
+
+def resolve_frames_per_buffer(settings: SettingsSnapshot | None = None) -> int:
+    """
+    Return the block size for the capture stream. When the auto tuner is
+    enabled the result stored for this host is used, the host is probed
+    only if there is no result for the current stream format.
+    A recording session passes its own settings snapshot.
+    """
+    settings = settings or settings_manager.snapshot
+    frames_per_buffer = settings.recorder.frames_per_buffer
+    if not settings.recorder.auto_tune_block_size:
+        return frames_per_buffer
+
+    freq = settings.recorder.freq
+    channels = settings.recorder.channels
+    calibration = load_calibration()
+    stored: dict[str, Any] = calibration.get(node(), {})
+
+    if stored.get('freq') == freq and stored.get('channels') == channels:
+        return stored['frames_per_buffer']
+
+    tuned = BlockSizeTuner(
+        freq, channels, settings.recorder.calibration_probe_seconds).tune()
+    if tuned is None:
+        return frames_per_buffer
+
+    calibration[node()] = {
+        'freq': freq,
+        'channels': channels,
+        'frames_per_buffer': tuned,
+    }
+    save_calibration(calibration)
+
+    return tuned
@@ -0,0 +1,218 @@
+# Annotations
+from typing import Any
+
+# OS
+import argparse
+import json
+import os
+from os import path
+import socket
+import socketserver
+import sys
+from threading import Lock, Thread
+
+# Application
+from manager import SettingsManager
+
+# GLOBAL VARIABLES
+settings_manager = SettingsManager()
+USE_UNIX_SOCKET = hasattr(socket, 'AF_UNIX')
+
+
+def get_control_address() -> str | tuple[str, int]:
+    """Unix socket path of the daemon, or a localhost TCP address where Unix sockets are missing"""
+    if not USE_UNIX_SOCKET:
+        return '127.0.0.1', settings_manager.get_setting('daemon.port')
+
+    socket_path = settings_manager.get_setting('daemon.socket_path')
+    return socket_path or path.join(settings_manager.get_setting('base_dir'), 'voice_recorder.sock')
+
+
+def send_command(command: str, **arguments: Any) -> dict:
+    """Send one command to the running daemon and return its reply"""
+    family = socket.AF_UNIX if USE_UNIX_SOCKET else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(get_control_address())
+        except (FileNotFoundError, ConnectionRefusedError):
+            raise ConnectionError(
+                'The recorder daemon is not running. Start it with "python -m voice_recorder daemon"') from None
+
+        connection.sendall(json.dumps({'command': command, **arguments}).encode() + b'\n')
+        with connection.makefile('rb') as reply:
+            return json.loads(reply.readline())
+
+
+class RecorderDaemon:
+    """
+    Long-running recorder controlled through a local socket.
+    Every request is one JSON line ({"command": "start"}) and gets one JSON line back.
+    """
+
+    def __init__(self) -> None:
+        # The audio backends are loaded only when the daemon starts.
+        from recorder import Recorder
+
+        self.recorder = Recorder()
+        for record in self.recorder.recover_records():
+            print(f'Recovered {record}', file=sys.stderr)
+        if settings_manager.get_setting('scheduler.enabled'):
+            self.recorder.start_scheduler(
+                lambda records: print('\n'.join(f'Scheduled record {record}' for record in records), file=sys.stderr))
+        self.is_recording = False
+        # Edits of settings.json apply to the next recording
+        settings_manager.start_watching()
+        self._lock = Lock()
+        self.server = None
+
+    def handle(self, request: dict) -> dict:
+        command = request.get('command')
+
+        with self._lock:
+            match command:
+                case 'start':
+                    if self.is_recording:
+                        return {'ok': False, 'error': 'Already recording'}
+                    self.recorder.start_recording()
+                    self.is_recording = True
+                    return {'ok': True}
+                case 'stop':
+                    if not self.is_recording:
+                        return {'ok': False, 'error': 'Not recording'}
+                    self.is_recording = False
+                    return {'ok': True, 'records': self.recorder.stop_recording()}
+                case 'status':
+                    return {'ok': True, 'recording': self.is_recording}
+                case 'metrics':
+                    return {'ok': True, 'metrics': self.recorder.get_metrics()}
+                case 'record':
+                    return {'ok': True, 'records': [self.recorder.record()]}
+                case 'shutdown':
+                    # The daemon stops even when the record failed, the client gets the error
+                    Thread(target=self.server.shutdown, daemon=True).start()
+                    if self.is_recording:
+                        self.is_recording = False
+                        self.recorder.stop_recording()
+                    return {'ok': True}
+                case _:
+                    return {'ok': False, 'error': f'Unknown command "{command}"'}
+
+    def serve_forever(self) -> None:
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                try:
+                    reply = daemon.handle(json.loads(self.rfile.readline()))
+                except Exception as error:
+                    reply = {'ok': False, 'error': str(error)}
+                self.wfile.write(json.dumps(reply).encode() + b'\n')
+
+        address = get_control_address()
+        if USE_UNIX_SOCKET:
+            if path.exists(address):
+                os.remove(address)
+            self.server = socketserver.ThreadingUnixStreamServer(address, Handler)
+        else:
+            self.server = socketserver.ThreadingTCPServer(address, Handler)
+
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if USE_UNIX_SOCKET and path.exists(address):
+                os.remove(address)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='voice_recorder', description='Voice recorder. Starts the GUI when no command is given.')
+    commands = parser.add_subparsers(dest='command')
+
+    record = commands.add_parser('record', help='Make a fixed-duration record')
+    record.add_argument('-d', '--duration', type=float, help='Duration in seconds')
+
+    commands.add_parser('start', help='Start a continuous record in the daemon')
+    commands.add_parser('stop', help='Stop the continuous record in the daemon')
+    commands.add_parser('status', help='Show whether the daemon is recording')
+    commands.add_parser('metrics', help='Show the capture and writer metrics of the daemon')
+    commands.add_parser('shutdown', help='Stop the daemon')
+    commands.add_parser('daemon', help='Run the recorder daemon in the foreground')
+
+    list_records = commands.add_parser('list', help='List the records')
+    list_records.add_argument('-s', '--sort', choices=('name', 'date', 'size', 'duration'), default='name')
+    list_records.add_argument('-r', '--reverse', action='store_true')
+    list_records.add_argument('--search', default='', help='Show only names containing this text')
+
+    batch = commands.add_parser('batch', help='Apply a transform to every record on all cores')
+    batch.add_argument('transform', choices=('convert', 'postprocess', 'trim', 'loudness'))
+    batch.add_argument('--source', help='Records directory, "save_records_path" by default')
+    batch.add_argument('-o', '--output', help='Output directory, "<source>_<transform>" by default')
+    batch.add_argument('-j', '--workers', type=int, help='Worker processes, one per core by default')
+    batch.add_argument('--skip-by', choices=('mtime', 'hash'), default='mtime',
+                       help='How records processed by an earlier run are recognized')
+    batch.add_argument('--format', help='Output format of "convert", "postprocess" and "trim"')
+    batch.add_argument('--sample-rate', type=int, help='Output sample rate of "postprocess"')
+    batch.add_argument('--channels', type=int, help='Output channels of "postprocess"')
+    batch.add_argument('--normalize', choices=('none', 'peak', 'loudness'), help='Normalization of "postprocess"')
+    batch.add_argument('--target-db', type=float, help='Normalization target of "postprocess"')
+    batch.add_argument('--threshold-db', type=float, help='Silence threshold of "trim"')
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = build_parser().parse_args(argv)
+
+    match arguments.command:
+        case None:
+            from GUI import main as gui_main
+            gui_main()
+        case 'record':
+            from recorder import Recorder
+
+            recorder = Recorder()
+            if arguments.duration is not None:
+                recorder.record_producer.voice_recorder.duration = arguments.duration
+            print(recorder.record())
+        case 'list':
+            from records_index import RecordsIndex
+
+            records_index = RecordsIndex(settings_manager.get_setting('save_records_path'))
+            records_index.sync()
+            for name in records_index.page(0, -1, arguments.sort, arguments.reverse, arguments.search):
+                print(name)
+            records_index.close()
+        case 'batch':
+            from batch import BatchJob
+
+            source = arguments.source or settings_manager.get_setting('save_records_path')
+            options = {option: getattr(arguments, option) for option in (
+                'format', 'sample_rate', 'channels', 'normalize', 'target_db', 'threshold_db')
+                if getattr(arguments, option) is not None}
+            job = BatchJob(
+                arguments.transform, source,
+                arguments.output or f'{source.rstrip(os.sep)}_{arguments.transform}',
+                options, arguments.workers, arguments.skip_by,
+                progress=lambda report: print(json.dumps(report), file=sys.stderr))
+            print(json.dumps(job.run(), indent=4))
+        case 'daemon':
+            RecorderDaemon().serve_forever()
+        case command:
+            try:
+                reply = send_command(command)
+            except ConnectionError as error:
+                print(error, file=sys.stderr)
+                return 1
+
+            if not reply['ok']:
+                print(reply['error'], file=sys.stderr)
+                return 1
+            for record in reply.get('records', []):
+                print(record)
+            if 'recording' in reply:
+                print('recording' if reply['recording'] else 'idle')
+            if 'metrics' in reply:
+                print(json.dumps(reply['metrics'], indent=4))
+
+    return 0
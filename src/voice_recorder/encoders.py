@@ -0,0 +1,179 @@
+# Annotations
+from abc import ABC, abstractmethod
+from typing import Any
+
+# OS
+import queue
+from threading import Thread
+
+# Libs
+import numpy as np
+from wave_stream import StreamingWaveWriter
+from vad import SAMPLE_DTYPES
+
+# GLOBAL VARIABLES
+# format -> (soundfile container, soundfile subtype, file extension)
+SOUNDFILE_FORMATS = {
+    'flac': ('FLAC', 'PCM_16', '.flac'),
+    'ogg': ('OGG', 'VORBIS', '.ogg'),
+    'opus': ('OGG', 'OPUS', '.opus'),
+}
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def _import_soundfile() -> Any:
+    """"soundfile" is an optional dependency needed only for compressed formats"""
+    try:
+        import soundfile
+    except ImportError as error:
+        raise ImportError(
+            'Compressed record formats require the "soundfile" package. Install it with "pip install soundfile"') from error
+    return soundfile
+
+
+class Encoder(ABC):
+    extension: str
+
+    def __init__(self, full_path: str, channels: int, sample_width: int, framerate: int) -> None:
+        super().__init__()
+        self.full_path = full_path
+        self.channels = channels
+        self.sample_width = sample_width
+        self.framerate = framerate
+
+    @abstractmethod
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Encode a chunk of raw interleaved frames.
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Flush the encoder and finalize the file.
+        """
+        ...
+
+
+class WaveEncoder(Encoder):
+    extension = '.wav'
+
+    def __init__(self, full_path: str, channels: int, sample_width: int, framerate: int,
+                 header_update_interval: float = 1.0) -> None:
+        super().__init__(full_path, channels, sample_width, framerate)
+        self.writer = StreamingWaveWriter(
+            full_path, channels, sample_width, framerate, header_update_interval)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self.writer.write(data)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SoundFileEncoder(Encoder):
+    def __init__(self, full_path: str, channels: int, sample_width: int, framerate: int,
+                 record_format: str = 'flac') -> None:
+        super().__init__(full_path, channels, sample_width, framerate)
+        container, subtype, self.extension = SOUNDFILE_FORMATS[record_format]
+
+        if record_format == 'opus' and framerate not in OPUS_SAMPLE_RATES:
+            raise ValueError(
+                f'Opus does not support the sample rate "{framerate}", use one of {OPUS_SAMPLE_RATES}')
+
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        self._file = _import_soundfile().SoundFile(
+            full_path, 'w', samplerate=framerate, channels=channels, format=container, subtype=subtype)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self._file.write(np.frombuffer(data, dtype=self._dtype).reshape(-1, self.channels))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class EncodingWorker(Thread):
+    """
+    Runs an encoder on its own thread fed through a bounded queue,
+    so a slow encoder does not delay the capture consumer.
+    When the queue is full the submitter waits, which makes the capture
+    ring buffer absorb the burst.
+    An encoder error (a full disk) is kept and raised by the next "write"
+    and by "close"; the worker keeps draining the queue, so neither blocks.
+    """
+
+    def __init__(self, encoder: Encoder, max_queue_blocks: int = 256) -> None:
+        super().__init__(daemon=True)
+        self.encoder = encoder
+        self.error: Exception | None = None
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=max_queue_blocks)
+        self.start()
+
+    @property
+    def full_path(self) -> str:
+        return self.encoder.full_path
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if self.error is not None:
+            raise self.error
+        # The chunk is copied, the caller reuses its buffer.
+        self._queue.put(bytes(data))
+
+    def run(self) -> None:
+        while (data := self._queue.get()) is not None:
+            if self.error is not None:
+                # Discard, the record is already broken
+                continue
+            try:
+                self.encoder.write(data)
+            except Exception as error:
+                self.error = error
+
+    def close(self) -> None:
+        if self.is_alive():
+            self._queue.put(None)
+            self.join()
+        try:
+            self.encoder.close()
+        except Exception:
+            if self.error is None:
+                raise
+        if self.error is not None:
+            raise self.error
+
+
+def get_extension(record_format: str) -> str:
+    if record_format == 'wav':
+        return WaveEncoder.extension
+    if record_format in SOUNDFILE_FORMATS:
+        return SOUNDFILE_FORMATS[record_format][2]
+
+    raise ValueError(f'Record format "{record_format}" is not supported')
+
+
+def create_encoder(record_format: str, full_path: str, channels: int, sample_width: int, framerate: int,
+                   header_update_interval: float = 1.0, max_queue_blocks: int = 256) -> Encoder | EncodingWorker:
+    """
+    Return a writer with "write" and "close" for the record format.
+    "wav" is written directly, compressed formats are encoded on a worker thread.
+    """
+    if record_format == 'wav':
+        return WaveEncoder(full_path, channels, sample_width, framerate, header_update_interval)
+    if record_format in SOUNDFILE_FORMATS:
+        return EncodingWorker(
+            SoundFileEncoder(full_path, channels, sample_width, framerate, record_format),
+            max_queue_blocks
+        )
+
+    raise ValueError(f'Record format "{record_format}" is not supported')
+
+
+def write_array(record_format: str, full_path: str, freq: int, recording: np.ndarray) -> None:
+    """Encode a whole recording held in memory into a compressed format"""
+    container, subtype, _ = SOUNDFILE_FORMATS[record_format]
+    _import_soundfile().write(full_path, recording, freq, format=container, subtype=subtype)
@@ -0,0 +1,154 @@
+# Annotations
+from typing import Any
+
+# OS
+import os
+from os import path
+import struct
+
+# Libs
+from metadata import read_wav_header
+from wave_stream import StreamingWaveWriter
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: a file which is open for writing cannot be renamed anyway
+    fcntl = None
+
+# GLOBAL VARIABLES
+JOURNAL_DIRECTORY = '.journal'
+JOURNAL_EXTENSION = '.journal'
+
+
+def journal_path(full_path: str) -> str:
+    """Journal of the record "full_path", in a hidden directory next to it"""
+    directory, name = path.split(full_path)
+    return path.join(directory, JOURNAL_DIRECTORY, name + JOURNAL_EXTENSION)
+
+
+def _lock(file: Any, blocking: bool = True) -> bool:
+    """Take an exclusive lock on an open file, return False if another writer holds it"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        return False
+    return True
+
+
+class JournalWriter:
+    """
+    Crash-safe record writer. The captured frames go to a "wav" journal first,
+    whose header is patched every "header_update_interval" seconds and which is
+    fsynced at most every "fsync_interval" seconds, so a crash or a power cut
+    loses no more than that. Without "output" the journal becomes the record
+    on close; with "output" (a compressed or post-processed record) the journal
+    is a raw copy which is deleted once the record is closed.
+    The journal is locked while it is written, so a running recording is never
+    mistaken for an orphan.
+    """
+
+    def __init__(self, full_path: str, channels: int, sample_width: int, framerate: int, output: Any = None,
+                 header_update_interval: float = 1.0, fsync_interval: float = 5.0) -> None:
+        self.full_path = full_path
+        self.output = output
+        self.journal_path = journal_path(full_path)
+        os.makedirs(path.dirname(self.journal_path), exist_ok=True)
+        self.journal = StreamingWaveWriter(
+            self.journal_path, channels, sample_width, framerate,
+            header_update_interval=header_update_interval, fsync_interval=fsync_interval)
+        _lock(self.journal)
+
+    @property
+    def queue_depth(self) -> int:
+        return getattr(self.output, 'queue_depth', 0)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self.journal.write(data)
+        if self.output is not None:
+            self.output.write(data)
+
+    def close(self) -> None:
+        if self.output is not None:
+            self.output.close()
+            self.journal.close()
+            os.remove(self.journal_path)
+            return
+
+        # The journal is fsynced on close, the rename makes the complete record appear at once
+        self.journal.close()
+        os.replace(self.journal_path, self.full_path)
+
+
+def repair_wave(full_path: str) -> int:
+    """
+    Patch the RIFF and data sizes of an interrupted "wav" file to the whole
+    frames present on disk (the sizes in its header may be older) and drop
+    a trailing partial frame. Return the number of frames.
+    """
+    header = read_wav_header(full_path)
+    frame_size = header['channels'] * header['sample_width']
+    data_size = (path.getsize(full_path) - header['data_offset']) // frame_size * frame_size
+    with open(full_path, 'r+b') as file:
+        file.truncate(header['data_offset'] + data_size)
+        if data_size & 1:
+            file.seek(0, 2)
+            file.write(b'\x00')
+        file.seek(4)
+        file.write(struct.pack('<I', header['data_offset'] - 8 + data_size + (data_size & 1)))
+        file.seek(header['data_offset'] - 4)
+        file.write(struct.pack('<I', data_size))
+        file.flush()
+        os.fsync(file.fileno())
+
+    return data_size // frame_size
+
+
+def _recovered_path(target: str) -> str:
+    """Path of the recovered "wav" record: the record itself, or a free name next to it"""
+    stem = path.splitext(target)[0]
+    if target.endswith('.wav') and (not path.exists(target) or not path.getsize(target)):
+        # Only the empty file which reserved the name was created
+        return target
+
+    candidate, number = stem + '.wav', 1
+    while path.exists(candidate):
+        candidate = f'{stem}_recovered{"" if number == 1 else number}.wav'
+        number += 1
+    return candidate
+
+
+def recover_journals(records_directory: str) -> list[str]:
+    """
+    Turn the journals left by recordings which did not stop cleanly into "wav"
+    records. Journals still locked by a running recording are skipped,
+    unreadable or empty ones are removed. Return the recovered records.
+    """
+    journal_directory = path.join(records_directory, JOURNAL_DIRECTORY)
+    if not path.isdir(journal_directory):
+        return []
+
+    recovered = []
+    for name in sorted(os.listdir(journal_directory)):
+        if not name.endswith(JOURNAL_EXTENSION):
+            continue
+
+        full_path = path.join(journal_directory, name)
+        with open(full_path, 'rb') as journal:
+            if not _lock(journal, blocking=False):
+                continue
+        try:
+            frames = repair_wave(full_path)
+        except (ValueError, struct.error):
+            frames = 0
+        if not frames:
+            os.remove(full_path)
+            continue
+
+        destination = _recovered_path(path.join(records_directory, name[:-len(JOURNAL_EXTENSION)]))
+        os.replace(full_path, destination)
+        recovered.append(destination)
+
+    return recovered
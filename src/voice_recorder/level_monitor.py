@@ -0,0 +1,48 @@
+# OS
+from collections import deque
+
+# Libs
+import numpy as np
+from vad import SAMPLE_DTYPES
+
+
+class LevelMonitor:
+    """
+    Side channel from the capture consumer to the GUI.
+    Every block is reduced to its peak, RMS and a few min/max waveform points
+    which are appended to a bounded deque. The GUI drains the deque from its
+    own thread; deque append and popleft are atomic, so neither side takes a lock
+    and a GUI which does not poll only makes the oldest points drop.
+    """
+
+    def __init__(self, channels: int, sample_width: int = 2, points_per_block: int = 4, max_pending: int = 4096) -> None:
+        self.channels = channels
+        self.points_per_block = points_per_block
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        self._full_scale = float(np.iinfo(self._dtype).max) + 1
+        self._pending: deque[tuple[float, float, float, float]] = deque(maxlen=max_pending)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        samples = np.frombuffer(data, dtype=self._dtype).reshape(-1, self.channels)
+        if not len(samples):
+            return
+
+        mono = samples.mean(axis=1, dtype=np.float32) / self._full_scale
+        # Python integers: "np.abs" of the most negative sample overflows to itself
+        peak = max(-int(samples.min()), int(samples.max())) / self._full_scale
+        rms = float(np.sqrt(np.mean(np.square(mono))))
+
+        # Decimate the block to "points_per_block" min/max pairs
+        points = min(self.points_per_block, len(mono))
+        segments = mono[:len(mono) // points * points].reshape(points, -1)
+        for low, high in zip(segments.min(axis=1), segments.max(axis=1)):
+            self._pending.append((peak, rms, float(low), float(high)))
+
+    def drain(self) -> list[tuple[float, float, float, float]]:
+        """Return and forget every (peak, rms, min, max) point produced since the last call"""
+        points = []
+        try:
+            while True:
+                points.append(self._pending.popleft())
+        except IndexError:
+            return points
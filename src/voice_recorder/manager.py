@@ -1,15 +1,219 @@
 # Annotation
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
 # OS
 from os import path, makedirs
+import os
 from pathlib import Path
 import json
+from threading import Event, Lock, Thread
 
 # GLOBAL VARIABLES
 BASEDIR = Path(__file__).resolve().parent
 SETTINGS = path.join(BASEDIR, "settings.json", )
+NUMBER = (int, float)
+# Setting -> expected type(s) of its value in settings.json
+SCHEMA: dict[str, type | tuple[type, ...]] = {
+    'save_records_path': str,
+    'recorder.freq': int,
+    'recorder.duration': NUMBER,
+    'recorder.channels': int,
+    'recorder.sample_format': str,
+    'recorder.frames_per_buffer': int,
+    'recorder.auto_tune_block_size': bool,
+    'recorder.calibration_probe_seconds': NUMBER,
+    'recorder.header_update_seconds': NUMBER,
+    'recorder.ring_buffer_seconds': NUMBER,
+    'recorder.always_armed': bool,
+    'recorder.pre_roll_seconds': NUMBER,
+    'recorder.default_filename': str,
+    'recorder.format': str,
+    'recorder.encoder_queue_blocks': int,
+    'multi_device.enabled': bool,
+    'multi_device.devices': list,
+    'multi_device.interleaved': bool,
+    'multi_device.drift_compensation': bool,
+    'rotation.enabled': bool,
+    'rotation.max_minutes': NUMBER,
+    'rotation.max_megabytes': NUMBER,
+    'rotation.on_silence': bool,
+    'vad.enabled': bool,
+    'vad.threshold_db': NUMBER,
+    'vad.max_zero_crossing_rate': NUMBER,
+    'vad.hangover_ms': NUMBER,
+    'vad.pre_roll_ms': NUMBER,
+    'vad.split_segments': bool,
+    'postprocess.enabled': bool,
+    'postprocess.dc_removal': bool,
+    'postprocess.highpass_hz': NUMBER,
+    'postprocess.normalize': str,
+    'postprocess.target_db': NUMBER,
+    'postprocess.channels': int,
+    'postprocess.sample_rate': int,
+    'scheduler.enabled': bool,
+    'scheduler.windows': list,
+    'scheduler.jobs': list,
+    'scheduler.trigger.enabled': bool,
+    'scheduler.trigger.threshold_db': NUMBER,
+    'scheduler.trigger.hangover_seconds': NUMBER,
+    'scheduler.trigger.pre_roll_seconds': NUMBER,
+    'scheduler.trigger.max_seconds': NUMBER,
+    'journal.enabled': bool,
+    'journal.fsync_seconds': NUMBER,
+    'metrics.dump_path': str,
+    'metrics.dump_interval_seconds': NUMBER,
+    'metrics.profile': bool,
+    'metrics.profile_path': str,
+    'metrics.tracemalloc': bool,
+    'daemon.socket_path': str,
+    'daemon.port': int,
+    'GUI.icon_path': str,
+    'GUI.record_after_program_terminated': bool,
+    'GUI.meter_fps': int,
+    'GUI.metadata_workers': int,
+}
+CHOICES = {
+    'recorder.sample_format': ('int16', 'int24', 'float32'),
+    'recorder.format': ('wav', 'flac', 'ogg', 'opus'),
+    'postprocess.normalize': ('none', 'peak', 'loudness'),
+}
+POSITIVE = ('recorder.freq', 'recorder.duration', 'recorder.channels', 'recorder.frames_per_buffer',
+            'recorder.calibration_probe_seconds', 'recorder.header_update_seconds',
+            'recorder.ring_buffer_seconds', 'recorder.encoder_queue_blocks', 'journal.fsync_seconds',
+            'scheduler.trigger.max_seconds', 'GUI.meter_fps', 'GUI.metadata_workers')
+# 0 disables the limit
+NON_NEGATIVE = ('rotation.max_minutes', 'rotation.max_megabytes')
+# Settings which the multi-device recording does not support, rejected when it is enabled.
+# Armed recordings and the scheduler use the default input device only.
+MULTI_DEVICE_UNSUPPORTED = ('recorder.auto_tune_block_size', 'recorder.always_armed', 'vad.enabled',
+                            'rotation.enabled', 'postprocess.enabled', 'scheduler.enabled')
+# List setting -> key -> expected type(s) in each of its entries, numbers must be positive
+ENTRY_SCHEMA: dict[str, dict[str, type | tuple[type, ...]]] = {
+    'scheduler.windows': {'cron': str, 'minutes': NUMBER},
+    'scheduler.jobs': {'cron': str, 'seconds': NUMBER},
+}
+
+
+def _lookup(settings_data: dict, setting: str) -> Any:
+    """Value of a dotted setting, None when it is missing"""
+    value = settings_data
+    try:
+        for key in setting.split('.'):
+            value = value[key]
+    except (KeyError, TypeError):
+        return None
+    return value
+
+
+def _entry_problems(setting: str, entries: list) -> list[str]:
+    """Check every entry of a list setting against "ENTRY_SCHEMA" """
+    problems = []
+    for number, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            problems.append(f'"{setting}[{number}]" must be an object, got {entry!r}')
+            continue
+
+        for key, expected in ENTRY_SCHEMA[setting].items():
+            value = entry.get(key)
+            expected_types = expected if isinstance(expected, tuple) else (expected,)
+            if not isinstance(value, expected_types) or isinstance(value, bool):
+                problems.append(
+                    f'"{setting}[{number}].{key}" must be {" or ".join(kind.__name__ for kind in expected_types)}, '
+                    f'got {value!r}')
+            elif expected is NUMBER and value <= 0:
+                problems.append(f'"{setting}[{number}].{key}" must be positive, got {value!r}')
+
+    return problems
+
+
+def validate_settings(settings_data: dict) -> None:
+    """Check the settings against "SCHEMA", raise "ValueError" listing every problem"""
+    problems = []
+    for setting, expected in SCHEMA.items():
+        value = settings_data
+        try:
+            for key in setting.split('.'):
+                value = value[key]
+        except (KeyError, TypeError):
+            problems.append(f'"{setting}" is missing')
+            continue
+
+        expected_types = expected if isinstance(expected, tuple) else (expected,)
+        # "bool" is an "int" subclass, but "true" is not a sample rate
+        if not isinstance(value, expected_types) or (isinstance(value, bool) and bool not in expected_types):
+            problems.append(
+                f'"{setting}" must be {" or ".join(kind.__name__ for kind in expected_types)}, got {value!r}')
+        elif setting in CHOICES and value not in CHOICES[setting]:
+            problems.append(f'"{setting}" must be one of {CHOICES[setting]}, got {value!r}')
+        elif setting in POSITIVE and value <= 0:
+            problems.append(f'"{setting}" must be positive, got {value!r}')
+        elif setting in NON_NEGATIVE and value < 0:
+            problems.append(f'"{setting}" must not be negative, got {value!r}')
+        elif setting in ENTRY_SCHEMA:
+            problems.extend(_entry_problems(setting, value))
+
+    if _lookup(settings_data, 'multi_device.enabled') is True:
+        problems.extend(f'"{setting}" is not supported with "multi_device.enabled"'
+                        for setting in MULTI_DEVICE_UNSUPPORTED if _lookup(settings_data, setting) is True)
+
+    if problems:
+        raise ValueError('Invalid settings.json: ' + '; '.join(problems))
+
+
+class SettingsSnapshot:
+    """
+    Immutable settings. Sections and values are attributes
+    ("snapshot.recorder.freq"), lists become tuples, and every dotted
+    key is resolved once so "get" is a single dictionary lookup.
+    """
+    __slots__ = ('_values', '_flat')
+
+    def __init__(self, settings_data: dict) -> None:
+        values = {key: self._freeze(value) for key, value in settings_data.items()}
+        flat = {}
+        for key, value in values.items():
+            flat[key] = value
+            if isinstance(value, SettingsSnapshot):
+                flat.update({f'{key}.{nested}': nested_value for nested, nested_value in value._flat.items()})
+
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_flat', flat)
+
+    @classmethod
+    def _freeze(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            return cls(value)
+        if isinstance(value, list):
+            return tuple(cls._freeze(item) for item in value)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f'The setting "{name}" does not exist') from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('Settings snapshots are immutable')
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SettingsSnapshot) and self._flat == other._flat
+
+    def __repr__(self) -> str:
+        return f'SettingsSnapshot({self._values!r})'
+
+    def get(self, setting: str) -> Any:
+        try:
+            return self._flat[setting]
+        except KeyError:
+            raise ValueError(
+                f'The setting was not found by this address "{setting}"') from None
+
+    def to_dict(self) -> dict:
+        return {key: value.to_dict() if isinstance(value, SettingsSnapshot) else value
+                for key, value in self._values.items()}
 
 
 class Manager(ABC):
@@ -33,16 +237,48 @@ class Manager(ABC):
         ...
 
 
+class SettingsWatcher(Thread):
+    """Polls the modification time of settings.json and reloads the settings when it changes"""
+
+    def __init__(self, settings: 'Settings', interval: float = 1.0) -> None:
+        super().__init__(daemon=True)
+        self.settings = settings
+        self.interval = interval
+        self._stop_watching = Event()
+
+    def run(self) -> None:
+        while not self._stop_watching.wait(self.interval):
+            self.settings.reload()
+
+    def stop(self) -> None:
+        self._stop_watching.set()
+
+
 class Settings(Manager):
     """
     "Settings" class is responsible for general settings across the application.
     General settings are set in the "Settings.json" file.
+    The loaded settings are an immutable snapshot which is swapped as a whole
+    when the file changes, so readers never see a half-applied edit.
     """
 
     def __init__(self) -> None:
         super().__init__()
+        self._file_state = self._get_file_state()
         self.__settings = self._load_settings()
-        self._build_icon_path()
+        self.last_error: str | None = None
+        self._listeners: list[Callable[[SettingsSnapshot], None]] = []
+        self._reload_lock = Lock()
+        self._watcher = None
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        return self.__settings
+
+    @staticmethod
+    def _get_file_state() -> tuple[int, int]:
+        stat = os.stat(SETTINGS)
+        return stat.st_mtime_ns, stat.st_size
 
     @staticmethod
     def _add_base_dir(settings_data: dict) -> None:
@@ -62,6 +298,7 @@ class Settings(Manager):
         if directory != "":
             is_valid_dir(directory)
             settings_data['save_records_path'] = directory
+            return 0
 
         directory = path.join(BASEDIR, 'records',)
         is_valid_dir(directory)
@@ -70,43 +307,82 @@ class Settings(Manager):
 
         return 0
 
-    def _build_icon_path(self) -> int:
+    @staticmethod
+    def _build_icon_path(settings_data: dict) -> int:
         """Builds full icon path"""
 
         def does_file_exist(directory: str) -> bool:
             return Path(directory).exists()
 
-        icon_path = path.join(BASEDIR, self.get_setting('GUI.icon_path'))
+        icon_path = path.join(BASEDIR, settings_data['GUI']['icon_path'])
 
         if not does_file_exist(icon_path):
             raise LookupError(
                 f"ERROR: 'manager, settings manager, build icon path' \nICON file does not exist in the directory '{icon_path}'")
 
-        self.__settings['GUI']['icon_path'] = icon_path
+        settings_data['GUI']['icon_path'] = icon_path
 
         return 0
 
-    def _load_settings(self) -> dict:
+    def _load_settings(self) -> SettingsSnapshot:
         settings = SETTINGS
         with open(settings, 'r') as file:
             settings_data = json.load(file)
 
+        validate_settings(settings_data)
         self._add_base_dir(settings_data)
         self._build_save_records_path(settings_data)
+        self._build_icon_path(settings_data)
 
-        return settings_data
+        return SettingsSnapshot(settings_data)
 
     def get_setting(self, setting: str) -> Any:
-        keys = setting.split('.')
-        current_data = self.__settings
+        return self.__settings.get(setting)
 
-        try:
-            for key in keys:
-                current_data = current_data[key]
-            return current_data
-        except (KeyError, TypeError):
-            raise ValueError(
-                f'The setting was not found by this address "{setting}"')
+    def add_listener(self, listener: Callable[[SettingsSnapshot], None]) -> None:
+        """Call "listener" with the new snapshot after every reload (on the watcher thread)"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[SettingsSnapshot], None]) -> None:
+        self._listeners.remove(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload settings.json if it changed since the last load.
+        An invalid file keeps the current settings and is reported in "last_error".
+        Return True when new settings were applied.
+        """
+        with self._reload_lock:
+            try:
+                file_state = self._get_file_state()
+                if file_state == self._file_state and not force:
+                    return False
+                # Remember the state even on failure, the next edit changes it again
+                self._file_state = file_state
+                snapshot = self._load_settings()
+            except (OSError, ValueError, LookupError) as error:
+                self.last_error = str(error)
+                return False
+
+            self.last_error = None
+            if snapshot == self.__settings:
+                return False
+            self.__settings = snapshot
+
+        for listener in list(self._listeners):
+            listener(snapshot)
+        return True
+
+    def start_watching(self, interval: float = 1.0) -> None:
+        """Reload the settings automatically when settings.json changes"""
+        if self._watcher is None:
+            self._watcher = SettingsWatcher(self, interval)
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
 
 
 # Interface
@@ -130,4 +406,25 @@ class SettingsManager:
 
         return self.settings.get_setting(setting=setting)
 
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        """
+        The current immutable settings. Take it once per session
+        and read attributes ("snapshot.recorder.freq") on the hot path.
+        """
+        return self.settings.snapshot
+
+    def add_listener(self, listener: Callable[[SettingsSnapshot], None]) -> None:
+        self.settings.add_listener(listener)
+
+    def remove_listener(self, listener: Callable[[SettingsSnapshot], None]) -> None:
+        self.settings.remove_listener(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        return self.settings.reload(force)
+
+    def start_watching(self, interval: float = 1.0) -> None:
+        self.settings.start_watching(interval)
 
+    def stop_watching(self) -> None:
+        self.settings.stop_watching()
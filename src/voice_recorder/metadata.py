@@ -0,0 +1,260 @@
+# Annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Iterable, Iterator
+
+# OS
+import os
+from os import path
+import queue
+import struct
+from collections import OrderedDict
+from threading import Lock
+
+# Libs
+import numpy as np
+
+# GLOBAL VARIABLES
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+EPSILON = 1e-10
+
+
+def read_wav_header(full_path: str) -> dict:
+    """
+    Parse the RIFF chunks of a "wav" file without reading the samples.
+    A data size which is larger than the file (a record which is still being
+    written) is clamped to the bytes actually present.
+    """
+    with open(full_path, 'rb') as file:
+        riff, _, wave_id = struct.unpack('<4sI4s', file.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f'"{full_path}" is not a "wav" file')
+
+        header = {}
+        while True:
+            chunk_header = file.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f'"{full_path}" has no data chunk')
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+
+            if chunk_id == b'fmt ':
+                fmt = file.read(chunk_size + (chunk_size & 1))
+                format_tag, channels, framerate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    format_tag = struct.unpack('<H', fmt[24:26])[0]
+                header.update(format_tag=format_tag, channels=channels,
+                              framerate=framerate, sample_width=bits // 8)
+            elif chunk_id == b'data':
+                if 'channels' not in header:
+                    raise ValueError(f'"{full_path}" has no fmt chunk before the data')
+                data_offset = file.tell()
+                available = os.fstat(file.fileno()).st_size - data_offset
+                frame_size = header['channels'] * header['sample_width']
+                data_size = min(chunk_size, available) // frame_size * frame_size
+
+                header.update(data_offset=data_offset, data_size=data_size,
+                              frames=data_size // frame_size,
+                              duration=data_size / frame_size / header['framerate'])
+                return header
+            else:
+                file.seek(chunk_size + (chunk_size & 1), 1)
+
+
+def samples_view(full_path: str, header: dict) -> np.ndarray:
+    """Return a read-only memory-mapped (frames, channels) view over the data chunk"""
+    sample_width = header['sample_width']
+    shape = (header['frames'], header['channels'])
+
+    if header['format_tag'] == WAVE_FORMAT_IEEE_FLOAT:
+        dtype = {4: '<f4', 8: '<f8'}[sample_width]
+    else:
+        dtype = {1: 'u1', 2: '<i2', 3: 'u1', 4: '<i4'}[sample_width]
+    if sample_width == 3:
+        shape = (*shape, 3)
+
+    return np.memmap(full_path, dtype=dtype, mode='r', offset=header['data_offset'], shape=shape)
+
+
+def to_float32(block: np.ndarray, header: dict) -> np.ndarray:
+    """Convert a block of the raw view to float32 samples in [-1, 1]"""
+    if header['format_tag'] == WAVE_FORMAT_IEEE_FLOAT:
+        return block.astype(np.float32)
+
+    sample_width = header['sample_width']
+    if sample_width == 1:
+        return (block.astype(np.float32) - 128) / 128
+    if sample_width == 3:
+        # Little-endian 24 bit samples placed in the high bytes of int32
+        padded = np.zeros((*block.shape[:2], 4), dtype=np.uint8)
+        padded[..., 1:] = block
+        return padded.view('<i4')[..., 0].astype(np.float32) / 2 ** 31
+
+    return block.astype(np.float32) / 2 ** (8 * sample_width - 1)
+
+
+def read_record_blocks(full_path: str, block_frames: int = 1 << 16) -> tuple[int, int, Iterator[np.ndarray]]:
+    """
+    Return the channels, the frame rate and an iterator of float32 (frames, channels)
+    blocks of a record. "wav" is read through a memory map, other formats need "soundfile".
+    """
+    if not full_path.endswith('.wav'):
+        import soundfile
+
+        info = soundfile.info(full_path)
+        return info.channels, info.samplerate, soundfile.blocks(
+            full_path, blocksize=block_frames, dtype='float32', always_2d=True)
+
+    header = read_wav_header(full_path)
+
+    def blocks() -> Iterator[np.ndarray]:
+        if not header['frames']:
+            return
+        samples = samples_view(full_path, header)
+        for start in range(0, header['frames'], block_frames):
+            yield to_float32(samples[start:start + block_frames], header)
+
+    return header['channels'], header['framerate'], blocks()
+
+
+def analyze_record(full_path: str, thumbnail_points: int = 64, block_frames: int = 1 << 18) -> dict:
+    """
+    Return duration, peak and RMS (dBFS) and a waveform thumbnail of a record.
+    "wav" samples are read through a memory map block by block, so the memory
+    use does not depend on the record length. Other formats only get a duration.
+    """
+    stat = os.stat(full_path)
+    result = {
+        'path': full_path,
+        'name': path.basename(full_path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+    }
+
+    if not full_path.endswith('.wav'):
+        try:
+            import soundfile
+            result['duration'] = soundfile.info(full_path).duration
+        except Exception:
+            result['duration'] = None
+        return result
+
+    header = read_wav_header(full_path)
+    result['duration'] = header['duration']
+    frames = header['frames']
+    if not frames:
+        result.update(peak_db=None, rms_db=None, thumbnail=[])
+        return result
+
+    samples = samples_view(full_path, header)
+    points = min(thumbnail_points, frames)
+    # Thumbnail segment boundaries; blocks are aligned to them
+    bounds = np.linspace(0, frames, points + 1).astype(np.int64)
+    thumbnail = np.zeros(points, dtype=np.float32)
+    peak = 0.0
+    square_sum = 0.0
+
+    segment = 0
+    start = 0
+    while start < frames:
+        stop = min(start + block_frames, frames)
+        normalized = to_float32(samples[start:stop], header)
+        block = np.abs(normalized).max(axis=1)
+        peak = max(peak, float(block.max()))
+        square_sum += float(np.einsum('ij,ij->', normalized, normalized, dtype=np.float64))
+
+        # Max of every thumbnail segment overlapping this block
+        while segment < points and bounds[segment] < stop:
+            low = max(bounds[segment], start) - start
+            high = min(bounds[segment + 1], stop) - start
+            if high > low:
+                thumbnail[segment] = max(thumbnail[segment], block[low:high].max())
+            if bounds[segment + 1] > stop:
+                break
+            segment += 1
+
+        start = stop
+
+    del samples
+    result.update(
+        peak_db=float(20 * np.log10(peak + EPSILON)),
+        rms_db=float(10 * np.log10(square_sum / (frames * header['channels']) + EPSILON)),
+        thumbnail=thumbnail.tolist(),
+    )
+    return result
+
+
+class MetadataExtractor:
+    """
+    Thread pool which analyzes records in the background.
+    Results are cached by (path, mtime, size) and streamed through a queue
+    that the GUI drains from its own thread.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_cached: int = 4096, thumbnail_points: int = 64) -> None:
+        self.thumbnail_points = thumbnail_points
+        self.max_cached = max_cached
+        self.results: queue.Queue[dict] = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='metadata')
+        self._cache: OrderedDict[tuple[str, float, int], dict] = OrderedDict()
+        self._pending: set[tuple[str, float, int]] = set()
+        self._lock = Lock()
+
+    def submit(self, full_path: str) -> Future | None:
+        """Queue a record for analysis. Cached results are streamed immediately"""
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
+            return None
+        key = (full_path, stat.st_mtime, stat.st_size)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.results.put(self._cache[key])
+                return None
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+
+        future = self._executor.submit(analyze_record, full_path, self.thumbnail_points)
+        future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+    def _store(self, key: tuple[str, float, int], future: Future) -> None:
+        with self._lock:
+            self._pending.discard(key)
+            if future.cancelled() or future.exception() is not None:
+                return
+
+            self._cache[key] = future.result()
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+        self.results.put(future.result())
+
+    def index_durations(self, records_index, names: Iterable[str]) -> Future:
+        """Read the header durations of many records in one background job"""
+        def job() -> None:
+            for name in names:
+                full_path = path.join(records_index.directory, name)
+                try:
+                    duration = read_wav_header(full_path)['duration'] if name.endswith('.wav') \
+                        else analyze_record(full_path)['duration']
+                except (OSError, ValueError, KeyError, struct.error):
+                    continue
+                records_index.set_duration(name, duration)
+
+        return self._executor.submit(job)
+
+    def drain(self) -> list[dict]:
+        """Return every result completed since the last call"""
+        results = []
+        try:
+            while True:
+                results.append(self.results.get_nowait())
+        except queue.Empty:
+            return results
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
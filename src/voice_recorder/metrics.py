@@ -0,0 +1,200 @@
+# Annotations
+from collections.abc import Callable
+from typing import Any
+
+# OS
+import bisect
+import cProfile
+import csv
+import json
+import os
+from os import path
+import time
+import tracemalloc
+from threading import Event, Lock, Thread
+
+# GLOBAL VARIABLES
+# Upper bounds of the latency histogram buckets in milliseconds, the last bucket is open
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, cheap enough to update from the audio callback"""
+
+    def __init__(self, bounds_ms: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds_ms = bounds_ms
+        self._bounds = tuple(bound / 1000 for bound in bounds_ms)
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self._bounds, seconds)] += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def snapshot(self) -> dict:
+        count = self.count
+        buckets = {f'le_{bound}ms': counted for bound, counted in zip(self.bounds_ms, self.counts)}
+        buckets[f'gt_{self.bounds_ms[-1]}ms'] = self.counts[-1]
+        return {
+            'count': count,
+            'mean_ms': round(self.total / count * 1000, 4) if count else 0.0,
+            'max_ms': round(self.maximum * 1000, 4),
+            'buckets': buckets,
+        }
+
+
+class RecordingMetrics:
+    """
+    Counters of one capture session.
+    The capture fields are updated by the audio callback only and take no lock.
+    The writer fields take a lock, finished segments are closed on another thread.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        # Capture side
+        self.blocks_captured = 0
+        self.frames_captured = 0
+        self.input_overflows = 0
+        self.read_latency = LatencyHistogram()
+        # Writer side
+        self.bytes_written = 0
+        self.write_latency = LatencyHistogram()
+        self.sync_latency = LatencyHistogram()
+        self._lock = Lock()
+
+    def add_block(self, frame_count: int, time_info: dict, overflow: bool) -> None:
+        """
+        Count a captured block. The read latency is the time from the ADC to the callback,
+        as reported by PortAudio; host APIs which do not report it leave the histogram empty.
+        """
+        self.blocks_captured += 1
+        self.frames_captured += frame_count
+        if overflow:
+            self.input_overflows += 1
+
+        adc_time = time_info.get('input_buffer_adc_time')
+        current_time = time_info.get('current_time')
+        if adc_time and current_time and current_time >= adc_time:
+            self.read_latency.add(current_time - adc_time)
+
+    def add_write(self, size: int, seconds: float) -> None:
+        with self._lock:
+            self.bytes_written += size
+            self.write_latency.add(seconds)
+
+    def add_sync(self, seconds: float) -> None:
+        with self._lock:
+            self.sync_latency.add(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            snapshot = {
+                'time': round(time.time(), 3),
+                'uptime_seconds': round(time.time() - self.started, 3),
+                'blocks_captured': self.blocks_captured,
+                'frames_captured': self.frames_captured,
+                'input_overflows': self.input_overflows,
+                'bytes_written': self.bytes_written,
+                'read_latency': self.read_latency.snapshot(),
+                'write_latency': self.write_latency.snapshot(),
+                'sync_latency': self.sync_latency.snapshot(),
+            }
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot['traced_memory'] = {'current_kb': current // 1024, 'peak_kb': peak // 1024}
+        return snapshot
+
+
+class MeteredWriter:
+    """Record writer wrapper reporting the written bytes and the time spent in "write" """
+
+    def __init__(self, writer: Any, metrics: RecordingMetrics) -> None:
+        self.writer = writer
+        self.metrics = metrics
+
+    @property
+    def full_path(self) -> str:
+        return self.writer.full_path
+
+    @property
+    def queue_depth(self) -> int:
+        """Blocks waiting for an encoder thread, 0 for writers without a queue"""
+        return getattr(self.writer, 'queue_depth', 0)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        start = time.perf_counter()
+        self.writer.write(data)
+        self.metrics.add_write(len(data), time.perf_counter() - start)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def flatten(snapshot: dict, prefix: str = '') -> dict:
+    """Flatten nested snapshot dictionaries into "a.b" keys for CSV"""
+    flat = {}
+    for key, value in snapshot.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+class MetricsDumper(Thread):
+    """
+    Appends a snapshot to "dump_path" every "interval" seconds and once more when stopped.
+    A ".csv" path gets one flattened row per snapshot, any other path one JSON line.
+    """
+
+    def __init__(self, snapshot: Callable[[], dict], dump_path: str, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.snapshot = snapshot
+        self.dump_path = dump_path
+        self.interval = interval
+        self._stop_dumping = Event()
+
+    def dump(self) -> None:
+        snapshot = self.snapshot()
+        if path.splitext(self.dump_path)[1].lower() != '.csv':
+            with open(self.dump_path, 'a') as file:
+                file.write(json.dumps(snapshot) + '\n')
+            return
+
+        row = flatten(snapshot)
+        write_header = not path.exists(self.dump_path) or not path.getsize(self.dump_path)
+        with open(self.dump_path, 'a', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(row), extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def run(self) -> None:
+        while not self._stop_dumping.wait(self.interval):
+            self.dump()
+
+    def stop(self) -> None:
+        self._stop_dumping.set()
+        self.join()
+        self.dump()
+
+
+def run_profiled(function: Callable[[], None], profile_path: str) -> None:
+    """Run "function" under cProfile and write the statistics to "profile_path" (see "pstats")"""
+    os.makedirs(path.dirname(profile_path) or '.', exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        function()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
@@ -0,0 +1,354 @@
+# Annotations
+from collections.abc import Callable
+from typing import Any
+
+# OS
+import os
+from os import path
+import time
+from threading import Thread, Event
+
+# Libs
+import numpy as np
+from manager import SettingsManager
+from encoders import get_extension
+from ring_buffer import RingBuffer
+
+# GLOBAL VARIABLES
+settings_manager = SettingsManager()
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 0x2
+SAMPLE_WIDTH = 2
+# Clock drift larger than this is treated as a measurement error
+MAX_DRIFT = 0.005
+# Frames a device may be ahead of the slowest one, in blocks; older frames are dropped
+MAX_PENDING_BLOCKS = 8
+
+
+def resolve_devices(audio: Any, selectors: list[int | str]) -> list[dict]:
+    """
+    Return the PyAudio device infos of the input devices selected by index
+    or by a case-insensitive part of their name.
+    """
+    inputs = [info for info in (audio.get_device_info_by_index(index)
+                                for index in range(audio.get_device_count()))
+              if info['maxInputChannels'] > 0]
+
+    devices = []
+    for selector in selectors:
+        if isinstance(selector, int):
+            matches = [info for info in inputs if info['index'] == selector]
+        else:
+            matches = [info for info in inputs if selector.lower() in info['name'].lower()]
+
+        if not matches:
+            raise LookupError(f'Input device "{selector}" was not found')
+        devices.append(matches[0])
+
+    return devices
+
+
+class StreamingResampler:
+    """
+    Linear interpolation resampler keeping its phase between blocks.
+    Meant for the tiny ratios of clock drift compensation, not for rate conversion.
+    """
+
+    def __init__(self, ratio: float = 1.0) -> None:
+        # Output rate / input rate
+        self.ratio = ratio
+        self._previous = None
+        self._position = 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self._previous is None:
+            data = block.astype(np.float32)
+        else:
+            data = np.concatenate([self._previous, block.astype(np.float32)])
+        if len(data) < 2:
+            self._previous = data
+            return np.empty((0, block.shape[1]), dtype=block.dtype)
+
+        step = 1 / self.ratio
+        last = len(data) - 1
+        count = max(int(np.ceil((last - self._position) / step)), 0)
+        positions = self._position + step * np.arange(count)
+
+        indexes = positions.astype(np.int64)
+        fractions = (positions - indexes)[:, None].astype(np.float32)
+        output = data[indexes] * (1 - fractions) + data[indexes + 1] * fractions
+
+        self._position = self._position + count * step - last
+        self._previous = data[-1:]
+
+        return np.round(output).astype(block.dtype)
+
+
+class DeviceCapture:
+    """
+    One input stream of a multi-device session. The callback only copies the
+    block into the device ring buffer and timestamps it on the common clock.
+    """
+
+    def __init__(self, device_info: dict, channels: int, freq: int, frames_per_buffer: int, ring_buffer_seconds: float) -> None:
+        self.device_info = device_info
+        self.name = device_info['name']
+        self.channels = min(channels, int(device_info['maxInputChannels']))
+        self.freq = freq
+        self.frames_per_buffer = frames_per_buffer
+        self.frame_size = self.channels * SAMPLE_WIDTH
+        self.ring_buffer = RingBuffer(int(freq * ring_buffer_seconds) * self.frame_size)
+        self.resampler = StreamingResampler()
+        self.stream = None
+
+        # Written by the callback only
+        self.first_block_time = None
+        self.last_block_time = None
+        self.frames_captured = 0
+        self.input_overflows = 0
+
+        # Owned by the consumer
+        self.pending = np.empty((0, self.channels), dtype=np.int16)
+        self.frames_to_skip = None
+        self.frames_dropped = 0
+
+    def _stream_callback(self, in_data: bytes, frame_count: int, time_info: dict, status: int) -> tuple[None, int]:
+        now = time.monotonic()
+        if self.first_block_time is None:
+            self.first_block_time = now
+        else:
+            self.frames_captured += frame_count
+        self.last_block_time = now
+        if status & PA_INPUT_OVERFLOW:
+            self.input_overflows += 1
+
+        self.ring_buffer.push(in_data)
+        return None, PA_CONTINUE
+
+    @property
+    def start_time(self) -> float | None:
+        """Common clock time of the first captured sample"""
+        if self.first_block_time is None:
+            return None
+        return self.first_block_time - self.frames_per_buffer / self.freq
+
+    def measured_rate(self) -> float | None:
+        """Sample rate of the device measured against the common clock"""
+        if self.first_block_time is None or self.last_block_time == self.first_block_time:
+            return None
+        return self.frames_captured / (self.last_block_time - self.first_block_time)
+
+    def open(self, audio: Any) -> None:
+        import pyaudio
+
+        self.stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.freq,
+            input=True,
+            input_device_index=self.device_info['index'],
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._stream_callback
+        )
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+        self.ring_buffer.close()
+
+    def get_statistics(self) -> dict:
+        return {
+            'device': self.name,
+            'input_overflows': self.input_overflows,
+            'measured_rate': self.measured_rate(),
+            'drift_ratio': self.resampler.ratio,
+            'frames_dropped': self.frames_dropped,
+            **self.ring_buffer.get_statistics(),
+        }
+
+
+class MultiDeviceRecording(Thread):
+    """
+    Records several input devices in parallel streams.
+    Blocks are aligned on a common clock, clock drift against the first device
+    is compensated by resampling, and the output is written either as one
+    interleaved multi-channel record or as sample-aligned per-device records.
+    A device running ahead of the slowest one by more than "MAX_PENDING_BLOCKS"
+    (a faster clock without drift compensation, or a stalled device) loses its oldest frames.
+    """
+
+    def __init__(self, full_name_generator: Any, record_writer: Any, devices: list[int | str],
+                 interleaved: bool = True, drift_compensation: bool = True) -> None:
+        super().__init__(daemon=True)
+        self.full_name_generator = full_name_generator
+        self.record_writer = record_writer
+        self.device_selectors = devices
+        self.interleaved = interleaved
+        self.drift_compensation = drift_compensation
+        self.devices: list[DeviceCapture] = []
+        self.sinks: list[Callable[[memoryview], None]] = []
+        # Called with the channel count of the chunks passed to the sinks, before the first one
+        self.channel_hooks: list[Callable[[int], None]] = []
+        self.records: list[str] = []
+        # Settings of this session, later changes apply to the next one
+        self.settings = settings_manager.snapshot
+        # Set once every stream is open, or when the recording failed to start
+        self.ready = Event()
+        # The exception which ended the recording, if it failed
+        self.error: BaseException | None = None
+        self._stop_recording = Event()
+
+    def _update_drift(self) -> None:
+        reference_rate = self.devices[0].measured_rate()
+        if not reference_rate:
+            return
+
+        for device in self.devices[1:]:
+            rate = device.measured_rate()
+            # Wait for a few seconds of data before trusting the estimation
+            if rate and device.last_block_time - device.first_block_time > 2:
+                ratio = reference_rate / rate
+                if abs(ratio - 1) <= MAX_DRIFT:
+                    device.resampler.ratio = ratio
+
+    def _pull(self, device: DeviceCapture, chunk: memoryview) -> bool:
+        """Move captured blocks of a device into its pending frames. False when closed and drained"""
+        size = device.ring_buffer.pop_into(chunk, timeout=0.01)
+        if size is None:
+            return False
+
+        frames = size // device.frame_size
+        if frames:
+            block = np.frombuffer(chunk[:frames * device.frame_size], dtype=np.int16).reshape(-1, device.channels)
+            if self.drift_compensation and device is not self.devices[0]:
+                block = device.resampler.process(block)
+            device.pending = np.concatenate([device.pending, block])
+
+        return True
+
+    def _align_start(self) -> bool:
+        """Drop the frames captured before the last device started. False until all started"""
+        start_times = [device.start_time for device in self.devices]
+        if None in start_times:
+            return False
+
+        aligned_start = max(start_times)
+        for device in self.devices:
+            device.frames_to_skip = round((aligned_start - device.start_time) * device.freq)
+        return True
+
+    def _write_aligned(self, writers: list[Any]) -> None:
+        for device in self.devices:
+            skip = min(device.frames_to_skip, len(device.pending))
+            device.pending = device.pending[skip:]
+            device.frames_to_skip -= skip
+
+        frames = min(len(device.pending) for device in self.devices)
+        if frames and not any(device.frames_to_skip for device in self.devices):
+            blocks = [device.pending[:frames] for device in self.devices]
+            for device in self.devices:
+                device.pending = device.pending[frames:]
+
+            data = np.hstack(blocks).tobytes() if self.interleaved or self.sinks else None
+            if self.interleaved:
+                writers[0].write(data)
+            else:
+                for writer, block in zip(writers, blocks):
+                    writer.write(block.tobytes())
+            # The sinks see every device as one interleaved stream, also with per-device records
+            for sink in self.sinks:
+                sink(memoryview(data))
+
+        self._trim_pending()
+
+    def _trim_pending(self) -> None:
+        """Bound the frames waiting for the other devices (a faster clock or a stalled device)"""
+        for device in self.devices:
+            excess = len(device.pending) - MAX_PENDING_BLOCKS * device.frames_per_buffer
+            if excess > 0:
+                device.pending = device.pending[excess:]
+                device.frames_dropped += excess
+
+    def run(self) -> None:
+        import pyaudio
+
+        audio = pyaudio.PyAudio()
+        channels = self.settings.recorder.channels
+        freq = self.settings.recorder.freq
+        frames_per_buffer = self.settings.recorder.frames_per_buffer
+        ring_buffer_seconds = self.settings.recorder.ring_buffer_seconds
+
+        writers = []
+        chunks = []
+        streaming = False
+        aligned = False
+        try:
+            self.devices = [
+                DeviceCapture(info, channels, freq, frames_per_buffer, ring_buffer_seconds)
+                for info in resolve_devices(audio, self.device_selectors)
+            ]
+            full_path = self.full_name_generator.generate_unique_name(
+                get_extension(self.settings.recorder.format))
+            if self.interleaved:
+                self.records = [full_path]
+                channels_per_record = [sum(device.channels for device in self.devices)]
+            else:
+                # Per-device records share the claimed number: Record_5-1.wav, Record_5-2.wav
+                stem, extension = path.splitext(full_path)
+                self.records = [f'{stem}-{number}{extension}' for number in range(1, len(self.devices) + 1)]
+                channels_per_record = [device.channels for device in self.devices]
+                os.remove(full_path)
+
+            for record, record_channels in zip(self.records, channels_per_record):
+                writers.append(self.record_writer.open_continues_record(
+                    record, SAMPLE_WIDTH, channels=record_channels, settings=self.settings))
+
+            for hook in self.channel_hooks:
+                hook(sum(device.channels for device in self.devices))
+            chunks = [memoryview(bytearray(frames_per_buffer * device.frame_size)) for device in self.devices]
+            for device in self.devices:
+                device.open(audio)
+            streaming = True
+            self.ready.set()
+
+            while not self._stop_recording.is_set():
+                for device, chunk in zip(self.devices, chunks):
+                    self._pull(device, chunk)
+
+                aligned = aligned or self._align_start()
+                if aligned:
+                    self._update_drift()
+                    self._write_aligned(writers)
+        except BaseException as error:
+            self.error = error
+            raise
+        finally:
+            for device in self.devices:
+                device.close()
+            audio.terminate()
+
+            if streaming:
+                # Drain what was captured before the streams stopped
+                while any([self._pull(device, chunk) for device, chunk in zip(self.devices, chunks)]):
+                    pass
+                if aligned or self._align_start():
+                    self._write_aligned(writers)
+
+            for writer in writers:
+                writer.close()
+            if not streaming:
+                # Nothing was captured, the records would be empty
+                for record in self.records:
+                    if path.exists(record):
+                        os.remove(record)
+                self.records = []
+            # Do not keep a caller waiting for streams which failed to open
+            self.ready.set()
+
+    def stop(self) -> None:
+        self._stop_recording.set()
+
+    def get_statistics(self) -> dict:
+        """Return overflow and drift statistics of every device"""
+        return {'devices': [device.get_statistics() for device in self.devices]}
@@ -0,0 +1,140 @@
+# Annotations
+from typing import Any
+
+# Libs
+import numpy as np
+from metadata import read_wav_header, samples_view, to_float32
+
+# GLOBAL VARIABLES
+# Frames per output callback, small enough to start and seek without an audible delay
+PLAYBACK_BLOCK_FRAMES = 1024
+
+
+class RecordPlayer:
+    """
+    Plays a record through a "sounddevice" output stream callback.
+    A "wav" record is memory-mapped, so playback starts without reading the
+    file and the callback only touches the pages of the block it plays;
+    seeking moves the read position. Other formats are decoded by "soundfile"
+    block by block.
+    """
+
+    def __init__(self, backend: Any = None, block_frames: int = PLAYBACK_BLOCK_FRAMES) -> None:
+        self._backend = backend
+        self.block_frames = block_frames
+        self.full_path = None
+        self.channels = 0
+        self.framerate = 0
+        self.frames = 0
+        self._stream = None
+        self._samples = None
+        self._header = None
+        self._sound_file = None
+        self._position = 0
+        self._seek_to = None
+
+    @property
+    def backend(self) -> Any:
+        if self._backend is None:
+            import sounddevice
+
+            self._backend = sounddevice
+        return self._backend
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.framerate if self.framerate else 0.0
+
+    @property
+    def position(self) -> float:
+        """Playback position in seconds"""
+        position = self._position if self._seek_to is None else self._seek_to
+        return position / self.framerate if self.framerate else 0.0
+
+    @property
+    def playing(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+    def _open(self, full_path: str) -> None:
+        if full_path.endswith('.wav'):
+            self._header = read_wav_header(full_path)
+            self.channels = self._header['channels']
+            self.framerate = self._header['framerate']
+            self.frames = self._header['frames']
+            self._samples = samples_view(full_path, self._header) if self.frames else None
+        else:
+            import soundfile
+
+            self._sound_file = soundfile.SoundFile(full_path)
+            self.channels = self._sound_file.channels
+            self.framerate = self._sound_file.samplerate
+            self.frames = self._sound_file.frames
+        self.full_path = full_path
+
+    def play(self, full_path: str, start: float = 0.0) -> None:
+        """Start playing "full_path" from "start" seconds, stopping the current record"""
+        self.stop()
+        self._open(full_path)
+        self._position = min(int(start * self.framerate), self.frames)
+        self._seek_to = None
+        if self._sound_file is not None:
+            self._sound_file.seek(self._position)
+
+        self._stream = self.backend.OutputStream(
+            samplerate=self.framerate,
+            channels=self.channels,
+            dtype='float32',
+            blocksize=self.block_frames,
+            latency='low',
+            callback=self._callback
+        )
+        self._stream.start()
+
+    def seek(self, seconds: float) -> None:
+        """Move the playback position, the next callback plays from there"""
+        self._seek_to = min(max(int(seconds * self.framerate), 0), self.frames)
+
+    def pause(self) -> None:
+        if self.playing:
+            self._stream.stop()
+
+    def resume(self) -> None:
+        if self._stream is not None and not self._stream.active and self.position < self.duration:
+            # A stream which played to the end is still "running" until it is stopped
+            if not self._stream.stopped:
+                self._stream.stop()
+            self._stream.start()
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.abort()
+            self._stream.close()
+            self._stream = None
+        if self._sound_file is not None:
+            self._sound_file.close()
+            self._sound_file = None
+        # Drop the memory map
+        self._samples = None
+
+    def _read(self, start: int, count: int) -> np.ndarray:
+        if self._sound_file is not None:
+            if self._sound_file.tell() != start:
+                self._sound_file.seek(start)
+            return self._sound_file.read(count, dtype='float32', always_2d=True)
+        if self._samples is None:
+            return np.empty((0, self.channels), dtype=np.float32)
+        return to_float32(self._samples[start:start + count], self._header)
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info: Any, status: Any) -> None:
+        seek_to, self._seek_to = self._seek_to, None
+        if seek_to is not None:
+            self._position = seek_to
+
+        block = self._read(self._position, frames)
+        read = len(block)
+        outdata[:read] = block
+        outdata[read:] = 0
+        self._position += read
+
+        if read < frames:
+            raise self.backend.CallbackStop
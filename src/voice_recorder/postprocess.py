@@ -0,0 +1,208 @@
+# Annotations
+from typing import Any
+
+# OS
+from math import gcd
+
+# Libs
+import numpy as np
+from metadata import read_wav_header
+
+# GLOBAL VARIABLES
+NORMALIZATIONS = ('none', 'peak', 'loudness')
+# Pole of the DC blocker, the cut-off is about 35 Hz at 44.1 kHz
+DC_BLOCKER_POLE = 0.995
+HIGHPASS_ORDER = 4
+# Samples rescaled at once when a record is normalized in place
+NORMALIZE_BLOCK_SAMPLES = 1 << 20
+EPSILON = 1e-10
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler with the filter of "scipy.signal.resample_poly".
+    Only the polyphase branch of every output sample is computed, and the
+    input history is kept between blocks, so a recording of any length
+    is resampled block by block with the same result as in one call.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int, channels: int) -> None:
+        divisor = gcd(from_rate, to_rate)
+        self.up = to_rate // divisor
+        self.down = from_rate // divisor
+        self.channels = channels
+
+        # "scipy.signal" takes a second to import, only the recordings which post-process pay for it
+        from scipy import signal
+
+        half_length = 10 * max(self.up, self.down)
+        taps = signal.firwin(2 * half_length + 1, 1 / max(self.up, self.down), window=('kaiser', 5.0)) * self.up
+        # phases[p, t] = taps[p + t * up]
+        self.taps_per_phase = -(-len(taps) // self.up)
+        padded = np.zeros(self.taps_per_phase * self.up, dtype=np.float32)
+        padded[:len(taps)] = taps
+        self._phases = padded.reshape(self.taps_per_phase, self.up).T.copy()
+        # Group delay of the filter in the upsampled domain
+        self._delay = half_length
+
+        # Input history, zeros before the first sample
+        self._input = np.zeros((self.taps_per_phase - 1, channels), dtype=np.float32)
+        self._input_start = -(self.taps_per_phase - 1)
+        self._consumed = 0
+        self._next_output = 0
+
+    def _emit(self, end: int) -> np.ndarray:
+        """Compute the outputs before index "end" and drop the input history they no longer need"""
+        if end <= self._next_output:
+            return np.empty((0, self.channels), dtype=np.float32)
+
+        positions = np.arange(self._next_output, end) * self.down + self._delay
+        newest_inputs = positions // self.up - self._input_start
+        indexes = newest_inputs[:, None] - np.arange(self.taps_per_phase)[None, :]
+        output = np.einsum('kt,ktc->kc', self._phases[positions % self.up], self._input[indexes])
+
+        self._next_output = end
+        keep_from = (end * self.down + self._delay) // self.up - (self.taps_per_phase - 1)
+        drop = keep_from - self._input_start
+        if drop > 0:
+            self._input = self._input[drop:]
+            self._input_start += drop
+
+        return output
+
+    def _available_outputs(self) -> int:
+        """Number of outputs whose inputs have all arrived"""
+        last_input = self._input_start + len(self._input) - 1
+        return max(((last_input + 1) * self.up - self._delay - 1) // self.down + 1, 0)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        self._input = np.concatenate([self._input, block.astype(np.float32, copy=False)])
+        self._consumed += len(block)
+        return self._emit(self._available_outputs())
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining outputs; the input is treated as followed by silence"""
+        total = -(-self._consumed * self.up // self.down)
+        padding = self.taps_per_phase + self._delay // self.up + 1
+        self._input = np.concatenate([self._input, np.zeros((padding, self.channels), dtype=np.float32)])
+        return self._emit(min(total, self._available_outputs()))
+
+
+class PostProcessor:
+    """
+    Record writer stage which cleans the captured audio block by block:
+    channel downmix, DC removal, high-pass filtering and resampling, all
+    with filter state carried between blocks. Output is 16 bit.
+    Normalization needs the whole record, so the written "wav" file is
+    rescaled in place, in blocks, when the record is closed.
+    """
+
+    def __init__(self, output: Any, channels: int, framerate: int, output_channels: int | None = None,
+                 output_framerate: int | None = None, dc_removal: bool = True, highpass_hz: float = 0,
+                 normalize: str = 'none', target_db: float = -1.0) -> None:
+        if normalize not in NORMALIZATIONS:
+            raise ValueError(f'Normalization "{normalize}" is not supported, use one of {NORMALIZATIONS}')
+        output_channels = output_channels or channels
+        if output_channels not in (1, channels):
+            raise ValueError(f'Records can be downmixed to mono only, got {output_channels} channels')
+
+        self.output = output
+        self.channels = channels
+        self.framerate = framerate
+        self.output_channels = output_channels
+        self.output_framerate = output_framerate or framerate
+        self.normalize = normalize
+        self.target_db = target_db
+
+        from scipy import signal
+
+        self._lfilter = signal.lfilter
+        self._sosfilt = signal.sosfilt
+        self._dc_state = None
+        if dc_removal:
+            self._dc_state = np.zeros((1, output_channels))
+        self._highpass = None
+        if highpass_hz:
+            self._highpass = signal.butter(HIGHPASS_ORDER, highpass_hz, 'highpass', fs=framerate, output='sos')
+            self._highpass_state = np.zeros((self._highpass.shape[0], 2, output_channels))
+        self._resampler = None
+        if self.output_framerate != framerate:
+            self._resampler = PolyphaseResampler(framerate, self.output_framerate, output_channels)
+
+        # Statistics of the output for the normalization
+        self.peak = 0.0
+        self._sum_squares = 0.0
+        self._samples = 0
+
+    @property
+    def full_path(self) -> str:
+        return self.output.full_path
+
+    @property
+    def queue_depth(self) -> int:
+        return getattr(self.output, 'queue_depth', 0)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """Process a chunk of captured 16 bit frames"""
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, self.channels)
+        self.write_samples(samples.astype(np.float32) / 32768)
+
+    def write_samples(self, samples: np.ndarray) -> None:
+        """Process float frames in the [-1, 1) range"""
+        if self.output_channels == 1 and self.channels > 1:
+            samples = samples.mean(axis=1, keepdims=True)
+        if self._dc_state is not None:
+            samples, self._dc_state = self._lfilter(
+                [1, -1], [1, -DC_BLOCKER_POLE], samples, axis=0, zi=self._dc_state)
+        if self._highpass is not None:
+            samples, self._highpass_state = self._sosfilt(
+                self._highpass, samples, axis=0, zi=self._highpass_state)
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+
+        self._write_output(samples)
+
+    def _write_output(self, samples: np.ndarray) -> None:
+        if not len(samples):
+            return
+
+        self.peak = max(self.peak, float(np.max(np.abs(samples))))
+        self._sum_squares += float(np.sum(np.square(samples, dtype=np.float64)))
+        self._samples += samples.size
+        self.output.write(np.clip(np.round(samples * 32768), -32768, 32767).astype('<i2').tobytes())
+
+    def gain(self) -> float:
+        """Gain which brings the record to the target peak or RMS level, without clipping"""
+        if self.normalize == 'none' or self.peak < EPSILON:
+            return 1.0
+
+        target = 10 ** (self.target_db / 20)
+        if self.normalize == 'peak':
+            return target / self.peak
+
+        rms = np.sqrt(self._sum_squares / self._samples)
+        return min(target / max(rms, EPSILON), 1 / self.peak)
+
+    def close(self) -> None:
+        if self._resampler is not None:
+            self._write_output(self._resampler.flush())
+        self.output.close()
+
+        gain = self.gain()
+        if gain != 1.0:
+            normalize_wave(self.output.full_path, gain)
+
+
+def normalize_wave(full_path: str, gain: float) -> None:
+    """Multiply the 16 bit samples of a "wav" file by "gain" in place, block by block"""
+    header = read_wav_header(full_path)
+    if header['sample_width'] != 2 or not header['data_size']:
+        return
+
+    samples = np.memmap(full_path, dtype='<i2', mode='r+', offset=header['data_offset'],
+                        shape=(header['data_size'] // 2,))
+    for start in range(0, len(samples), NORMALIZE_BLOCK_SAMPLES):
+        block = samples[start:start + NORMALIZE_BLOCK_SAMPLES]
+        block[:] = np.clip(np.round(block * gain), -32768, 32767)
+    samples.flush()
+    del samples
@@ -0,0 +1,49 @@
+# Libs
+import numpy as np
+
+
+class PreRollBuffer:
+    """
+    Circular buffer holding the last "capacity" frames of the input stream.
+    Memory is allocated once, writing a block is a vectorized copy
+    into at most two slices.
+    """
+
+    def __init__(self, capacity: int, channels: int, dtype: str = 'int16') -> None:
+        if capacity <= 0:
+            raise ValueError(f'Pre-roll capacity must be positive, got "{capacity}"')
+
+        self.capacity = capacity
+        self.channels = channels
+        self._buffer = np.zeros((capacity, channels), dtype=dtype)
+        self._position = 0
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        samples = np.frombuffer(data, dtype=self._buffer.dtype).reshape(-1, self.channels)
+        size = len(samples)
+
+        if size >= self.capacity:
+            self._buffer[:] = samples[-self.capacity:]
+            self._position = 0
+            self._filled = self.capacity
+            return
+
+        first_part = min(size, self.capacity - self._position)
+        self._buffer[self._position:self._position + first_part] = samples[:first_part]
+        self._buffer[:size - first_part] = samples[first_part:]
+
+        self._position = (self._position + size) % self.capacity
+        self._filled = min(self._filled + size, self.capacity)
+
+    def last(self, frames: int | None = None) -> np.ndarray:
+        """Return a chronological copy of the last "frames" frames (all of them by default)"""
+        frames = self._filled if frames is None else min(frames, self._filled)
+        start = (self._position - frames) % self.capacity
+
+        if start + frames <= self.capacity:
+            return self._buffer[start:start + frames].copy()
+        return np.concatenate([self._buffer[start:], self._buffer[:self._position]])
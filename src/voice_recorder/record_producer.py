@@ -3,21 +3,41 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable, Mapping
 from typing import Any
 from numpy import ndarray, float64
+import numpy as np
 
 # OS
 from os import path, makedirs
+import os
+import re
 import queue
-from threading import Thread, Event
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import tracemalloc
+from threading import Thread, Event, Lock
 
 # Libs
-import sounddevice as sd
-from scipy.io.wavfile import write
+# Audio backends ("sounddevice", "pyaudio", "scipy") are imported lazily
+# where they are used, so importing this module does not load them.
 import wave
-import pyaudio
-from manager import SettingsManager
+from manager import SettingsManager, SettingsSnapshot
+from wave_stream import StreamingWaveWriter
+from ring_buffer import RingBuffer
+from calibration import resolve_frames_per_buffer
+from encoders import Encoder, EncodingWorker, WaveEncoder, create_encoder, get_extension, write_array
+from vad import VoiceActivityDetector
+from level_monitor import LevelMonitor
+from multi_capture import MultiDeviceRecording
+from rotation import RotatingWriter
+from pre_roll import PreRollBuffer
+from metrics import MeteredWriter, MetricsDumper, RecordingMetrics, run_profiled
+from postprocess import PostProcessor
+from journal import JournalWriter, recover_journals
+from scheduler import RecordingScheduler
 
 # GLOBAL VARIABLES
 settings_manager = SettingsManager()
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 0x2
 
 
 # ///
@@ -46,7 +66,7 @@ class Generator(ABC):
         self.default_filename: str
 
     @abstractmethod
-    def generate_unique_name(self) -> str:
+    def generate_unique_name(self, extension: str = '.wav') -> str:
         """
         Generate a unique name for the record and construct a full path where the record
         will be saved. Should return a full path.
@@ -75,12 +95,13 @@ class Producer(ABC):
         self.settings: dict
 
     @abstractmethod
-    def produce_record(self) -> None:
+    def produce_record(self) -> str:
         """
         Start record production.
         1. Produce record
         2. Generate a filename for the record
         3. Save the record as a "wav" file.
+        Returns the full path of the record.
         """
         ...
 
@@ -90,18 +111,43 @@ class Producer(ABC):
 # ///
 
 class VoiceRecorder(Recorder):
+    # sample format -> (numpy dtype of the buffer, bytes per sample in the file)
+    SAMPLE_FORMATS = {
+        'int16': ('int16', 2),
+        'int24': ('int32', 3),
+        'float32': ('float32', 4),
+    }
+
     def __init__(self) -> None:
         super().__init__()
         self.freq = settings_manager.get_setting('recorder.freq')
         self.duration = settings_manager.get_setting('recorder.duration')
         self.channels = settings_manager.get_setting('recorder.channels')
+        self.sample_format = settings_manager.get_setting('recorder.sample_format')
+        if self.sample_format not in self.SAMPLE_FORMATS:
+            raise ValueError(
+                f'Sample format "{self.sample_format}" is not supported, use one of {tuple(self.SAMPLE_FORMATS)}')
+        self._buffer = None
+
+    def _get_buffer(self) -> ndarray:
+        """Return the record buffer. It is allocated once and reused by every record"""
+        shape = (int(self.freq * self.duration), self.channels)
+        dtype = np.dtype(self.SAMPLE_FORMATS[self.sample_format][0])
+
+        if self._buffer is None or self._buffer.shape != shape or self._buffer.dtype != dtype:
+            self._buffer = np.empty(shape, dtype=dtype)
+
+        return self._buffer
 
     def record(self) -> tuple[int, ndarray[float64] | Any]:
-        recording = sd.rec(
-            int(self.freq * self.duration),
-            samplerate=self.freq,
-            channels=self.channels
-        )
+        """
+        Record into the preallocated buffer in the configured sample format.
+        The returned array is overwritten by the next record.
+        "int24" is captured in the high bytes of "int32" samples.
+        """
+        import sounddevice as sd
+
+        recording = sd.rec(out=self._get_buffer(), samplerate=self.freq)
         sd.wait()
         return self.freq, recording
 
@@ -114,43 +160,121 @@ class PathNameGenerator(Generator):
         self.default_filename = settings_manager.get_setting(
             'recorder.default_filename')
 
-    def generate_unique_name(self) -> str:
-        directory = self.save_records_path
+    # High-water counters shared by all generators: (directory, filename) -> last number
+    _counters: dict[tuple[str, str], int] = {}
+    _counters_lock = Lock()
 
-        count = 1
-        while True:
-            file_name = f"{self.default_filename}_{count}.wav"
-            full_path = path.join(directory, file_name)
-            if not path.exists(full_path):
-                return full_path
+    def _scan_highest_number(self) -> int:
+        """Return the highest record number in the directory using a single scan"""
+        # Per-device records of a multi-device session carry a "-N" suffix
+        pattern = re.compile(rf'^{re.escape(self.default_filename)}_(\d+)(?:-\d+)?\.\w+$')
+        highest = 0
 
-            count += 1
+        with os.scandir(self.save_records_path) as entries:
+            for entry in entries:
+                match = pattern.match(entry.name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+
+        return highest
+
+    def generate_unique_name(self, extension: str = '.wav') -> str:
+        """
+        Claim the next free name. The file is created with exclusive-create
+        semantics, so concurrent recorders (threads or processes) never
+        get the same name.
+        """
+        key = (self.save_records_path, self.default_filename)
+
+        with self._counters_lock:
+            if key not in self._counters:
+                self._counters[key] = self._scan_highest_number()
+
+            while True:
+                self._counters[key] += 1
+                full_path = path.join(
+                    self.save_records_path, f"{self.default_filename}_{self._counters[key]}{extension}")
+                try:
+                    file_descriptor = os.open(
+                        full_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                except FileExistsError:
+                    # Claimed by another process since the scan
+                    continue
+
+                os.close(file_descriptor)
+                return full_path
 
 
 class RecordWriter(Writer):
     def __init__(self) -> None:
         super().__init__()
 
+    @property
+    def record_format(self) -> str:
+        return settings_manager.get_setting('recorder.format')
+
+    @property
+    def extension(self) -> str:
+        return get_extension(self.record_format)
+
     def write_record(self, record: tuple[int, ndarray], full_path: str) -> None:
-        self.write_record_scrip(record, full_path)
+        if settings_manager.get_setting('postprocess.enabled'):
+            self.write_record_postprocessed(record, full_path)
+        elif self.record_format == 'wav' and record[1].dtype == np.int32:
+            # "int24" is captured in "int32" samples; the setting may have changed since the capture
+            self.write_record_int24(record, full_path)
+        elif self.record_format == 'wav':
+            self.write_record_scrip(record, full_path)
+        else:
+            freq, recording = record
+            write_array(self.record_format, full_path, freq, recording)
 
     def write_record_scrip(self, record: tuple[int], full_path: str) -> None:
+        from scipy.io.wavfile import write
+
         freq, recording = record
         write(full_path, freq, recording)
 
+    def write_record_int24(self, record: tuple[int, ndarray], full_path: str, block_frames: int = 65536) -> None:
+        """
+        Write "int32" samples as a 24 bit "wav" by keeping the 3 most significant bytes.
+        The packing is done block by block to bound the temporary memory.
+        """
+        freq, recording = record
+        channels = recording.shape[1] if recording.ndim > 1 else 1
+
+        with StreamingWaveWriter(full_path, channels=channels, sample_width=3, framerate=freq) as audio_file:
+            for start in range(0, len(recording), block_frames):
+                block = recording[start:start + block_frames]
+                audio_file.write(block.astype('<i4', copy=False).view(np.uint8).reshape(-1, 4)[:, 1:].tobytes())
+
+    def write_record_postprocessed(self, record: tuple[int, ndarray], full_path: str, block_frames: int = 65536) -> None:
+        """Run a fixed-duration record through the post-processing stage block by block"""
+        freq, recording = record
+        recording = recording.reshape(len(recording), -1)
+        # Integer samples are scaled to [-1, 1), "int24" is held in the high bytes of "int32"
+        scale = 1.0 if recording.dtype.kind == 'f' else float(np.iinfo(recording.dtype).max) + 1
+
+        processor = self.open_postprocessed_record(full_path, recording.shape[1], freq)
+        for start in range(0, len(recording), block_frames):
+            processor.write_samples(recording[start:start + block_frames].astype(np.float32) / scale)
+        processor.close()
+
     def write_record_wavio(self, record: tuple[int, ndarray], full_path: str) -> None:
         raise NotImplementedError
 
-    def write_continues_record_wave(self, record: tuple[pyaudio.PyAudio, list[bytes]], full_path: str) -> None:
+    def write_continues_record_wave(self, record: tuple['pyaudio.PyAudio', list[bytes]], full_path: str) -> None:
+        import pyaudio
+
         audio, frames = record
+        settings = settings_manager.snapshot
         # Open audio file
         audio_file = wave.open(full_path, 'wb')
 
         # Set setting to the audio file
-        audio_file.setnchannels(
-            settings_manager.get_setting('recorder.channels'))
+        audio_file.setnchannels(settings.recorder.channels)
         audio_file.setsampwidth(audio.get_sample_size(pyaudio.paInt16))
-        audio_file.setframerate(settings_manager.get_setting('recorder.freq'))
+        audio_file.setframerate(settings.recorder.freq)
 
         # Write data to the audio file
         audio_file.writeframes(b''.join(frames))
@@ -158,44 +282,454 @@ class RecordWriter(Writer):
         # Close the audio file
         audio_file.close()
 
+    def open_continues_record_wave(self, full_path: str, sample_width: int) -> StreamingWaveWriter:
+        """
+        Open a "wav" file which is written chunk by chunk while recording,
+        so the memory usage does not grow with the record length.
+        """
+        settings = settings_manager.snapshot
+        return StreamingWaveWriter(
+            full_path,
+            channels=settings.recorder.channels,
+            sample_width=sample_width,
+            framerate=settings.recorder.freq,
+            header_update_interval=settings.recorder.header_update_seconds
+        )
 
-class ContinuesRecording(Thread):
-    # TODO: Refactor the implementation so it would be more OOP designed.
+    def open_continues_record(self, full_path: str, sample_width: int, channels: int | None = None,
+                              settings: SettingsSnapshot | None = None, framerate: int | None = None) -> Encoder | EncodingWorker:
+        """
+        Open an encoder for the configured record format.
+        Compressed formats are encoded on a worker thread.
+        A recording session passes its own settings snapshot.
+        """
+        settings = settings or settings_manager.snapshot
+        return create_encoder(
+            settings.recorder.format,
+            full_path,
+            channels=channels or settings.recorder.channels,
+            sample_width=sample_width,
+            framerate=framerate or settings.recorder.freq,
+            header_update_interval=settings.recorder.header_update_seconds,
+            max_queue_blocks=settings.recorder.encoder_queue_blocks
+        )
 
-    def __init__(self, group: None = None, target: Callable[..., object] | None = None, name: str | None = None, args: Iterable[Any] = ..., kwargs: Mapping[str, Any] | None = None, *, daemon: bool | None = None) -> None:
-        super().__init__(group, target, name, args, kwargs, daemon=daemon)
-        self._target = target
-        self._stop_recording = Event()
-        self.daemon = True
+    def open_postprocessed_record(self, full_path: str, channels: int, framerate: int,
+                                  settings: SettingsSnapshot | None = None) -> PostProcessor:
+        """
+        Open a 16 bit record behind the post-processing stage, which takes
+        the captured "channels" and "framerate" and writes the configured ones.
+        """
+        settings = settings or settings_manager.snapshot
+        options = settings.postprocess
+        if options.normalize != 'none' and settings.recorder.format != 'wav':
+            raise ValueError('Normalization rescales the record in place and needs the "wav" format')
+
+        output_channels = options.channels or channels
+        output_framerate = options.sample_rate or framerate
+        output = self.open_continues_record(
+            full_path, 2, channels=output_channels, settings=settings, framerate=output_framerate)
+        return PostProcessor(
+            output, channels, framerate, output_channels, output_framerate,
+            dc_removal=options.dc_removal, highpass_hz=options.highpass_hz,
+            normalize=options.normalize, target_db=options.target_db)
+
+    def open_session_record(self, full_path: str, sample_width: int,
+                            settings: SettingsSnapshot) -> Encoder | EncodingWorker | PostProcessor | JournalWriter:
+        """
+        Open a record of a continuous recording, post-processed when enabled.
+        With "journal.enabled" the frames are journaled first (see "journal.py"),
+        a plain "wav" record is the journal itself until it is closed.
+        """
+        journaled = settings.journal.enabled
+        if journaled and settings.recorder.format == 'wav' and not settings.postprocess.enabled:
+            return self.open_journal(full_path, sample_width, settings)
+
+        if settings.postprocess.enabled:
+            output = self.open_postprocessed_record(
+                full_path, settings.recorder.channels, settings.recorder.freq, settings=settings)
+        else:
+            output = self.open_continues_record(full_path, sample_width, settings=settings)
+        return self.open_journal(full_path, sample_width, settings, output) if journaled else output
+
+    def open_journal(self, full_path: str, sample_width: int, settings: SettingsSnapshot,
+                     output: Any = None) -> JournalWriter:
+        return JournalWriter(
+            full_path,
+            channels=settings.recorder.channels,
+            sample_width=sample_width,
+            framerate=settings.recorder.freq,
+            output=output,
+            header_update_interval=settings.recorder.header_update_seconds,
+            fsync_interval=settings.journal.fsync_seconds
+        )
+
+
+class CaptureConsumer(Thread):
+    """
+    Drains the capture ring buffer on its own thread and hands every chunk
+    to the sinks (writer, encoders, analysis), so the audio callback never
+    waits for the disk.
+    The first sink error is kept and passed to "on_error"; the buffer is
+    still drained, without the sinks, until it is closed.
+    """
+
+    def __init__(self, ring_buffer: RingBuffer, sinks: list[Callable[[memoryview], None]], chunk_size: int,
+                 profile_path: str | None = None, on_error: Callable[[Exception], None] | None = None) -> None:
+        super().__init__(daemon=True)
+        self.ring_buffer = ring_buffer
+        self.sinks = sinks
+        self.profile_path = profile_path
+        self.on_error = on_error
+        self.error: Exception | None = None
+        self._chunk = bytearray(chunk_size)
+
+    def run(self) -> None:
+        if self.profile_path:
+            run_profiled(self._consume, self.profile_path)
+        else:
+            self._consume()
+
+    def _consume(self) -> None:
+        chunk = memoryview(self._chunk)
+        while True:
+            size = self.ring_buffer.pop_into(chunk, timeout=0.1)
+            if size is None:
+                break
+            if self.error is not None:
+                # The record is broken, only keep the callback from overflowing the buffer
+                continue
+
+            try:
+                for sink in self.sinks:
+                    sink(chunk[:size])
+            except Exception as error:
+                self.error = error
+                if self.on_error is not None:
+                    self.on_error(error)
+
+
+class RecordingSession:
+    """
+    Record sinks and state of one continuous recording, independent of
+    how the input stream is driven (a thread or an event loop).
+    """
+
+    def __init__(self, armed: bool = False) -> None:
+        # An armed recording keeps the input stream open and fills the pre-roll
+        # buffer; records are started and stopped with "begin_record"/"end_record".
+        self.armed = armed
+        self.pre_roll = None
+        self.sample_width = None
+        self._record_sink = None
+        self._record_sink_lock = Lock()
+        # Serializes "begin_record" callers (the GUI and the scheduler), the record is opened outside the sink lock
+        self._begin_record_lock = Lock()
+        # Who opened the record of an armed recording: "user" or "scheduler"
+        self.record_owner: str | None = None
         # self._result_queue = queue.Queue()
         self.full_name_generator = PathNameGenerator()
         self.record_writer = RecordWriter()
+        self.ring_buffer = None
+        # Additional consumers of the captured chunks (level meter, analysis)
+        self.sinks: list[Callable[[memoryview], None]] = []
+        # Sinks list iterated by the running capture consumer
+        self._consumer_sinks = None
+        # Full paths of the records created by this session
+        self.records: list[str] = []
+        # Called off the capture thread with the path of every finished rotated segment
+        self.segment_hooks: list[Callable[[str], None]] = []
+        self.metrics = RecordingMetrics()
+        # The record writer opened last, for its queue depth
+        self._writer = None
+        # Taken once, an edit of settings.json applies to the next session
+        self.settings = settings_manager.snapshot
+        self.ready = Event()
+        # The exception which ended the recording, if it failed
+        self.error: BaseException | None = None
+
+    def _stream_callback(self, in_data: bytes, frame_count: int, time_info: dict, status: int) -> tuple[None, int]:
+        """PortAudio callback. Only copies the block into the ring buffer"""
+        self.ring_buffer.push(in_data)
+        self.metrics.add_block(frame_count, time_info, bool(status & PA_INPUT_OVERFLOW))
+        return None, PA_CONTINUE
+
+    def _open_record_sink(self, sample_width: int) -> Encoder | EncodingWorker | VoiceActivityDetector | RotatingWriter:
+        """
+        Return the sink which persists the captured chunks. With voice activity
+        detection enabled records are opened only when speech is detected,
+        with rotation enabled records are split into segments.
+        """
+        def open_record() -> Encoder | EncodingWorker:
+            full_path = self.full_name_generator.generate_unique_name(
+                get_extension(self.settings.recorder.format))
+            self.records.append(full_path)
+            writer = self.record_writer.open_session_record(full_path, sample_width, self.settings)
+            if isinstance(writer, JournalWriter):
+                # The journal is the file which is synced
+                writer.journal.on_sync = self.metrics.add_sync
+            else:
+                encoder = writer.output if isinstance(writer, PostProcessor) else writer
+                if isinstance(encoder, WaveEncoder):
+                    encoder.writer.on_sync = self.metrics.add_sync
+            self._writer = MeteredWriter(writer, self.metrics)
+            return self._writer
+
+        def open_rotating_record() -> RotatingWriter:
+            max_minutes = self.settings.rotation.max_minutes
+            max_megabytes = self.settings.rotation.max_megabytes
+            return RotatingWriter(
+                open_record,
+                channels=self.settings.recorder.channels,
+                sample_width=sample_width,
+                framerate=self.settings.recorder.freq,
+                max_seconds=max_minutes * 60 if max_minutes else None,
+                max_bytes=int(max_megabytes * 1024 ** 2) if max_megabytes else None,
+                on_silence=self.settings.rotation.on_silence,
+                silence_threshold_db=self.settings.vad.threshold_db,
+                hooks=self.segment_hooks,
+                is_wave=self.settings.recorder.format == 'wav'
+            )
+
+        if self.settings.rotation.enabled:
+            open_writer = open_rotating_record
+        else:
+            open_writer = open_record
+
+        if not self.settings.vad.enabled:
+            return open_writer()
+
+        return VoiceActivityDetector(
+            open_writer,
+            channels=self.settings.recorder.channels,
+            sample_width=sample_width,
+            framerate=self.settings.recorder.freq,
+            threshold_db=self.settings.vad.threshold_db,
+            max_zero_crossing_rate=self.settings.vad.max_zero_crossing_rate,
+            hangover_ms=self.settings.vad.hangover_ms,
+            pre_roll_ms=self.settings.vad.pre_roll_ms,
+            split_segments=self.settings.vad.split_segments
+        )
+
+    def add_sink(self, sink: Callable[[memoryview], None]) -> None:
+        """Add a consumer of the captured chunks, also to a running recording"""
+        self.sinks.append(sink)
+        if self._consumer_sinks is not None:
+            self._consumer_sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[memoryview], None]) -> None:
+        self.sinks.remove(sink)
+        if self._consumer_sinks is not None:
+            self._consumer_sinks.remove(sink)
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether a record is open"""
+        return self._record_sink is not None
+
+    def _write_record(self, data: memoryview) -> None:
+        """Consumer sink feeding the pre-roll buffer and the open record"""
+        with self._record_sink_lock:
+            if self.pre_roll is not None:
+                self.pre_roll.write(data)
+            if self._record_sink is not None:
+                self._record_sink.write(data)
+
+    def begin_record(self, pre_roll_seconds: float | None = None, owner: str = 'user') -> bool:
+        """
+        Start a record in an armed recording. It begins with the last
+        "pre_roll_seconds" of the pre-roll (all of it by default).
+        A record which is already open continues, and the user takes over
+        a record opened by the scheduler. Return whether a record was opened.
+        """
+        with self._begin_record_lock:
+            if self._record_sink is not None:
+                if owner == 'user':
+                    self.record_owner = owner
+                return False
+
+            sink = self._open_record_sink(self.sample_width)
+            with self._record_sink_lock:
+                if self.pre_roll is not None and pre_roll_seconds != 0:
+                    frames = None if pre_roll_seconds is None else int(pre_roll_seconds * self.settings.recorder.freq)
+                    sink.write(self.pre_roll.last(frames).tobytes())
+                self._record_sink = sink
+            self.record_owner = owner
+        return True
+
+    def detach_record(self, owner: str | None = None) -> tuple[Any, list[str]]:
+        """
+        Detach the record of an armed recording without closing it, return its sink and records.
+        With "owner" a record which belongs to someone else is left open.
+        """
+        with self._begin_record_lock:
+            if owner is not None and self.record_owner != owner:
+                return None, []
+            with self._record_sink_lock:
+                sink, self._record_sink = self._record_sink, None
+                records, self.records = self.records, []
+            self.record_owner = None
+        return sink, records
+
+    def _discard_record_sink(self) -> None:
+        """Close the record sink of a recording which captured nothing and delete its records"""
+        sink, records = self.detach_record()
+        if sink is not None:
+            sink.close()
+        for full_path in records:
+            if path.exists(full_path):
+                os.remove(full_path)
+
+    def end_record(self, owner: str | None = None) -> list[str]:
+        """Close the record of an armed recording and return the created records"""
+        sink, records = self.detach_record(owner)
+        if sink is not None:
+            sink.close()
+        return records
+
+    def save_last(self, seconds: float) -> str:
+        """Write the last "seconds" of the pre-roll buffer to a new record instantly"""
+        if self.pre_roll is None:
+            raise ValueError('The recording has no pre-roll buffer')
+
+        with self._record_sink_lock:
+            samples = self.pre_roll.last(
+                int(seconds * self.settings.recorder.freq))
+
+        full_path = self.full_name_generator.generate_unique_name(
+            get_extension(self.settings.recorder.format))
+        audio_file = self.record_writer.open_session_record(full_path, self.sample_width, self.settings)
+        audio_file.write(samples.tobytes())
+        audio_file.close()
+
+        return full_path
+
+    def _start_diagnostics(self) -> tuple[MetricsDumper | None, str | None, bool]:
+        """Start the optional metrics dump and memory tracing, return the consumer profile path"""
+        dumper = None
+        dump_path = self.settings.metrics.dump_path
+        if dump_path:
+            dumper = MetricsDumper(self.get_metrics, dump_path,
+                                   self.settings.metrics.dump_interval_seconds)
+            dumper.start()
+
+        profile_path = None
+        if self.settings.metrics.profile:
+            profile_path = path.join(
+                self.settings.metrics.profile_path or path.join(
+                    self.settings.base_dir, 'profiles'),
+                time.strftime('consumer-%Y%m%d-%H%M%S.prof'))
+
+        started_tracing = False
+        if self.settings.metrics.tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        return dumper, profile_path, started_tracing
+
+    def get_statistics(self) -> dict:
+        """Return overflow, underrun and high-water mark counters of the capture buffer"""
+        if self.ring_buffer is None:
+            return {}
+        return self.ring_buffer.get_statistics()
+
+    def get_metrics(self) -> dict:
+        """Return the capture, writer and buffer metrics of the session"""
+        return {
+            **self.metrics.snapshot(),
+            'writer_queue_depth': self._writer.queue_depth if self._writer is not None else 0,
+            'ring_buffer': self.get_statistics(),
+        }
+
+
+class ContinuesRecording(RecordingSession, Thread):
+    """Continuous recording on its own thread, the captured blocks are written by a consumer thread"""
+
+    def __init__(self, group: None = None, target: Callable[..., object] | None = None, name: str | None = None, args: Iterable[Any] = ..., kwargs: Mapping[str, Any] | None = None, *, daemon: bool | None = None, armed: bool = False) -> None:
+        Thread.__init__(self, group, target, name, args, kwargs, daemon=daemon)
+        RecordingSession.__init__(self, armed)
+        self._target = target
+        self._stop_recording = Event()
+        self.daemon = True
 
     def run(self):
-        # Start recording
+        import pyaudio
+
+        channels = self.settings.recorder.channels
+        freq = self.settings.recorder.freq
+        frames_per_buffer = resolve_frames_per_buffer(self.settings)
+
         audio = pyaudio.PyAudio()
-        stream = audio.open(
-            format=pyaudio.paInt16,
-            channels=settings_manager.get_setting('recorder.channels'),
-            rate=settings_manager.get_setting('recorder.freq'),
-            input=True,
-            frames_per_buffer=settings_manager.get_setting(
-                'recorder.frames_per_buffer')
-        )
-        frames = []
-        while not self._stop_recording.is_set():
-            data = stream.read(1024)
-            frames.append(data)
-
-        # Stop recording
-        stream.stop_stream()
-        stream.close()
-        audio.terminate()
-
-        # Save audio record
-        self.record_writer.write_continues_record_wave(
-            (audio, frames), self.full_name_generator.generate_unique_name()
-        )
+        self.sample_width = audio.get_sample_size(pyaudio.paInt16)
+        frame_size = channels * self.sample_width
+        self.ring_buffer = RingBuffer(int(
+            freq * self.settings.recorder.ring_buffer_seconds) * frame_size)
+
+        pre_roll_seconds = self.settings.recorder.pre_roll_seconds
+        if self.armed and pre_roll_seconds:
+            self.pre_roll = PreRollBuffer(int(freq * pre_roll_seconds), channels)
+
+        dumper, profile_path, started_tracing = self._start_diagnostics()
+
+        stream = None
+        consumer = None
+        try:
+            # Audio record is streamed to the disk by the consumer thread
+            if not self.armed:
+                self._record_sink = self._open_record_sink(self.sample_width)
+            self._consumer_sinks = [self._write_record, *self.sinks]
+            consumer = CaptureConsumer(
+                self.ring_buffer, self._consumer_sinks, frames_per_buffer * frame_size,
+                profile_path=profile_path, on_error=self._fail)
+            consumer.start()
+
+            # Start recording
+            stream = audio.open(
+                format=pyaudio.paInt16,
+                channels=channels,
+                rate=freq,
+                input=True,
+                frames_per_buffer=frames_per_buffer,
+                stream_callback=self._stream_callback
+            )
+            self.ready.set()
+            self._stop_recording.wait()
+        except BaseException as error:
+            self.error = error
+            raise
+        finally:
+            # Stop recording
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
+            audio.terminate()
+
+            # Let the consumer drain the buffer
+            self.ring_buffer.close()
+            if consumer is not None:
+                consumer.join()
+            if stream is None:
+                # Nothing was captured, the record would be empty
+                self._discard_record_sink()
+            elif self._record_sink is not None:
+                try:
+                    self._record_sink.close()
+                except Exception as error:
+                    self._fail(error)
+                self._record_sink = None
+
+            if dumper is not None:
+                dumper.stop()
+            if started_tracing:
+                tracemalloc.stop()
+            # Do not keep "arm" waiting for a stream which failed to open
+            self.ready.set()
+
+    def _fail(self, error: BaseException) -> None:
+        """Keep the first error which broke the recording and stop capturing"""
+        if self.error is None:
+            self.error = error
+        self.stop()
 
     def stop(self):
         self._stop_recording.set()
@@ -208,17 +742,185 @@ class RecordProducer(Producer):
         self.path_name_generator = PathNameGenerator()
         self.record_writer = RecordWriter()
         self.continues_recording = None
-
-    def produce_record(self) -> None:
-        self.record_writer.write_record_scrip(
-            self.voice_recorder.record(),
-            self.path_name_generator.generate_unique_name()
-        )
+        self.armed_recording = None
+        self.scheduler = None
+        self.level_monitor = LevelMonitor(
+            settings_manager.get_setting('recorder.channels'))
+        self.segment_hooks: list[Callable[[str], None]] = []
+        # Consumers of the captured chunks added to every recording (level triggers)
+        self.sinks: list[Callable[[memoryview], None]] = []
+        # Closes stopped records off the caller's thread
+        self._finalizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='finalize')
+        settings_manager.add_listener(self._apply_settings)
+
+    def _apply_settings(self, settings: SettingsSnapshot) -> None:
+        """
+        Settings listener. Fixed-duration records use the new settings right away,
+        continuous recordings from their next session.
+        """
+        self.path_name_generator.save_records_path = settings.save_records_path
+        self.path_name_generator.default_filename = settings.recorder.default_filename
+        self.voice_recorder.freq = settings.recorder.freq
+        self.voice_recorder.duration = settings.recorder.duration
+        self.voice_recorder.channels = settings.recorder.channels
+        self.voice_recorder.sample_format = settings.recorder.sample_format
+
+    def produce_record(self) -> str:
+        full_path = self.path_name_generator.generate_unique_name(
+            self.record_writer.extension)
+        try:
+            self.record_writer.write_record(self.voice_recorder.record(), full_path)
+        except BaseException:
+            # Do not leave the empty file which claimed the name
+            if path.exists(full_path):
+                os.remove(full_path)
+            raise
+        return full_path
+
+    @property
+    def is_armed(self) -> bool:
+        return self.armed_recording is not None
+
+    def arm(self) -> None:
+        """
+        Keep the input stream open and the last "recorder.pre_roll_seconds"
+        in memory, so records can start in the past.
+        """
+        if self.is_armed:
+            return
+
+        self.armed_recording = ContinuesRecording(armed=True)
+        self.level_monitor.channels = self.armed_recording.settings.recorder.channels
+        self.armed_recording.sinks.extend([self.level_monitor.write, *self.sinks])
+        self.armed_recording.segment_hooks.extend(self.segment_hooks)
+        self.armed_recording.start()
+        self.armed_recording.ready.wait(timeout=5)
+        if self.armed_recording.error is not None:
+            error, self.armed_recording = self.armed_recording.error, None
+            raise error
+
+    def disarm(self) -> list[str]:
+        """Close the input stream of the armed recording"""
+        if not self.is_armed:
+            return []
+
+        records = self.armed_recording.end_record()
+        self.armed_recording.stop()
+        self.armed_recording.join()
+        self.armed_recording = None
+        return records
+
+    def add_sink(self, sink: Callable[[memoryview], None]) -> None:
+        """Feed the captured chunks of the armed and of every next recording to "sink" """
+        self.sinks.append(sink)
+        if self.is_armed:
+            self.armed_recording.add_sink(sink)
+
+    def remove_sink(self, sink: Callable[[memoryview], None]) -> None:
+        self.sinks.remove(sink)
+        if self.is_armed:
+            self.armed_recording.remove_sink(sink)
+
+    def save_last_seconds(self, seconds: float) -> str:
+        if not self.is_armed:
+            raise ValueError('The recorder is not armed')
+        return self.armed_recording.save_last(seconds)
 
     def start_recording(self) -> None:
-        self.continues_recording = ContinuesRecording()
+        if self.is_armed:
+            self.armed_recording.begin_record()
+            return
+
+        if settings_manager.get_setting('multi_device.enabled'):
+            # Voice activity detection, rotation and post-processing are rejected
+            # with multi-device recording by the settings validation
+            self.continues_recording = MultiDeviceRecording(
+                self.path_name_generator,
+                self.record_writer,
+                settings_manager.get_setting('multi_device.devices'),
+                interleaved=settings_manager.get_setting(
+                    'multi_device.interleaved'),
+                drift_compensation=settings_manager.get_setting(
+                    'multi_device.drift_compensation')
+            )
+            self.continues_recording.channel_hooks.append(self._set_monitor_channels)
+        else:
+            self.continues_recording = ContinuesRecording()
+            self.level_monitor.channels = self.continues_recording.settings.recorder.channels
+            self.continues_recording.segment_hooks.extend(self.segment_hooks)
+        self.continues_recording.sinks.extend([self.level_monitor.write, *self.sinks])
         self.continues_recording.start()
 
-    def stop_recording(self) -> None:
+    def _set_monitor_channels(self, channels: int) -> None:
+        self.level_monitor.channels = channels
+
+    def start_scheduler(self, on_records: Callable[[list[str]], None] | None = None) -> RecordingScheduler:
+        """
+        Run the windows, jobs and level trigger of the "scheduler" settings
+        on the armed input stream. "on_records" gets the records of every run.
+        """
+        if self.scheduler is None:
+            self.scheduler = RecordingScheduler.from_settings(self, settings_manager.snapshot)
+            # Armed here, so a Start pressed right away uses the shared stream too
+            self.arm()
+            if on_records is not None:
+                self.scheduler.on_records.append(on_records)
+            self.scheduler.start()
+        return self.scheduler
+
+    def stop_scheduler(self) -> None:
+        """Stop scheduling, a scheduled record which is open is closed"""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+
+    def recover_records(self) -> list[str]:
+        """Turn the journals of recordings which did not stop cleanly into "wav" records"""
+        return recover_journals(self.path_name_generator.save_records_path)
+
+    def get_metrics(self) -> dict:
+        """Metrics of the armed or the last continuous recording, empty before the first one"""
+        recording = self.armed_recording or self.continues_recording
+        if recording is None:
+            return {}
+        if isinstance(recording, ContinuesRecording):
+            return recording.get_metrics()
+        return recording.get_statistics()
+
+    def stop_recording(self) -> list[str]:
+        """
+        Stop the continuous recording and return the full paths of the created records.
+        Raise the error which broke the recording (a failed encoder, a full disk).
+        """
+        if self.is_armed:
+            return self.armed_recording.end_record()
+
         self.continues_recording.stop()
-        self.continues_recording.join()
+        return self._join_recording(self.continues_recording)
+
+    @staticmethod
+    def _close_record(sink: Any, records: list[str]) -> list[str]:
+        if sink is not None:
+            sink.close()
+        return records
+
+    @staticmethod
+    def _join_recording(recording: ContinuesRecording | MultiDeviceRecording) -> list[str]:
+        """Wait for a stopped recording, raise the error which broke or failed to start it"""
+        recording.join()
+        if recording.error is not None:
+            raise recording.error
+        return recording.records
+
+    def stop_recording_in_background(self) -> Future:
+        """
+        Signal the recording to stop and return at once. The records are
+        drained and closed on a worker thread; the returned future resolves
+        to their full paths, or carries the error of a failed recording.
+        """
+        if self.is_armed:
+            return self._finalizer.submit(self._close_record, *self.armed_recording.detach_record())
+
+        recording = self.continues_recording
+        recording.stop()
+        return self._finalizer.submit(self._join_recording, recording)
@@ -1,4 +1,8 @@
+from collections.abc import Callable
+from concurrent.futures import Future
+
 from record_producer import RecordProducer
+from level_monitor import LevelMonitor
 
 # Interface recorder.
 
@@ -14,12 +18,65 @@ class Recorder:
 
         return cls._instance
 
+    @property
+    def level_monitor(self) -> LevelMonitor:
+        """Decimated levels of the running continuous recording"""
+        return self.record_producer.level_monitor
+
+    def add_segment_hook(self, hook: Callable[[str], None]) -> None:
+        """Call "hook" with the path of every finished segment of a rotated recording"""
+        self.record_producer.segment_hooks.append(hook)
+
+    @property
+    def is_armed(self) -> bool:
+        return self.record_producer.is_armed
+
+    def arm(self) -> None:
+        """Start filling the pre-roll buffer from an always open input stream"""
+        self.record_producer.arm()
+
+    def disarm(self) -> list[str]:
+        return self.record_producer.disarm()
+
+    def save_last_seconds(self, seconds: float) -> str:
+        """Save the last "seconds" of input as a record and return its path"""
+        return self.record_producer.save_last_seconds(seconds)
 
-    def record(self) -> None:
-        self.record_producer.produce_record()
+    def get_metrics(self) -> dict:
+        """
+        Blocks captured, input overflows, read/write/sync latency histograms,
+        writer queue depth, bytes written and ring buffer statistics
+        of the armed or the last continuous recording.
+        """
+        return self.record_producer.get_metrics()
+
+    def start_scheduler(self, on_records: Callable[[list[str]], None] | None = None) -> None:
+        """
+        Start the scheduled and level-triggered records of the "scheduler" settings.
+        They share the always open input stream of the armed recorder.
+        """
+        self.record_producer.start_scheduler(on_records)
+
+    def stop_scheduler(self) -> None:
+        self.record_producer.stop_scheduler()
+
+    def recover_records(self) -> list[str]:
+        """
+        Turn the journals left by a crash during a continuous recording
+        into "wav" records and return their paths.
+        """
+        return self.record_producer.recover_records()
+
+    def record(self) -> str:
+        return self.record_producer.produce_record()
 
     def start_recording(self) -> None:
         self.record_producer.start_recording()
 
-    def stop_recording(self) -> None:
-        self.record_producer.stop_recording()
+    def stop_recording(self) -> list[str]:
+        return self.record_producer.stop_recording()
+
+    def stop_recording_in_background(self) -> Future:
+        """Stop without waiting for the records, the future resolves to their full paths"""
+        return self.record_producer.stop_recording_in_background()
+
@@ -0,0 +1,175 @@
+# OS
+import os
+from os import path
+import sqlite3
+from threading import Lock
+
+# Libs
+import wave
+
+# GLOBAL VARIABLES
+RECORD_EXTENSIONS = ('.wav', '.mp3', '.ogg', '.flac', '.opus')
+SORT_COLUMNS = {
+    'name': 'name',
+    'date': 'mtime',
+    'size': 'size',
+    'duration': 'duration',
+}
+
+
+def read_duration(full_path: str) -> float | None:
+    """Return the record duration in seconds read from the file header only"""
+    try:
+        if full_path.endswith('.wav'):
+            with wave.open(full_path, 'rb') as audio_file:
+                return audio_file.getnframes() / audio_file.getframerate()
+
+        import soundfile
+        return soundfile.info(full_path).duration
+    except Exception:
+        # Unreadable, still being written or no decoder installed.
+        return None
+
+
+class RecordsIndex:
+    """
+    Persistent index of the records directory kept in a SQLite file beside it.
+    Holds name, size, mtime, duration and format of every record, is updated
+    incrementally when records are created, renamed or deleted, and serves
+    sorted listings without rescanning the directory.
+    """
+
+    def __init__(self, directory: str, index_path: str | None = None) -> None:
+        self.directory = directory
+        self.index_path = index_path or f"{directory.rstrip(os.sep)}.index.sqlite3"
+        self._lock = Lock()
+        self._connection = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS records (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                duration REAL,
+                format TEXT NOT NULL
+            )"""
+        )
+        for column in ('mtime', 'size', 'duration'):
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS records_{column} ON records ({column})")
+        self._connection.commit()
+
+    def _row(self, name: str, stat: os.stat_result, read_durations: bool = True) -> tuple:
+        return (
+            name,
+            stat.st_size,
+            stat.st_mtime,
+            read_duration(path.join(self.directory, name)) if read_durations else None,
+            path.splitext(name)[1].lstrip('.').lower(),
+        )
+
+    def sync(self, read_durations: bool = True) -> tuple[list[str], list[str]]:
+        """
+        Reconcile the index with the directory using a single scan.
+        Only new or changed files have their header read; with "read_durations"
+        off the durations are left to be filled in later with "set_duration".
+        Return the names which were added (or changed) and removed.
+        """
+        on_disk = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(RECORD_EXTENSIONS) and entry.is_file():
+                    on_disk[entry.name] = entry.stat()
+
+        with self._lock:
+            indexed = {
+                name: (size, mtime) for name, size, mtime in
+                self._connection.execute("SELECT name, size, mtime FROM records")
+            }
+            added = [name for name, stat in on_disk.items()
+                     if indexed.get(name) != (stat.st_size, stat.st_mtime)]
+            removed = [name for name in indexed if name not in on_disk]
+
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)",
+                [self._row(name, on_disk[name], read_durations) for name in added]
+            )
+            self._connection.executemany(
+                "DELETE FROM records WHERE name = ?", [(name,) for name in removed])
+            self._connection.commit()
+
+        return added, removed
+
+    def add(self, full_path: str) -> str:
+        """Index a record which was just created. Return its name"""
+        name = path.basename(full_path)
+        row = self._row(name, os.stat(full_path))
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)", row)
+            self._connection.commit()
+
+        return name
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM records WHERE name = ?", (new_name,))
+            self._connection.execute(
+                "UPDATE records SET name = ?, format = ? WHERE name = ?",
+                (new_name, path.splitext(new_name)[1].lstrip('.').lower(), old_name)
+            )
+            self._connection.commit()
+
+    def set_duration(self, name: str, duration: float | None) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE records SET duration = ? WHERE name = ?", (duration, name))
+            self._connection.commit()
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM records WHERE name = ?", (name,))
+            self._connection.commit()
+
+    def names(self, sort_by: str = 'name', descending: bool = False) -> list[str]:
+        """Return record names ordered by "name", "date", "size" or "duration" """
+        order = 'DESC' if descending else 'ASC'
+        with self._lock:
+            return [name for name, in self._connection.execute(
+                f"SELECT name FROM records ORDER BY {SORT_COLUMNS[sort_by]} {order}, name {order}")]
+
+    @staticmethod
+    def _search_clause(search: str) -> tuple[str, tuple]:
+        if not search:
+            return '', ()
+
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return "WHERE name LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+
+    def count(self, search: str = '') -> int:
+        """Return the number of records whose name contains "search" """
+        where, parameters = self._search_clause(search)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM records {where}", parameters).fetchone()[0]
+
+    def page(self, offset: int, limit: int, sort_by: str = 'name', descending: bool = False, search: str = '') -> list[str]:
+        """Return "limit" sorted record names starting at "offset", optionally filtered by name"""
+        where, parameters = self._search_clause(search)
+        order = 'DESC' if descending else 'ASC'
+        with self._lock:
+            return [name for name, in self._connection.execute(
+                f"SELECT name FROM records {where} ORDER BY {SORT_COLUMNS[sort_by]} {order}, name {order} LIMIT ? OFFSET ?",
+                (*parameters, limit, offset))]
+
+    def get(self, name: str) -> dict | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT name, size, mtime, duration, format FROM records WHERE name = ?", (name,)).fetchone()
+
+        if row is None:
+            return None
+        return dict(zip(('name', 'size', 'mtime', 'duration', 'format'), row))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
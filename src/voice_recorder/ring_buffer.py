@@ -0,0 +1,98 @@
+# OS
+from threading import Condition
+
+
+class RingBuffer:
+    """
+    Preallocated fixed-size byte ring buffer between the audio callback (producer)
+    and a consumer thread. The producer never blocks: a chunk which does not fit
+    is dropped and counted as an overflow.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError(f'Ring buffer capacity must be positive, got "{capacity}"')
+
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._read_position = 0
+        self._size = 0
+        self._closed = False
+        self._condition = Condition()
+
+        # Statistics
+        self.overflows = 0
+        self.dropped_bytes = 0
+        self.underruns = 0
+        self.high_water_mark = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def push(self, data: bytes | bytearray | memoryview) -> bool:
+        """Copy a chunk into the buffer. Return False if the chunk was dropped"""
+        size = len(data)
+        with self._condition:
+            if self._closed or size > self.capacity - self._size:
+                self.overflows += 1
+                self.dropped_bytes += size
+                return False
+
+            write_position = (self._read_position + self._size) % self.capacity
+            first_part = min(size, self.capacity - write_position)
+            self._view[write_position:write_position + first_part] = data[:first_part]
+            self._view[:size - first_part] = data[first_part:]
+
+            self._size += size
+            self.high_water_mark = max(self.high_water_mark, self._size)
+            self._condition.notify()
+
+        return True
+
+    def pop_into(self, out: bytearray | memoryview, timeout: float | None = None) -> int | None:
+        """
+        Move up to len(out) bytes into "out" and return the amount of moved bytes.
+        Waits up to "timeout" seconds for data; returns 0 on an underrun
+        and None once the buffer is closed and drained.
+        """
+        with self._condition:
+            if not self._size and not self._closed:
+                self._condition.wait(timeout)
+
+            if not self._size:
+                if self._closed:
+                    return None
+                self.underruns += 1
+                return 0
+
+            size = min(len(out), self._size)
+            first_part = min(size, self.capacity - self._read_position)
+            out[:first_part] = self._view[self._read_position:self._read_position + first_part]
+            out[first_part:size] = self._view[:size - first_part]
+
+            self._read_position = (self._read_position + size) % self.capacity
+            self._size -= size
+
+        return size
+
+    def close(self) -> None:
+        """Stop accepting data. The consumer still drains what is left"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def get_statistics(self) -> dict:
+        with self._condition:
+            return {
+                'capacity': self.capacity,
+                'size': self._size,
+                'overflows': self.overflows,
+                'dropped_bytes': self.dropped_bytes,
+                'underruns': self.underruns,
+                'high_water_mark': self.high_water_mark,
+            }
@@ -0,0 +1,93 @@
+# Annotations
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# Libs
+import numpy as np
+from vad import SAMPLE_DTYPES, block_features
+
+# GLOBAL VARIABLES
+# RIFF sizes are 32 bit; leave room for the header
+MAX_WAVE_DATA_BYTES = 0xFFFFFFFF - 1024
+
+
+class RotatingWriter:
+    """
+    Sink which splits an unbounded recording into segment records.
+    A new segment is opened at a block boundary once the current one reaches
+    "max_seconds" or "max_bytes"; with "on_silence" the switch waits for the
+    next silent block, up to twice the limit. Finished segments are closed and
+    handed to the completion hooks on a worker thread, off the capture path.
+    """
+
+    def __init__(self, open_writer: Callable[[], Any], channels: int, sample_width: int, framerate: int,
+                 max_seconds: float | None = None, max_bytes: int | None = None,
+                 on_silence: bool = False, silence_threshold_db: float = -45.0,
+                 hooks: list[Callable[[str], None]] | None = None, is_wave: bool = True) -> None:
+        self.open_writer = open_writer
+        self.channels = channels
+        self.on_silence = on_silence
+        self.silence_threshold_db = silence_threshold_db
+        self.hooks = hooks or []
+
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        limits = []
+        if max_seconds:
+            limits.append(int(max_seconds * framerate) * channels * sample_width)
+        if max_bytes:
+            limits.append(max_bytes)
+        self.limit = min(limits) if limits else None
+        # Never let a "wav" segment outgrow the format
+        self.hard_limit = MAX_WAVE_DATA_BYTES if is_wave else None
+        if self.limit is not None:
+            soft_cap = self.limit * 2 if on_silence else self.limit
+            self.hard_limit = min(soft_cap, self.hard_limit) if self.hard_limit else soft_cap
+
+        self._writer = None
+        self._segment_bytes = 0
+        self.segments = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='segment')
+
+    def _is_silent(self, data: bytes | bytearray | memoryview) -> bool:
+        samples = np.frombuffer(data, dtype=self._dtype).reshape(-1, self.channels)
+        if len(samples) < 2:
+            return True
+        level_db, _ = block_features(samples, len(samples))
+        return bool(level_db[0] < self.silence_threshold_db)
+
+    def _should_rotate(self, data: bytes | bytearray | memoryview) -> bool:
+        if self._writer is None or not self._segment_bytes:
+            return False
+        if self.hard_limit is not None and self._segment_bytes + len(data) > self.hard_limit:
+            return True
+        if self.limit is None or self._segment_bytes < self.limit:
+            return False
+
+        return not self.on_silence or self._is_silent(data)
+
+    def _finish(self, writer: Any) -> None:
+        writer.close()
+        for hook in self.hooks:
+            hook(writer.full_path)
+
+    def _rotate(self) -> None:
+        if self._writer is not None:
+            self._executor.submit(self._finish, self._writer)
+        self._writer = self.open_writer()
+        self._segment_bytes = 0
+        self.segments += 1
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if self._writer is None or self._should_rotate(data):
+            self._rotate()
+
+        self._writer.write(data)
+        self._segment_bytes += len(data)
+
+    def close(self) -> None:
+        """Finish the last segment and wait for every completion hook"""
+        if self._writer is not None:
+            self._executor.submit(self._finish, self._writer)
+            self._writer = None
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,301 @@
+# Annotations
+from collections.abc import Callable
+from typing import Any
+
+# OS
+from datetime import datetime, timedelta
+import time
+from threading import Event, Thread
+
+# Libs
+import numpy as np
+from manager import SettingsSnapshot
+
+# GLOBAL VARIABLES
+# (minimum, maximum) of the cron fields: minute, hour, day of month, month, day of week
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+# A cron expression without a match in this many days never matches ("0 0 30 2 *")
+CRON_SEARCH_DAYS = 5 * 366
+# Longest sleep of the scheduler between two checks
+TICK_SECONDS = 0.5
+EPSILON = 1e-10
+
+
+class CronExpression:
+    """
+    Five-field cron expression ("minute hour day month weekday") with "*",
+    lists, ranges and steps ("*/15", "9-17", "1,3,5", "0-30/10").
+    Sunday is 0 or 7. As in cron, when both the day of month and the day
+    of week are restricted, a day matching either of them matches.
+    """
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f'Cron expression "{expression}" must have 5 fields')
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, minimum, maximum + (number == 4), expression)
+            for number, (field, (minimum, maximum)) in enumerate(zip(fields, CRON_FIELDS)))
+        # 7 is Sunday too
+        self.weekdays = frozenset(weekday % 7 for weekday in self.weekdays)
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse(field: str, minimum: int, maximum: int, expression: str) -> frozenset[int]:
+        values = set()
+        try:
+            for part in field.split(','):
+                span, _, step = part.partition('/')
+                if span == '*':
+                    start, stop = minimum, maximum
+                elif '-' in span:
+                    start, stop = map(int, span.split('-'))
+                else:
+                    start = stop = int(span)
+                    if step:
+                        stop = maximum
+
+                if not minimum <= start <= stop <= maximum:
+                    raise ValueError
+                values.update(range(start, stop + 1, int(step) if step else 1))
+        except ValueError:
+            raise ValueError(f'Invalid field "{field}" in the cron expression "{expression}"') from None
+
+        return frozenset(values)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        # "datetime.weekday" counts from Monday
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def matches(self, moment: datetime) -> bool:
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def next_match(self, moment: datetime) -> datetime:
+        """Return the first matching minute at or after "moment" """
+        candidate = moment.replace(second=0, microsecond=0)
+        if candidate < moment:
+            candidate += timedelta(minutes=1)
+        limit = candidate + timedelta(days=CRON_SEARCH_DAYS)
+
+        # Skip whole months, days and hours which cannot match
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=candidate.year + (month == 1), month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f'The cron expression "{self.expression}" never matches')
+
+
+class ScheduleEntry:
+    """
+    Record "duration" seconds every time "cron" matches.
+    A window also starts when the scheduler starts inside it,
+    and records what is left of it; a job only runs at its start time.
+    """
+
+    def __init__(self, cron: str, duration: float, window: bool = False) -> None:
+        if duration <= 0:
+            raise ValueError(f'The duration of "{cron}" must be positive, got {duration}')
+
+        self.cron = CronExpression(cron)
+        self.duration = duration
+        self.window = window
+        self.next_start = None
+
+    @property
+    def kind(self) -> str:
+        return 'window' if self.window else 'job'
+
+    def reset(self, now: datetime) -> None:
+        lookback = timedelta(seconds=self.duration) if self.window else timedelta()
+        self.next_start = self.cron.next_match(now - lookback)
+
+    def due(self, now: datetime) -> datetime | None:
+        """
+        Return the end of the run which is due at "now" and plan the next one.
+        Runs which ended while nothing was checking (a suspended computer) are skipped.
+        """
+        end = None
+        while self.next_start <= now:
+            run_end = self.next_start + timedelta(seconds=self.duration)
+            if run_end > now:
+                end = run_end
+            self.next_start = self.cron.next_match(self.next_start + timedelta(minutes=1))
+        return end
+
+
+class LevelTrigger:
+    """
+    Capture sink which reports when the input exceeds "threshold_db" (RMS, dBFS).
+    It runs on the capture consumer thread and only sets an event,
+    the scheduler thread opens the record.
+    """
+
+    def __init__(self, threshold_db: float = -30.0) -> None:
+        self.threshold_db = threshold_db
+        self.triggered = Event()
+        # Monotonic time of the last loud block
+        self.last_loud = 0.0
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        samples = np.frombuffer(data, dtype=np.int16)
+        if not len(samples):
+            return
+
+        mean_square = np.einsum('i,i->', samples, samples, dtype=np.float64) / len(samples)
+        if 10 * np.log10(mean_square / 32768 ** 2 + EPSILON) >= self.threshold_db:
+            self.last_loud = time.monotonic()
+            self.triggered.set()
+
+
+class RecordingScheduler(Thread):
+    """
+    Starts and stops records of the armed recording of a "RecordProducer":
+    cron windows, fixed-duration jobs and level-triggered records. The input
+    stream stays open, so a record starts within a block of its trigger,
+    and a level-triggered record begins with "pre_roll_seconds" before it.
+    Entries which become due while a record is open extend that record.
+    Records started by the user are left alone, and a scheduled record
+    becomes the user's when Start is pressed while it is open.
+    """
+
+    def __init__(self, record_producer: Any, windows: list[ScheduleEntry] | None = None,
+                 jobs: list[ScheduleEntry] | None = None, trigger: LevelTrigger | None = None,
+                 hangover_seconds: float = 2.0, max_trigger_seconds: float = 300.0,
+                 pre_roll_seconds: float = 0.5) -> None:
+        super().__init__(daemon=True)
+        self.record_producer = record_producer
+        self.entries = [*(windows or []), *(jobs or [])]
+        self.trigger = trigger
+        self.hangover_seconds = hangover_seconds
+        self.max_trigger_seconds = max_trigger_seconds
+        self.pre_roll_seconds = pre_roll_seconds
+        # Called on the scheduler thread with the records of every finished run
+        self.on_records: list[Callable[[list[str]], None]] = []
+        # What the open record was started by: "window", "job" or "trigger"
+        self.active = None
+        self._end = None
+        self._trigger_started = 0.0
+        self._stop_scheduling = Event()
+
+    @classmethod
+    def from_settings(cls, record_producer: Any, settings: SettingsSnapshot) -> 'RecordingScheduler':
+        """Build the scheduler described by the "scheduler" section of a settings snapshot"""
+        options = settings.scheduler
+        trigger = None
+        if options.trigger.enabled:
+            trigger = LevelTrigger(options.trigger.threshold_db)
+
+        return cls(
+            record_producer,
+            windows=[ScheduleEntry(window.cron, window.minutes * 60, window=True) for window in options.windows],
+            jobs=[ScheduleEntry(job.cron, job.seconds) for job in options.jobs],
+            trigger=trigger,
+            hangover_seconds=options.trigger.hangover_seconds,
+            max_trigger_seconds=options.trigger.max_seconds,
+            pre_roll_seconds=options.trigger.pre_roll_seconds
+        )
+
+    @property
+    def recording(self) -> Any:
+        return self.record_producer.armed_recording
+
+    def run(self) -> None:
+        if self.trigger is not None:
+            self.record_producer.add_sink(self.trigger.write)
+        # The shared input stream
+        self.record_producer.arm()
+
+        now = datetime.now()
+        for entry in self.entries:
+            entry.reset(now)
+
+        try:
+            while not self._stop_scheduling.is_set():
+                self.check(datetime.now())
+                if self.trigger is not None:
+                    self.trigger.triggered.wait(TICK_SECONDS)
+                else:
+                    self._stop_scheduling.wait(TICK_SECONDS)
+        finally:
+            if self.active is not None:
+                self._end_record()
+            if self.trigger is not None:
+                self.record_producer.remove_sink(self.trigger.write)
+
+    def check(self, now: datetime) -> None:
+        """Start, extend or end the scheduled record"""
+        for entry in self.entries:
+            end = entry.due(now)
+            if end is None:
+                continue
+
+            end_time = time.monotonic() + (end - now).total_seconds()
+            if self.active is None:
+                if self._begin_record(entry.kind, pre_roll_seconds=0):
+                    self._end = end_time
+            elif self.active == 'trigger':
+                # A timed run takes over the triggered record
+                self.active, self._end = entry.kind, end_time
+            else:
+                self._end = max(self._end, end_time)
+
+        if self.trigger is not None:
+            triggered = self.trigger.triggered.is_set()
+            self.trigger.triggered.clear()
+            if triggered and self.active is None:
+                self._begin_record('trigger', pre_roll_seconds=self.pre_roll_seconds)
+                self._trigger_started = time.monotonic()
+
+        if self.active is None:
+            return
+        if self.recording.record_owner != 'scheduler':
+            # The user stopped the record or took it over with the Start button
+            self.active, self._end = None, None
+            return
+
+        moment = time.monotonic()
+        if self.active == 'trigger':
+            quiet = moment - self.trigger.last_loud >= self.hangover_seconds
+            if quiet or moment - self._trigger_started >= self.max_trigger_seconds:
+                self._end_record()
+        elif moment >= self._end:
+            self._end_record()
+
+    def _begin_record(self, kind: str, pre_roll_seconds: float) -> bool:
+        # A record started by the user is left alone
+        if not self.recording.begin_record(pre_roll_seconds, owner='scheduler'):
+            return False
+        self.active = kind
+        return True
+
+    def _end_record(self) -> None:
+        # A record the user took over in the meantime stays open
+        records = self.recording.end_record(owner='scheduler')
+        self.active, self._end = None, None
+        if records:
+            for hook in self.on_records:
+                hook(records)
+
+    def stop(self) -> None:
+        self._stop_scheduling.set()
+        if self.trigger is not None:
+            self.trigger.triggered.set()
+        self.join()
@@ -0,0 +1,123 @@
+# Annotations
+from collections.abc import Callable
+from typing import Any
+
+# OS
+from collections import deque
+
+# Libs
+import numpy as np
+
+# GLOBAL VARIABLES
+SAMPLE_DTYPES = {2: np.int16, 4: np.int32}
+EPSILON = 1e-10
+
+
+def block_features(samples: np.ndarray, block_frames: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the level in dBFS and the zero-crossing rate of every block of
+    "block_frames" frames. "samples" is an integer (frames, channels) array,
+    a trailing partial block is ignored.
+    """
+    full_scale = float(np.iinfo(samples.dtype).max) + 1
+    blocks = len(samples) // block_frames
+    mono = samples[:blocks * block_frames].reshape(blocks, block_frames, -1).mean(axis=2, dtype=np.float32)
+
+    rms = np.sqrt(np.mean(np.square(mono / full_scale), axis=1))
+    level_db = 20 * np.log10(rms + EPSILON)
+    zero_crossing_rate = np.mean(np.signbit(mono[:, 1:]) != np.signbit(mono[:, :-1]), axis=1)
+
+    return level_db, zero_crossing_rate
+
+
+class VoiceActivityDetector:
+    """
+    Energy and zero-crossing voice activity detector used as a capture sink.
+    Only voiced blocks are passed to the writer, together with "pre_roll_ms"
+    of audio before the speech onset and "hangover_ms" of audio after it.
+    With "split_segments" every voiced segment goes to its own file.
+    """
+
+    def __init__(self, open_writer: Callable[[], Any], channels: int, sample_width: int, framerate: int,
+                 threshold_db: float = -45.0, max_zero_crossing_rate: float = 0.5,
+                 hangover_ms: int = 500, pre_roll_ms: int = 300, split_segments: bool = False) -> None:
+        self.open_writer = open_writer
+        self.channels = channels
+        self.threshold_db = threshold_db
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.split_segments = split_segments
+
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        frame_size = channels * sample_width
+        self._hangover_bytes = int(framerate * hangover_ms / 1000) * frame_size
+        self._pre_roll_bytes = int(framerate * pre_roll_ms / 1000) * frame_size
+
+        self._writer = None
+        self._pre_roll: deque[bytes] = deque()
+        self._pre_roll_size = 0
+        self._hangover_left = 0
+        self.segments = 0
+        self.voiced_bytes = 0
+        self.skipped_bytes = 0
+
+    @property
+    def is_active(self) -> bool:
+        return self._hangover_left > 0
+
+    def is_voiced(self, data: bytes | bytearray | memoryview) -> bool:
+        samples = np.frombuffer(data, dtype=self._dtype).reshape(-1, self.channels)
+        if len(samples) < 2:
+            return False
+
+        level_db, zero_crossing_rate = block_features(samples, len(samples))
+        return bool(level_db[0] >= self.threshold_db and zero_crossing_rate[0] <= self.max_zero_crossing_rate)
+
+    def _start_segment(self) -> None:
+        if self._writer is None:
+            self._writer = self.open_writer()
+            self.segments += 1
+
+        while self._pre_roll:
+            chunk = self._pre_roll.popleft()
+            self._writer.write(chunk)
+            self.voiced_bytes += len(chunk)
+            self.skipped_bytes -= len(chunk)
+        self._pre_roll_size = 0
+
+    def _end_segment(self) -> None:
+        if self.split_segments and self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _keep_pre_roll(self, data: bytes | bytearray | memoryview) -> None:
+        # The chunk is copied, the caller reuses its buffer.
+        self._pre_roll.append(bytes(data))
+        self._pre_roll_size += len(data)
+        self.skipped_bytes += len(data)
+
+        while self._pre_roll and self._pre_roll_size - len(self._pre_roll[0]) >= self._pre_roll_bytes:
+            self._pre_roll_size -= len(self._pre_roll.popleft())
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if self.is_voiced(data):
+            if not self.is_active:
+                self._start_segment()
+            self._hangover_left = max(self._hangover_bytes, 1)
+        elif self.is_active:
+            self._hangover_left -= len(data)
+            if not self.is_active:
+                self._writer.write(data)
+                self.voiced_bytes += len(data)
+                self._end_segment()
+                return
+        else:
+            self._keep_pre_roll(data)
+            return
+
+        self._writer.write(data)
+        self.voiced_bytes += len(data)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
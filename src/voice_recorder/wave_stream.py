@@ -0,0 +1,109 @@
+# Annotations
+from collections.abc import Callable
+from typing import BinaryIO
+
+# OS
+import os
+import struct
+import time
+
+# GLOBAL VARIABLES
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+HEADER_SIZE = 44
+
+
+class StreamingWaveWriter:
+    """
+    Writes a "wav" file incrementally as audio chunks arrive.
+    The RIFF and data chunk sizes are patched periodically and on close,
+    so a partially written file stays readable after an abnormal exit.
+    With "fsync_interval" a header update also forces the file to disk when
+    the last fsync is older than that, bounding the audio lost in a power cut.
+    """
+
+    def __init__(self, full_path: str, channels: int, sample_width: int, framerate: int,
+                 header_update_interval: float = 1.0, format_tag: int = WAVE_FORMAT_PCM,
+                 fsync_interval: float | None = None) -> None:
+        self.full_path = full_path
+        self.channels = channels
+        self.sample_width = sample_width
+        self.framerate = framerate
+        self.format_tag = format_tag
+        self.header_update_interval = header_update_interval
+        self.fsync_interval = fsync_interval
+        self.data_size = 0
+        self._last_header_update = time.monotonic()
+        self._last_fsync = self._last_header_update
+        # Called with the duration of every header update and flush
+        self.on_sync: Callable[[float], None] | None = None
+        self._file: BinaryIO = open(full_path, 'wb')
+        self._file.write(self._build_header(0))
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def frames_written(self) -> int:
+        return self.data_size // self.frame_size
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def _build_header(self, data_size: int) -> bytes:
+        """Return the 44 bytes canonical header for the given data chunk size"""
+        block_align = self.channels * self.sample_width
+        return struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size + (data_size & 1), b'WAVE',
+            b'fmt ', 16, self.format_tag, self.channels, self.framerate,
+            self.framerate * block_align, block_align, self.sample_width * 8,
+            b'data', data_size
+        )
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """Append raw interleaved frames to the file"""
+        self._file.write(data)
+        self.data_size += len(data)
+
+        if time.monotonic() - self._last_header_update >= self.header_update_interval:
+            self.update_header()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def update_header(self, fsync: bool = False) -> None:
+        """Patch RIFF and data sizes so the file is valid up to the current position"""
+        start = time.perf_counter()
+        self._file.seek(0)
+        self._file.write(self._build_header(self.data_size))
+        self._file.seek(0, 2)
+        self._file.flush()
+        self._last_header_update = time.monotonic()
+
+        if fsync or (self.fsync_interval is not None
+                     and self._last_header_update - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._file.fileno())
+            self._last_fsync = time.monotonic()
+
+        if self.on_sync is not None:
+            self.on_sync(time.perf_counter() - start)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        # RIFF chunks are word aligned.
+        if self.data_size & 1:
+            self._file.write(b'\x00')
+
+        self.update_header(fsync=self.fsync_interval is not None)
+        self._file.close()
+
+    def __enter__(self) -> 'StreamingWaveWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()